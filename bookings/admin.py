@@ -3,6 +3,6 @@ from .models import Booking
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'property', 'total_amount', 'status', 'created_at')
+    list_display = ('id', 'user', 'property', 'check_in', 'check_out', 'total_amount', 'status', 'created_at')
     list_filter = ('status', 'created_at')
     search_fields = ('user__username', 'property__title')
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Overlapping dated stays of one property are rejected by PostgreSQL itself. btree_gist
+# lets the GiST index combine the property equality with the date-range overlap.
+EXCLUSION_CONSTRAINT = 'booking_no_overlapping_stays'
+
+
+def add_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.execute(
+        f"ALTER TABLE bookings_booking ADD CONSTRAINT {EXCLUSION_CONSTRAINT} "
+        "EXCLUDE USING gist (property_id WITH =, daterange(check_in, check_out, '[)') WITH &&) "
+        "WHERE (status <> 'CANCELED' AND check_in IS NOT NULL)"
+    )
+
+
+def drop_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'ALTER TABLE bookings_booking DROP CONSTRAINT IF EXISTS {EXCLUSION_CONSTRAINT}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+        ('properties', '0012_category_available_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='check_in',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='check_out',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status', 'CANCELED'), _negated=True), fields=['property', 'check_in', 'check_out'], name='booking_stay_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('check_in__isnull', True), ('check_out__isnull', True)), models.Q(('check_in__isnull', False), ('check_out__gt', models.F('check_in')), ('check_out__isnull', False)), _connector='OR'), name='booking_valid_stay'),
+        ),
+        migrations.RunPython(add_exclusion_constraint, drop_exclusion_constraint),
+    ]
@@ -0,0 +1,44 @@
+from collections import Counter
+
+from django.db import migrations
+
+
+def restore_booked_availability(apps, schema_editor):
+    """
+    Bookings used to mark their property unavailable for good, and every such booking
+    predates stay dates. Those properties become bookable again; their undated bookings
+    are kept as history but block no dates, since there is no stay to backfill them with.
+    """
+    Booking = apps.get_model('bookings', 'Booking')
+    Category = apps.get_model('properties', 'Category')
+    Property = apps.get_model('properties', 'Property')
+
+    booked = Booking.objects.filter(check_in__isnull=True).values('property_id')
+    if not Property.objects.filter(is_available=False, pk__in=booked).update(is_available=True):
+        return
+
+    # The update bypasses the counter signals, so recompute the category counters.
+    direct = Counter(
+        Property.objects.filter(is_available=True, status='ACTIVE').values_list('category_id', flat=True)
+    )
+    subtree = Counter()
+    paths = dict(Category.objects.values_list('id', 'path'))
+    for category_id, path in paths.items():
+        for ancestor_id in (int(part) for part in path.split('/') if part):
+            subtree[ancestor_id] += direct[category_id]
+    for category_id in paths:
+        Category.objects.filter(pk=category_id).update(
+            available_count=direct[category_id], subtree_available_count=subtree[category_id],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_stay_dates'),
+        ('properties', '0012_category_available_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(restore_booked_availability, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import F, Q
 from properties.models import Property
 
 class BookingStatus(models.TextChoices):
@@ -12,11 +13,45 @@ class Booking(models.Model):
     property = models.ForeignKey(Property, related_name='bookings', on_delete=models.PROTECT)
     total_amount = models.DecimalField(max_digits=12, decimal_places=2)
     status = models.CharField(max_length=20, choices=BookingStatus.choices, default=BookingStatus.PENDING)
+    # Half-open stay [check_in, check_out). Required for new bookings; bookings made
+    # before stays existed have no dates and block none.
+    check_in = models.DateField(null=True, blank=True)
+    check_out = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    Q(check_in__isnull=True, check_out__isnull=True)
+                    | Q(check_in__isnull=False, check_out__isnull=False, check_out__gt=F('check_in'))
+                ),
+                name='booking_valid_stay',
+            ),
+        ]
+        indexes = [
+            # Overlap probes seek on (property, check_in < end) and filter check_out on the
+            # index entries, so an availability check never scans other properties' bookings.
+            # PostgreSQL additionally enforces non-overlap with an exclusion constraint.
+            models.Index(
+                fields=['property', 'check_in', 'check_out'],
+                name='booking_stay_idx',
+                condition=~Q(status=BookingStatus.CANCELED),
+            ),
+        ]
+
     def __str__(self):
         return f"Booking #{self.id} - {self.user} - {self.property}"
 
+    def nights(self):
+        if self.check_in is None or self.check_out is None:
+            return None
+        return (self.check_out - self.check_in).days
+
     def calculate_total(self):
-        return self.property.price
+        # Stays are charged per night; undated historical bookings paid the listed price once.
+        nights = self.nights()
+        if nights is None:
+            return self.property.price
+        return self.property.price * nights
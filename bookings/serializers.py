@@ -1,3 +1,5 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Booking
 from properties.serializers import PropertySerializer
@@ -7,18 +9,32 @@ class BookingSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Booking
-        fields = ['id', 'property', 'total_amount', 'status', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'total_amount', 'status', 'created_at', 'updated_at']
+        fields = ['id', 'property', 'check_in', 'check_out', 'total_amount', 'status', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'check_in', 'check_out', 'total_amount', 'status', 'created_at', 'updated_at']
 
 class BookingCreateSerializer(serializers.Serializer):
     property_id = serializers.IntegerField()
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs["check_out"] <= attrs["check_in"]:
+            raise serializers.ValidationError({"check_out": "check_out must be after check_in."})
+        if attrs["check_in"] < timezone.localdate():
+            raise serializers.ValidationError({"check_in": "check_in cannot be in the past."})
+        return attrs
 
     def create(self, validated_data):
         from .services import create_booking
         user = self.context["request"].user
         property_id = validated_data["property_id"]
-        # The service layer handles validation and creation
-        booking = create_booking(user, property_id)
+        # The service layer handles validation and creation; its errors are client errors.
+        try:
+            booking = create_booking(
+                user, property_id, validated_data["check_in"], validated_data["check_out"],
+            )
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError({"detail": exc.messages})
         return booking
 
     def to_representation(self, instance):
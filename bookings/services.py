@@ -1,5 +1,6 @@
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 from properties.models import Property, PropertyStatus
 from .models import Booking, BookingStatus
@@ -7,11 +8,37 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def create_booking(user, property_id):
+def overlapping_bookings(check_in, check_out):
     """
-    Creates a booking for a property in a concurrency-safe manner.
-    Uses select_for_update to lock the property row.
+    Non-canceled dated bookings whose stay intersects [check_in, check_out). Filtered
+    by property, this is a seek on the booking_stay_idx index.
     """
+    return (
+        Booking.objects
+        .filter(check_in__lt=check_out, check_out__gt=check_in)
+        .exclude(status=BookingStatus.CANCELED)
+    )
+
+def validate_stay(check_in, check_out):
+    if check_in is None or check_out is None:
+        raise ValidationError("check_in and check_out are required.")
+    if check_out <= check_in:
+        raise ValidationError("check_out must be after check_in.")
+    if check_in < timezone.localdate():
+        raise ValidationError("check_in cannot be in the past.")
+
+def is_property_available(property_id, check_in, check_out):
+    """True when no non-canceled booking of the property overlaps the stay."""
+    return not overlapping_bookings(check_in, check_out).filter(property_id=property_id).exists()
+
+def create_booking(user, property_id, check_in, check_out):
+    """
+    Creates a booking of the stay [check_in, check_out) in a concurrency-safe manner.
+    Uses select_for_update to lock the property row while overlapping stays are
+    checked; on PostgreSQL an exclusion constraint rejects them as well. Only the stay
+    is reserved, so the property stays bookable for other dates.
+    """
+    validate_stay(check_in, check_out)
     logger.info("User %s attempting to book property %s", user.id, property_id)
     with transaction.atomic():
         try:
@@ -33,25 +60,28 @@ def create_booking(user, property_id):
             logger.warning("Property %s is not available for booking", property_id)
             raise ValidationError("Property is not available for booking.")
 
-        # Double-check that no other non-canceled booking exists for this property
-        # while we hold the row lock to avoid race conditions.
-        if Booking.objects.filter(property=prop).exclude(status=BookingStatus.CANCELED).exists():
-            logger.warning("Property %s already has an active booking", property_id)
-            raise ValidationError("Property is not available for booking.")
+        if not is_property_available(prop.id, check_in, check_out):
+            logger.warning("Property %s is already booked between %s and %s", prop.id, check_in, check_out)
+            raise ValidationError("Property is not available for the selected dates.")
 
-        # Create the booking
         booking = Booking(
             user=user,
             property=prop,
+            check_in=check_in,
+            check_out=check_out,
+            status=BookingStatus.PENDING,
         )
         booking.total_amount = booking.calculate_total()
-        booking.status = BookingStatus.PENDING
-        booking.save()
-
-        # Update property availability
-        prop.is_available = False
-        prop.save(update_fields=["is_available"])
+        try:
+            # The savepoint keeps the outer transaction usable if the constraint fires.
+            with transaction.atomic():
+                booking.save()
+        except IntegrityError:
+            logger.warning("Overlapping stay rejected by the database for property %s", prop.id)
+            raise ValidationError("Property is not available for the selected dates.")
 
-        logger.info("Booking %s created for user %s and property %s", booking.id, user.id, property_id)
+        logger.info(
+            "Booking %s created for user %s and property %s from %s to %s",
+            booking.id, user.id, prop.id, check_in, check_out,
+        )
         return booking
-
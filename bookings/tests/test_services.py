@@ -1,11 +1,15 @@
 from django.test import TestCase
-from django.test import TransactionTestCase
+from django.test import TransactionTestCase, skipUnlessDBFeature
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from bookings.models import Booking, BookingStatus
 from properties.models import Property, Category, PropertyStatus
-from bookings.services import create_booking
+from bookings.services import create_booking, is_property_available
 from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from django.db import IntegrityError
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -16,21 +20,23 @@ class BookingServiceTests(TestCase):
         self.property = Property.objects.create(
             title='Test Property', slug='test-property', category=self.category, price=100.00, is_available=True, status=PropertyStatus.ACTIVE
         )
+        self.check_in = timezone.localdate() + timedelta(days=1)
+        self.check_out = self.check_in + timedelta(days=1)
 
     def test_create_booking_success(self):
         """
         Test that a booking is successfully created for an available property.
         """
-        booking = create_booking(self.user, self.property.id)
+        booking = create_booking(self.user, self.property.id, self.check_in, self.check_out)
         
         self.assertEqual(booking.user, self.user)
         self.assertEqual(booking.property, self.property)
         self.assertEqual(booking.status, BookingStatus.PENDING)
         self.assertEqual(booking.total_amount, self.property.price)
         
-        # Verify property is now unavailable
+        # Only the stay is reserved; the listing stays bookable for other dates.
         self.property.refresh_from_db()
-        self.assertFalse(self.property.is_available)
+        self.assertTrue(self.property.is_available)
 
     def test_create_booking_unavailable(self):
         """
@@ -40,7 +46,7 @@ class BookingServiceTests(TestCase):
         self.property.save()
         
         with self.assertRaisesMessage(ValidationError, "Property is not available for booking."):
-            create_booking(self.user, self.property.id)
+            create_booking(self.user, self.property.id, self.check_in, self.check_out)
 
     def test_create_booking_inactive(self):
         """
@@ -50,21 +56,81 @@ class BookingServiceTests(TestCase):
         self.property.save()
         
         with self.assertRaisesMessage(ValidationError, "Property is not active."):
-            create_booking(self.user, self.property.id)
+            create_booking(self.user, self.property.id, self.check_in, self.check_out)
 
     def test_double_booking_prevention(self):
         """
-        Test that a property cannot be booked twice.
+        Test that a property cannot be booked twice for the same stay.
         """
         # First booking succeeds
-        create_booking(self.user, self.property.id)
+        create_booking(self.user, self.property.id, self.check_in, self.check_out)
         
         # Second booking fails
         user2 = User.objects.create_user(username='testuser2', password='password')
-        with self.assertRaisesMessage(ValidationError, "Property is not available for booking."):
-            create_booking(user2, self.property.id)
+        with self.assertRaisesMessage(ValidationError, "Property is not available for the selected dates."):
+            create_booking(user2, self.property.id, self.check_in, self.check_out)
+
+
+class DatedBookingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', password='password')
+        self.category = Category.objects.create(name='Villas', slug='villas')
+        self.property = Property.objects.create(
+            title='Sea Villa', slug='sea-villa', category=self.category, price=Decimal('250.00'),
+        )
+        self.today = timezone.localdate()
 
+    def day(self, offset):
+        return self.today + timedelta(days=offset)
+
+    def test_dated_booking_reserves_only_the_stay(self):
+        """
+        Test that a dated booking is charged per night and leaves the property bookable for other dates.
+        """
+        booking = create_booking(self.user, self.property.id, self.day(1), self.day(4))
+
+        self.assertEqual((booking.check_in, booking.check_out, booking.nights()), (self.day(1), self.day(4), 3))
+        self.assertEqual(booking.total_amount, Decimal('750.00'))
+        self.property.refresh_from_db()
+        self.assertTrue(self.property.is_available)
 
+        # Stays are half-open, so back-to-back bookings do not overlap.
+        create_booking(self.user, self.property.id, self.day(4), self.day(6))
+        create_booking(self.user, self.property.id, self.day(0), self.day(1))
+
+    def test_overlapping_stay_is_rejected(self):
+        create_booking(self.user, self.property.id, self.day(2), self.day(5))
+
+        for check_in, check_out in ((1, 3), (4, 8), (3, 4), (0, 10)):
+            self.assertFalse(is_property_available(self.property.id, self.day(check_in), self.day(check_out)))
+            with self.assertRaisesMessage(ValidationError, "Property is not available for the selected dates."):
+                create_booking(self.user, self.property.id, self.day(check_in), self.day(check_out))
+
+    def test_canceled_stay_frees_the_dates(self):
+        booking = create_booking(self.user, self.property.id, self.day(2), self.day(5))
+        booking.status = BookingStatus.CANCELED
+        booking.save()
+
+        self.assertTrue(is_property_available(self.property.id, self.day(3), self.day(4)))
+        create_booking(self.user, self.property.id, self.day(3), self.day(4))
+
+    def test_invalid_stays_are_rejected(self):
+        with self.assertRaisesMessage(ValidationError, "check_out must be after check_in."):
+            create_booking(self.user, self.property.id, self.day(3), self.day(3))
+        with self.assertRaisesMessage(ValidationError, "check_in cannot be in the past."):
+            create_booking(self.user, self.property.id, self.day(-2), self.day(1))
+        with self.assertRaisesMessage(ValidationError, "check_in and check_out are required."):
+            create_booking(self.user, self.property.id, self.day(1), None)
+
+    def test_database_rejects_inverted_stays(self):
+        with self.assertRaises(IntegrityError):
+            Booking.objects.create(
+                user=self.user, property=self.property, total_amount=0, check_in=self.day(3), check_out=self.day(1),
+            )
+
+
+# SQLite has no row locks; concurrent writers fail with "database table is locked" instead of queueing.
+@skipUnlessDBFeature('has_select_for_update')
 class BookingConcurrencyTests(TransactionTestCase):
     reset_sequences = True
 
@@ -82,9 +148,11 @@ class BookingConcurrencyTests(TransactionTestCase):
         )
 
     def test_concurrent_bookings_only_creates_one(self):
+        check_in = timezone.localdate() + timedelta(days=1)
+
         def attempt_booking(user):
             try:
-                booking = create_booking(user, self.property.id)
+                booking = create_booking(user, self.property.id, check_in, check_in + timedelta(days=2))
                 return booking.id
             except ValidationError:
                 return None
@@ -95,6 +163,3 @@ class BookingConcurrencyTests(TransactionTestCase):
         successful = [r for r in results if r is not None]
         self.assertEqual(len(successful), 1)
         self.assertEqual(Booking.objects.count(), 1)
-        # Property should be marked unavailable after the successful booking
-        self.property.refresh_from_db()
-        self.assertFalse(self.property.is_available)
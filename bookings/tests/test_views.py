@@ -0,0 +1,59 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from bookings.models import Booking
+from properties.models import Category, Property
+
+User = get_user_model()
+
+class BookingCreateViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('booking-create')
+        self.user = User.objects.create_user(username='guest', password='password')
+        self.client.force_authenticate(user=self.user)
+        category = Category.objects.create(name='Villas', slug='villas')
+        self.property = Property.objects.create(
+            title='Sea Villa', slug='sea-villa', category=category, price=Decimal('250.00'),
+        )
+        self.today = timezone.localdate()
+
+    def book(self, check_in, check_out, **extra):
+        data = {'property_id': self.property.id, 'check_in': check_in, 'check_out': check_out, **extra}
+        return self.client.post(self.url, data, format='json')
+
+    def day(self, offset):
+        return (self.today + timedelta(days=offset)).isoformat()
+
+    def test_create_dated_booking(self):
+        """
+        API-level test: POST /api/bookings/create/ with a stay returns the priced booking.
+        """
+        response = self.book(self.day(1), self.day(3))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['check_in'], response.data['check_out']), (self.day(1), self.day(3)))
+        self.assertEqual(response.data['total_amount'], '500.00')
+
+    def test_overlapping_stay_is_a_client_error(self):
+        self.book(self.day(1), self.day(4))
+
+        response = self.book(self.day(2), self.day(5))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['detail'], ['Property is not available for the selected dates.'])
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_invalid_stays_are_client_errors(self):
+        for check_in, check_out in (('2020-01-01', '2020-01-03'), (self.day(3), self.day(1))):
+            response = self.book(check_in, check_out)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, (check_in, check_out))
+
+        response = self.client.post(self.url, {'property_id': 0, 'check_in': self.day(1), 'check_out': self.day(2)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Booking.objects.count(), 0)
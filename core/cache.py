@@ -0,0 +1,109 @@
+import logging
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds between cache checks while waiting on another worker's recomputation.
+LOCK_POLL_INTERVAL = 0.05
+
+def _is_negative(value):
+    return value is None or (hasattr(value, '__len__') and len(value) == 0)
+
+def get_or_compute(
+    key,
+    compute,
+    timeout,
+    *,
+    negative_timeout=None,
+    beta=1.0,
+    lock_timeout=30,
+    wait_timeout=5,
+):
+    """
+    Return the cached value for key, computing and storing it on a miss.
+
+    Values are stored in an envelope so that empty results (None, [], {}) are cached
+    explicitly rather than being mistaken for a miss; they expire after
+    negative_timeout, which defaults to timeout.
+
+    Only one worker recomputes a missing key at a time: the others wait for the result
+    instead of stampeding the database. Entries are also refreshed probabilistically
+    shortly before they expire (XFetch), weighted by how long the last computation took,
+    while other readers keep being served the current value.
+    """
+    envelope = cache.get(key)
+    now = time.time()
+
+    if envelope is not None:
+        if not _should_refresh_early(envelope, now, beta):
+            logger.debug("Cache hit for key %s", key)
+            return envelope['value']
+        # Serve the current value unless this worker wins the refresh.
+        token = _acquire(key, lock_timeout)
+        if token is None:
+            return envelope['value']
+        logger.info("Refreshing key %s ahead of expiry", key)
+        return _compute_and_store(key, compute, timeout, negative_timeout, token)
+
+    logger.info("Cache miss for key %s", key)
+    token = _acquire(key, lock_timeout)
+    if token is not None:
+        return _compute_and_store(key, compute, timeout, negative_timeout, token)
+
+    envelope = _wait_for(key, wait_timeout)
+    if envelope is not None:
+        return envelope['value']
+
+    logger.warning("Timed out waiting for key %s to be computed; computing it directly", key)
+    return _compute_and_store(key, compute, timeout, negative_timeout)
+
+def _should_refresh_early(envelope, now, beta):
+    # 1 - random() lies in (0, 1], keeping log() finite.
+    return now - envelope['delta'] * beta * math.log(1.0 - random.random()) >= envelope['expires']
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+def _acquire(key, lock_timeout):
+    """Return this worker's lock token, or None when another worker holds the lock."""
+    token = uuid.uuid4().hex
+    return token if cache.add(_lock_key(key), token, timeout=lock_timeout) else None
+
+def _release(key, token):
+    # A compute outliving lock_timeout may find the lock taken over by another
+    # worker; only the owner's token may delete it.
+    if cache.get(_lock_key(key)) == token:
+        cache.delete(_lock_key(key))
+
+def _wait_for(key, wait_timeout):
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        envelope = cache.get(key)
+        if envelope is not None:
+            return envelope
+        if cache.get(_lock_key(key)) is None:
+            # The owner finished (or died) without storing anything.
+            break
+    return None
+
+def _compute_and_store(key, compute, timeout, negative_timeout, token=None):
+    try:
+        started = time.time()
+        value = compute()
+        delta = time.time() - started
+
+        ttl = timeout
+        if _is_negative(value) and negative_timeout is not None:
+            ttl = negative_timeout
+        expires = math.inf if ttl is None else time.time() + ttl
+        cache.set(key, {'value': value, 'delta': delta, 'expires': expires}, timeout=ttl)
+        return value
+    finally:
+        if token is not None:
+            _release(key, token)
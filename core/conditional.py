@@ -0,0 +1,36 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with 304 Not Modified when the client's validators still match.
+
+    Views override get_validators(request) to return an (etag source, last_modified)
+    pair cheap enough to compute before any serialization happens. Either may be None;
+    (None, None), the default, skips conditional handling, e.g. for a missing object.
+    """
+
+    def get_validators(self, request):
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        etag_source, last_modified = self.get_validators(request)
+        if etag_source is None and last_modified is None:
+            return super().get(request, *args, **kwargs)
+
+        etag = quote_etag(hashlib.sha1(str(etag_source).encode()).hexdigest()) if etag_source is not None else None
+        timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        if etag is not None:
+            response.headers.setdefault('ETag', etag)
+        if timestamp is not None:
+            response.headers.setdefault('Last-Modified', http_date(timestamp))
+        return response
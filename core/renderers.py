@@ -0,0 +1,64 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+class _LineBuffer:
+    """File-like target for csv.writer that hands each written line back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON. `stream(rows, fields)` yields one encoded line per row for
+    StreamingHttpResponse; `render` covers regular responses such as errors.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self._line(row) for row in rows)
+
+    def stream(self, rows, fields):
+        for row in rows:
+            yield self._line(row)
+
+    def _line(self, row):
+        return (json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n').encode(self.charset)
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV with a header row. Nested values (lists, objects) are written as JSON in their cell.
+    Text that a spreadsheet would evaluate as a formula is prefixed with a quote.
+    """
+    # Leading characters that make spreadsheet applications evaluate a cell.
+    formula_prefixes = ('=', '+', '-', '@', '\t', '\r')
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        fields = list(dict.fromkeys(name for row in rows for name in row))
+        return b''.join(self.stream(rows, fields))
+
+    def stream(self, rows, fields):
+        writer = csv.writer(_LineBuffer())
+        yield writer.writerow(fields).encode(self.charset)
+        for row in rows:
+            yield writer.writerow([self._cell(row.get(name)) for name in fields]).encode(self.charset)
+
+    def _cell(self, value):
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+        if isinstance(value, str) and value.startswith(self.formula_prefixes):
+            return f"'{value}"
+        return value
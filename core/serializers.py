@@ -0,0 +1,95 @@
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+from rest_framework import serializers
+
+def source_columns(serializer):
+    """Model columns read by the serializer's fields, in field order."""
+    method_sources = getattr(serializer, 'method_field_sources', {})
+    columns = []
+    for name, field in serializer.fields.items():
+        if isinstance(field, serializers.SerializerMethodField):
+            columns.extend(method_sources.get(name, ()))
+        else:
+            columns.append(field.source)
+    return list(dict.fromkeys(columns))
+
+class SparseFieldsetSerializerMixin:
+    """
+    Limit a serializer's fields to the names in context['fields'], when present.
+    method_field_sources lists the model fields each SerializerMethodField reads, so
+    callers can project the queryset down to exactly what will be rendered.
+    """
+    method_field_sources = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get('fields')
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+class ValuesSerializer:
+    """
+    Render `.values()` rows exactly like serializer_class renders model instances.
+
+    The per-field converters are resolved once from serializer_class's fields. Fields
+    whose representation is the value the database driver already returns are copied
+    as-is. File fields reuse a media base URL made absolute once per request.
+    SerializerMethodFields are delegated to `get_<name>(row)` on the subclass.
+    """
+    serializer_class = None
+    passthrough_fields = (
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.FloatField,
+        serializers.IntegerField,
+        serializers.JSONField,
+        serializers.PrimaryKeyRelatedField,
+    )
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.model = self.serializer_class.Meta.model
+        serializer = self.serializer_class(context=self.context)
+        self.columns = source_columns(serializer)
+        self.converters = [(name, *self._converter(field)) for name, field in serializer.fields.items()]
+
+    def _converter(self, field):
+        """Return (source, convert); a None source passes the whole row to convert."""
+        if isinstance(field, serializers.SerializerMethodField):
+            return None, getattr(self, field.method_name)
+        if isinstance(field, serializers.FileField):
+            return field.source, self._file_url_converter(self.model._meta.get_field(field.source).storage)
+        if isinstance(field, self.passthrough_fields):
+            return field.source, None
+        return field.source, field.to_representation
+
+    def _file_url_converter(self, storage):
+        request = self.context.get('request')
+        if isinstance(storage, FileSystemStorage):
+            base_url = storage.base_url
+            if request is not None:
+                base_url = request.build_absolute_uri(base_url)
+            return lambda name: base_url + filepath_to_uri(name).lstrip('/') if name else None
+        if request is not None:
+            return lambda name: request.build_absolute_uri(storage.url(name)) if name else None
+        return lambda name: storage.url(name) if name else None
+
+    def project(self, queryset, extra_columns=()):
+        """Select only the serialized columns plus extra_columns and annotations such as sort keys."""
+        columns = dict.fromkeys([*self.columns, *extra_columns, *queryset.query.annotation_select])
+        return queryset.values(*columns)
+
+    def to_representation(self, rows):
+        converters = self.converters
+        data = []
+        for row in rows:
+            item = {}
+            for name, source, convert in converters:
+                if source is None:
+                    item[name] = convert(row)
+                    continue
+                value = row[source]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
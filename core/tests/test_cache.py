@@ -0,0 +1,90 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from core.cache import get_or_compute
+
+class GetOrComputeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_empty_results_are_cached(self):
+        """
+        Test that an empty result counts as a hit instead of being recomputed.
+        """
+        compute = mock.Mock(return_value=[])
+
+        self.assertEqual(get_or_compute('negative', compute, timeout=60), [])
+        self.assertEqual(get_or_compute('negative', compute, timeout=60), [])
+        self.assertEqual(compute.call_count, 1)
+
+    def test_negative_timeout_applies_to_empty_results(self):
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            get_or_compute('negative', lambda: [], timeout=600, negative_timeout=30)
+            get_or_compute('positive', lambda: [1], timeout=600, negative_timeout=30)
+
+        self.assertEqual(cache_set.call_args_list[0].kwargs['timeout'], 30)
+        self.assertEqual(cache_set.call_args_list[1].kwargs['timeout'], 600)
+
+    def test_concurrent_misses_compute_once(self):
+        """
+        Test that workers missing the same key wait for a single computation.
+        """
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return [42]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute('flight', compute, timeout=60)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [[42]] * 5)
+
+    def test_expired_lock_taken_over_is_not_released(self):
+        """
+        Test that a compute outliving its lock leaves the next owner's lock in place.
+        """
+        def compute():
+            time.sleep(1.1)
+            # The lock has expired, so a second worker can take it over.
+            self.assertTrue(cache.add('slow:lock', 'second-worker'))
+            return 'value'
+
+        self.assertEqual(get_or_compute('slow', compute, timeout=60, lock_timeout=1), 'value')
+        self.assertEqual(cache.get('slow:lock'), 'second-worker')
+
+    def test_early_refresh_near_expiry(self):
+        """
+        Test that an entry close to expiry is recomputed by one reader ahead of time.
+        """
+        get_or_compute('early', lambda: 'old', timeout=60)
+        envelope = cache.get('early')
+        envelope.update(delta=10.0, expires=time.time() + 1)
+        cache.set('early', envelope, timeout=60)
+
+        with mock.patch('core.cache.random.random', return_value=0.99):
+            self.assertEqual(get_or_compute('early', lambda: 'new', timeout=60), 'new')
+        self.assertEqual(get_or_compute('early', lambda: 'newer', timeout=60), 'new')
+
+    def test_early_refresh_serves_current_value_while_locked(self):
+        get_or_compute('early', lambda: 'old', timeout=60)
+        envelope = cache.get('early')
+        envelope.update(delta=10.0, expires=time.time())
+        cache.set('early', envelope, timeout=60)
+        cache.add('early:lock', 'other-worker')
+
+        with mock.patch('core.cache.random.random', return_value=0.99):
+            self.assertEqual(get_or_compute('early', lambda: 'new', timeout=60), 'old')
@@ -1,3 +1,85 @@
-from django.shortcuts import render
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
-# Create your views here.
+from .serializers import source_columns
+
+class ValuesListMixin:
+    """
+    Opt-in fast path for list views: set values_serializer_class to a ValuesSerializer
+    and rows are read with `.values()` and rendered without per-instance serializers.
+    """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.values_serializer_class(context=self.get_serializer_context())
+        # Keyset pagination needs its sort key in every row, even if it is not rendered.
+        extra_columns = ()
+        if hasattr(self.paginator, 'get_required_columns'):
+            extra_columns = self.paginator.get_required_columns(request, self)
+        queryset = serializer.project(self.filter_queryset(self.get_queryset()), extra_columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+        return Response(serializer.to_representation(queryset))
+
+class SparseFieldsetMixin:
+    """
+    `?fields=a,b` / `?omit=c` support for views whose serializer uses
+    SparseFieldsetSerializerMixin. The selection is also applied to the queryset with
+    `.only()`, so columns that will not be rendered are never read.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_sparse_fields(self):
+        """Selected field names in declaration order, or None when every field is wanted."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self._parse_sparse_fields()
+        return self._sparse_fields
+
+    def _parse_sparse_fields(self):
+        requested = self._split_param(self.fields_query_param)
+        omitted = self._split_param(self.omit_query_param)
+        if requested is None and omitted is None:
+            return None
+
+        available = list(self.get_serializer_class()().fields)
+        for param, names in ((self.fields_query_param, requested), (self.omit_query_param, omitted)):
+            unknown = [name for name in names or () if name not in available]
+            if unknown:
+                raise ValidationError({param: f"Unknown field(s): {', '.join(unknown)}."})
+
+        selected = tuple(
+            name for name in available
+            if (requested is None or name in requested) and name not in (omitted or ())
+        )
+        if not selected:
+            raise ValidationError({self.omit_query_param: 'At least one field must remain.'})
+        return selected
+
+    def _split_param(self, param):
+        names = [name.strip() for name in self.request.query_params.get(param, '').split(',') if name.strip()]
+        return names or None
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_sparse_fields()
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        columns = source_columns(self.get_serializer_class()(context={'fields': fields}))
+        related = queryset.query.select_related
+        if related:
+            # A deferred relation cannot be followed by select_related.
+            kept = [name for name in related if name in columns] if isinstance(related, dict) else []
+            queryset = queryset.select_related(None)
+            if kept:
+                queryset = queryset.select_related(*kept)
+        return queryset.only(*columns)
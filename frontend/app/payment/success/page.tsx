@@ -51,11 +51,11 @@ function SuccessContent() {
         const response = await api.get(`/api/bookings/${bookingId}/`)
         setBooking(response.data)
         
-        // Fetch recommendations based on category
-        if (response.data.property.category) {
+        // Fetch properties similar to the booked one
+        if (response.data.property.id) {
             try {
-                const recRes = await api.get(`/api/properties/recommended/?category_id=${response.data.property.category}`)
-                setRecommendations(recRes.data.filter((p: any) => p.id !== response.data.property.id).slice(0, 3))
+                const recRes = await api.get(`/api/properties/recommended/?property_id=${response.data.property.id}&limit=3`)
+                setRecommendations(recRes.data.results)
             } catch (recErr) {
                 console.error("Failed to fetch recommendations", recErr)
             }
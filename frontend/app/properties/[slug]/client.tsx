@@ -2,6 +2,7 @@
 
 import { useState } from "react"
 import Link from "next/link"
+import { useRouter } from "next/navigation"
 import { Bath, Bed, MapPin, Zap, Heart } from "lucide-react"
 import { motion } from "framer-motion"
 import { useBooking } from "@/hooks/use-booking"
@@ -22,6 +23,7 @@ interface PropertyDetail {
   amenities: string[]
   image: string | null
   image_url?: string | null
+  image_srcset?: Record<string, string> | null
   category: number
   is_available: boolean
 }
@@ -32,8 +34,13 @@ interface PropertyClientProps {
 }
 
 export default function PropertyClient({ property, similarProperties }: PropertyClientProps) {
+  const router = useRouter()
   const { createBooking, loadingId, error: bookingError } = useBooking()
   const [isFavorited, setIsFavorited] = useState(false)
+  const [checkIn, setCheckIn] = useState("")
+  const [checkOut, setCheckOut] = useState("")
+  const today = new Date().toISOString().slice(0, 10)
+  const stayIsValid = Boolean(checkIn && checkOut && checkIn < checkOut)
 
   const fallbackImage = getPropertyImage(property.slug) || `/properties/${property.slug}.jpg`
   const primaryImage = resolveMediaUrl(property.image_url || property.image) || fallbackImage || "/properties/placeholder.jpg"
@@ -134,9 +141,32 @@ export default function PropertyClient({ property, similarProperties }: Property
                 </p>
                 
                 {property.is_available ? (
+                  <>
+                  <div className="grid grid-cols-2 gap-3">
+                    <label className="space-y-1 text-sm font-medium text-foreground">
+                      <span>Check-in</span>
+                      <input
+                        type="date"
+                        min={today}
+                        value={checkIn}
+                        onChange={(event) => setCheckIn(event.target.value)}
+                        className="w-full rounded-lg border border-border px-3 py-2"
+                      />
+                    </label>
+                    <label className="space-y-1 text-sm font-medium text-foreground">
+                      <span>Check-out</span>
+                      <input
+                        type="date"
+                        min={checkIn || today}
+                        value={checkOut}
+                        onChange={(event) => setCheckOut(event.target.value)}
+                        className="w-full rounded-lg border border-border px-3 py-2"
+                      />
+                    </label>
+                  </div>
                   <button
-                    onClick={() => createBooking(property.id, `/properties/${property.slug}`)}
-                    disabled={loadingId === property.id}
+                    onClick={() => createBooking(property.id, { checkIn, checkOut }, `/properties/${property.slug}`)}
+                    disabled={!stayIsValid || loadingId === property.id}
                     className="w-full py-4 bg-primary text-primary-foreground rounded-xl font-bold text-lg hover:opacity-90 transition-all shadow-lg shadow-primary/20 disabled:opacity-50 disabled:cursor-not-allowed active:scale-[0.98]"
                   >
                     {loadingId === property.id ? (
@@ -148,6 +178,7 @@ export default function PropertyClient({ property, similarProperties }: Property
                       "Book Now"
                     )}
                   </button>
+                  </>
                 ) : (
                   <div className="w-full py-4 bg-gray-100 text-gray-400 rounded-xl font-bold text-lg text-center border border-gray-200 cursor-not-allowed">
                     Currently Unavailable
@@ -186,10 +217,10 @@ export default function PropertyClient({ property, similarProperties }: Property
                             beds={prop.bedrooms}
                             baths={prop.bathrooms}
                             imageUrl={prop.image_url || prop.image}
+                            imageSrcset={prop.image_srcset}
                             area={prop.area ? `${prop.area} sqft` : null}
                             isAvailable={prop.is_available}
-                            onBook={() => createBooking(prop.id, `/properties/${prop.slug}`)}
-                            bookingLoading={loadingId === prop.id}
+                            onBook={() => router.push(`/properties/${prop.slug}#book-now`)}
                           />
                     ))}
                 </div>
@@ -14,13 +14,11 @@ export default async function PropertyDetailPage({ params }: PropertyDetailPageP
     const property = response.data
 
     let similarProperties = []
-    if (property.category) {
+    if (property.id) {
       try {
-        const similarRes = await api.get(`/api/properties/recommended/?category_id=${property.category}`)
-        // Filter out current property and limit to 3
-        similarProperties = similarRes.data
-          .filter((p: any) => p.id !== property.id)
-          .slice(0, 3)
+        // Ranked by similarity to this property, which is itself excluded
+        const similarRes = await api.get(`/api/properties/recommended/?property_id=${property.id}&limit=3`)
+        similarProperties = similarRes.data.results
       } catch (simErr) {
         console.error("Failed to fetch similar properties", simErr)
       }
@@ -1,10 +1,9 @@
 "use client"
 
 import { useState, useEffect, Suspense } from "react"
-import { useSearchParams } from "next/navigation"
+import { useRouter, useSearchParams } from "next/navigation"
 import PropertyCard from "@/components/property-card"
 import api from "@/lib/api"
-import { useBooking } from "@/hooks/use-booking"
 
 interface Category {
   id: number
@@ -23,6 +22,7 @@ interface Property {
   area?: number | null
   image: string | null
   image_url?: string | null
+  image_srcset?: Record<string, string> | null
   category: number
   amenities: string[]
   is_available: boolean
@@ -44,9 +44,12 @@ function PropertiesContent() {
   const [selectedCategory, setSelectedCategory] = useState<number | null>(null)
   const [categories, setCategories] = useState<Category[]>([])
   const [properties, setProperties] = useState<Property[]>([])
+  // Cursor URL of the next page; null once the last page is loaded.
+  const [nextUrl, setNextUrl] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState("")
-  const { createBooking, loadingId, error: bookingError, setError: setBookingError } = useBooking()
+  const router = useRouter()
 
   useEffect(() => {
     const fetchCategories = async () => {
@@ -64,7 +67,6 @@ function PropertiesContent() {
     const fetchProperties = async () => {
       setLoading(true)
       setError("")
-      setBookingError("")
       try {
         const params: any = {}
         
@@ -82,7 +84,8 @@ function PropertiesContent() {
         }
 
         const response = await api.get("/api/properties/", { params })
-        setProperties(response.data)
+        setProperties(response.data.results)
+        setNextUrl(response.data.next)
       } catch (err) {
         setError("Failed to load properties. Please try again.")
         console.error(err)
@@ -93,9 +96,25 @@ function PropertiesContent() {
     fetchProperties()
   }, [selectedCategory, locationParam, propertyTypeParam])
 
+  const loadMore = async () => {
+    if (!nextUrl) return
+    setLoadingMore(true)
+    try {
+      const response = await api.get(nextUrl)
+      setProperties((current) => [...current, ...response.data.results])
+      setNextUrl(response.data.next)
+    } catch (err) {
+      setError("Failed to load more properties. Please try again.")
+      console.error(err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleBookNow = (property: Property) => {
     if (!property.is_available) return
-    createBooking(property.id, `/properties/${property.slug}`)
+    // Stays are picked on the property page before booking.
+    router.push(`/properties/${property.slug}#book-now`)
   }
 
   return (
@@ -139,11 +158,6 @@ function PropertiesContent() {
           </aside>
 
           <section className="lg:col-span-3 space-y-6">
-            {bookingError && (
-              <div className="text-sm text-red-500 border border-red-200 bg-red-50 px-4 py-3 rounded-lg">
-                {bookingError}
-              </div>
-            )}
             {loading ? (
               <div className="flex justify-center items-center h-64">
                 <div className="animate-spin rounded-full h-12 w-12 border-t-2 border-b-2 border-primary"></div>
@@ -172,14 +186,25 @@ function PropertiesContent() {
                     beds={property.bedrooms}
                     baths={property.bathrooms}
                     imageUrl={property.image_url || property.image}
+                    imageSrcset={property.image_srcset}
                     area={property.area ? `${property.area} sqft` : null}
                     isAvailable={property.is_available}
                     onBook={() => handleBookNow(property)}
-                    bookingLoading={loadingId === property.id}
                   />
                 ))}
               </div>
             )}
+            {!loading && !error && nextUrl && (
+              <div className="flex justify-center">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="px-6 py-2 rounded-full border border-primary text-primary font-medium transition hover:bg-primary hover:text-primary-foreground disabled:opacity-50"
+                >
+                  {loadingMore ? "Loading..." : "Load more"}
+                </button>
+              </div>
+            )}
           </section>
         </div>
       </div>
@@ -25,9 +25,15 @@ export default function DestinationsSection() {
   useEffect(() => {
     const fetchDestinations = async () => {
       try {
-        const response = await api.get("/api/properties/")
-        const properties = response.data
-        
+        // Counts cover the whole catalog, so follow the cursor through every page.
+        const properties: { location: string }[] = []
+        let response = await api.get("/api/properties/", { params: { limit: 100, fields: "location" } })
+        properties.push(...response.data.results)
+        while (response.data.next) {
+          response = await api.get(response.data.next)
+          properties.push(...response.data.results)
+        }
+
         // Group by location
         const locationMap = new Map<string, number>()
         // Static image mapping for known locations
@@ -41,7 +47,7 @@ export default function DestinationsSection() {
           "Beverly Hills": "/properties/malibu-beach-sunset-california.jpg",
         }
 
-        properties.forEach((prop: any) => {
+        properties.forEach((prop) => {
           const loc = prop.location.split(',')[0].trim() // Simple city extraction
           locationMap.set(loc, (locationMap.get(loc) || 0) + 1)
         })
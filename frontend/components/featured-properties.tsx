@@ -1,11 +1,11 @@
 "use client"
 import Link from "next/link"
+import { useRouter } from "next/navigation"
 import { useState, useEffect } from "react"
 import { motion } from "framer-motion"
 import api from "@/lib/api"
 import PropertyCard from "./property-card"
 import { fadeIn, staggerContainer, textVariant } from "@/lib/motion"
-import { useBooking } from "@/hooks/use-booking"
 
 interface Property {
   id: number
@@ -18,6 +18,7 @@ interface Property {
   area?: number | null
   image: string | null
   image_url?: string | null
+  image_srcset?: Record<string, string> | null
   category: number
   amenities: string[]
   is_available: boolean
@@ -27,15 +28,14 @@ export default function FeaturedProperties() {
   const [properties, setProperties] = useState<Property[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState("")
-  const { createBooking, loadingId, error: bookingError, setError: setBookingError } = useBooking()
+  const router = useRouter()
 
   useEffect(() => {
     const fetchProperties = async () => {
-      setBookingError("")
       try {
-        const response = await api.get("/api/properties/")
+        const response = await api.get("/api/properties/", { params: { limit: 3 } })
         // Take first 3 properties as featured for now
-        setProperties(response.data.slice(0, 3))
+        setProperties(response.data.results)
       } catch (err) {
         console.error("Failed to fetch featured properties", err)
         setError("Failed to load featured properties.")
@@ -48,7 +48,8 @@ export default function FeaturedProperties() {
 
   const handleBookNow = (property: Property) => {
     if (!property.is_available) return
-    createBooking(property.id, `/properties/${property.slug}`)
+    // Stays are picked on the property page before booking.
+    router.push(`/properties/${property.slug}#book-now`)
   }
 
   return (
@@ -75,9 +76,6 @@ export default function FeaturedProperties() {
           </motion.p>
         </div>
 
-        {bookingError && (
-          <div className="text-center text-sm text-red-500 mb-4">{bookingError}</div>
-        )}
         {loading ? (
            <div className="flex justify-center items-center h-64">
              <div className="animate-spin rounded-full h-12 w-12 border-t-2 border-b-2 border-primary"></div>
@@ -102,10 +100,10 @@ export default function FeaturedProperties() {
                     beds={property.bedrooms}
                     baths={property.bathrooms}
                     imageUrl={property.image_url || property.image}
+                    imageSrcset={property.image_srcset}
                     area={property.area ? `${property.area} sqft` : null}
                     isAvailable={property.is_available}
                     onBook={() => handleBookNow(property)}
-                    bookingLoading={loadingId === property.id}
                   />
                 </motion.div>
             ))}
@@ -8,6 +8,9 @@ import { useIsMobile } from "@/hooks/use-mobile"
 import { getPropertyImage } from "@/lib/property-images"
 import { resolveMediaUrl } from "@/lib/utils"
 
+// Cards span the full width on mobile, half on tablets and a third on desktop grids.
+const cardImageSizes = "(max-width: 768px) 100vw, (max-width: 1280px) 50vw, 33vw"
+
 interface PropertyCardProps {
   id: number
   slug: string
@@ -18,6 +21,7 @@ interface PropertyCardProps {
   baths?: number
   area?: string | null
   imageUrl?: string | null
+  imageSrcset?: Record<string, string> | null
   tag?: string
   isAvailable?: boolean
   detailHref?: string
@@ -36,6 +40,7 @@ export default function PropertyCard({
   baths,
   area,
   imageUrl,
+  imageSrcset,
   tag,
   detailHref,
   showBookButton = true,
@@ -67,13 +72,19 @@ export default function PropertyCard({
       className="group rounded-2xl overflow-hidden border border-white/50 bg-white/60 backdrop-blur-xl shadow-xl transition-all duration-500"
     >
       <div className="relative h-64 overflow-hidden bg-muted">
-        <motion.img
-          src={resolvedImage}
-          alt={title}
-          className="w-full h-full object-cover"
-          whileHover={{ scale: isMobile ? 1.02 : 1.12 }}
-          transition={{ duration: 0.8, ease: [0.16, 1, 0.3, 1] }}
-        />
+        <picture>
+          {imageSrcset?.webp && <source type="image/webp" srcSet={imageSrcset.webp} sizes={cardImageSizes} />}
+          <motion.img
+            src={resolvedImage}
+            srcSet={imageSrcset?.jpeg || undefined}
+            sizes={cardImageSizes}
+            alt={title}
+            loading="lazy"
+            className="w-full h-full object-cover"
+            whileHover={{ scale: isMobile ? 1.02 : 1.12 }}
+            transition={{ duration: 0.8, ease: [0.16, 1, 0.3, 1] }}
+          />
+        </picture>
         <motion.div
           aria-hidden
           className="absolute inset-0 bg-gradient-to-t from-black/50 via-black/20 to-transparent"
@@ -3,17 +3,44 @@ import { useRouter } from "next/navigation"
 
 import { Search, MapPin, Home, DollarSign } from "lucide-react"
 import { motion } from "framer-motion"
-import { useState } from "react"
+import { useEffect, useState } from "react"
 
+import api from "@/lib/api"
 import { fadeIn, smoothOpacity, staggerContainer } from "@/lib/motion"
 
+interface LocationSuggestion {
+  location: string
+  count: number
+}
+
 export default function SearchBar() {
   const [location, setLocation] = useState("")
   const [priceRange, setPriceRange] = useState("")
   const [propertyType, setPropertyType] = useState("")
 
+  const [suggestions, setSuggestions] = useState<LocationSuggestion[]>([])
+
   const router = useRouter()
 
+  useEffect(() => {
+    const prefix = location.trim()
+    if (!prefix) {
+      setSuggestions([])
+      return
+    }
+
+    // Debounce keystrokes so typing only issues one lookup per pause.
+    const timeout = setTimeout(async () => {
+      try {
+        const response = await api.get("/api/properties/locations/suggest/", { params: { prefix } })
+        setSuggestions(response.data)
+      } catch (err) {
+        console.error("Failed to fetch location suggestions", err)
+      }
+    }, 150)
+    return () => clearTimeout(timeout)
+  }, [location])
+
   const handleSearch = () => {
     const params = new URLSearchParams()
     if (location) params.set("location", location)
@@ -59,18 +86,21 @@ export default function SearchBar() {
                 className="flex items-center rounded-lg px-4 py-3 border border-border/70 bg-white/50 backdrop-blur focus-within:border-primary focus-within:ring-2 focus-within:ring-primary/25 transition"
               >
                 <MapPin size={20} className="text-muted-foreground mr-3" />
-                <select
+                <input
+                  type="text"
+                  list="location-suggestions"
                   value={location}
                   onChange={(e) => setLocation(e.target.value)}
+                  placeholder="Location"
                   className="flex-1 bg-transparent outline-none text-foreground"
-                >
-                  <option value="">Select Location</option>
-                  <option value="london">London</option>
-                  <option value="newyork">New York</option>
-                  <option value="dubai">Dubai</option>
-                  <option value="paris">Paris</option>
-                  <option value="malibu">Malibu</option>
-                </select>
+                />
+                <datalist id="location-suggestions">
+                  {suggestions.map((suggestion) => (
+                    <option key={suggestion.location} value={suggestion.location}>
+                      {suggestion.count} {suggestion.count === 1 ? "property" : "properties"}
+                    </option>
+                  ))}
+                </datalist>
               </motion.div>
 
               {/* Property Type */}
@@ -6,6 +6,11 @@ import { usePathname, useRouter } from 'next/navigation'
 import api from '@/lib/api'
 import { useAuth } from '@/context/AuthContext'
 
+export interface Stay {
+  checkIn: string
+  checkOut: string
+}
+
 export function useBooking() {
   const { isAuthenticated } = useAuth()
   const router = useRouter()
@@ -22,7 +27,7 @@ export function useBooking() {
   )
 
   const createBooking = useCallback(
-    async (propertyId: number, redirectPath?: string) => {
+    async (propertyId: number, stay: Stay, redirectPath?: string) => {
       if (!isAuthenticated) {
         handleLoginRedirect(redirectPath)
         return
@@ -34,11 +39,15 @@ export function useBooking() {
       try {
         const response = await api.post('/api/bookings/create/', {
           property_id: propertyId,
+          check_in: stay.checkIn,
+          check_out: stay.checkOut,
         })
 
         router.push(`/payment?booking_id=${response.data.id}`)
       } catch (err: any) {
-        const message = err?.response?.data?.detail || 'Failed to create booking. Please try again.'
+        const data = err?.response?.data
+        const detail = data?.detail ?? data?.check_in ?? data?.check_out ?? data?.non_field_errors
+        const message = (Array.isArray(detail) ? detail.join(' ') : detail) || 'Failed to create booking. Please try again.'
         setError(message)
       } finally {
         setLoadingId(null)
@@ -130,6 +130,10 @@ CACHES = {
 }
 
 
+# Property image thumbnails/WebP are rendered in a worker thread after upload.
+PROPERTY_IMAGE_DERIVATIVES_ASYNC = env.bool('PROPERTY_IMAGE_DERIVATIVES_ASYNC', default=True)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -203,6 +207,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "core": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -1,11 +1,17 @@
 from django.contrib import admin
-from .models import Category, Property
+from .models import Amenity, Category, Property
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'parent')
     prepopulated_fields = {'slug': ('name',)}
 
+@admin.register(Amenity)
+class AmenityAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'bit')
+    readonly_fields = ('bit',)
+    prepopulated_fields = {'slug': ('name',)}
+
 @admin.register(Property)
 class PropertyAdmin(admin.ModelAdmin):
     list_display = ('title', 'category', 'price', 'status', 'is_available')
@@ -0,0 +1,111 @@
+"""
+Server-side map clustering.
+
+Active properties with coordinates are aggregated per geohash cell at every
+precision in CLUSTER_PRECISIONS into LocationCluster rows. A save only touches the
+cells containing the property's old and new position, recomputed from committed rows
+once the save commits, so the aggregates stay fresh without periodic rebuilds;
+`rebuild_location_clusters` repairs any drift.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Min, Q, Sum
+from django.db.models.functions import Substr
+
+from .geo import covering_cells
+from .models import LocationCluster, Property, PropertyStatus
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_PRECISIONS = range(1, 8)
+
+# Map zoom level -> geohash precision, picked so a viewport holds tens of clusters.
+ZOOM_PRECISION = {
+    0: 1, 1: 1, 2: 1,
+    3: 2, 4: 2,
+    5: 3, 6: 3, 7: 3,
+    8: 4, 9: 4,
+    10: 5, 11: 5, 12: 5,
+    13: 6, 14: 6,
+}
+MAX_CLUSTER_PRECISION = CLUSTER_PRECISIONS[-1]
+
+def precision_for_zoom(zoom):
+    return ZOOM_PRECISION.get(zoom, MAX_CLUSTER_PRECISION)
+
+def clusterable_properties():
+    return Property.objects.filter(status=PropertyStatus.ACTIVE).exclude(geohash='')
+
+def _aggregates():
+    return {
+        'count': Count('id'),
+        'latitude_sum': Sum('latitude'),
+        'longitude_sum': Sum('longitude'),
+        'min_price': Min('price'),
+    }
+
+def refresh_cells(geohashes):
+    """Recompute the clusters containing any of the given property geohashes."""
+    geohashes = {geohash for geohash in geohashes if geohash}
+    if not geohashes:
+        return
+
+    cells = sorted({(precision, geohash[:precision]) for precision in CLUSTER_PRECISIONS for geohash in geohashes})
+    with transaction.atomic():
+        # Locking the existing cells in one order serializes refreshes of overlapping
+        # cells, so the later one aggregates after the earlier one has committed.
+        list(
+            LocationCluster.objects.select_for_update()
+            .filter(cell__in={cell for _, cell in cells})
+            .order_by('precision', 'cell')
+            .values_list('pk', flat=True)
+        )
+        for precision, cell in cells:
+            totals = clusterable_properties().filter(geohash__startswith=cell).aggregate(**_aggregates())
+            if totals['count']:
+                LocationCluster.objects.update_or_create(precision=precision, cell=cell, defaults=totals)
+            else:
+                LocationCluster.objects.filter(precision=precision, cell=cell).delete()
+
+def schedule_cell_refresh(geohashes):
+    """
+    Refresh the cells of the given geohashes once the current transaction commits.
+    Aggregating inside the writer's transaction would miss concurrent writers'
+    uncommitted rows and overwrite their refreshes with stale totals.
+    """
+    geohashes = {geohash for geohash in geohashes if geohash}
+    if geohashes:
+        transaction.on_commit(lambda: refresh_cells(geohashes))
+
+def rebuild_clusters(batch_size=1000):
+    """Rebuild every cluster with one grouped query per precision."""
+    with transaction.atomic():
+        LocationCluster.objects.all().delete()
+        created = 0
+        for precision in CLUSTER_PRECISIONS:
+            groups = (
+                clusterable_properties()
+                .order_by()
+                .annotate(cell=Substr('geohash', 1, precision))
+                .values('cell')
+                .annotate(**_aggregates())
+            )
+            clusters = LocationCluster.objects.bulk_create(
+                (LocationCluster(precision=precision, **group) for group in groups.iterator()),
+                batch_size=batch_size,
+            )
+            created += len(clusters)
+    logger.info("Rebuilt %d location clusters", created)
+    return created
+
+def get_clusters(zoom, bbox=None):
+    """Clusters for a zoom level, optionally limited to a (min_lat, min_lng, max_lat, max_lng) viewport."""
+    precision = precision_for_zoom(zoom)
+    clusters = LocationCluster.objects.filter(precision=precision)
+    if bbox is not None:
+        query = Q()
+        for cell in covering_cells(*bbox):
+            query |= Q(cell__startswith=cell[:precision])
+        clusters = clusters.filter(query)
+    return precision, clusters.order_by('cell')
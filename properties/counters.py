@@ -0,0 +1,103 @@
+"""
+Denormalized available-property counters on Category.
+
+`available_count` counts the available (is_available and ACTIVE) properties filed
+directly under a category and `subtree_available_count` those anywhere in its
+subtree. Signals apply +1/-1 deltas with F() updates inside the writing transaction,
+so a rolled back save never leaves the counters ahead. The ancestors of a category
+are read from its materialized path, and every category row a delta touches is
+locked up front in primary key order so concurrent writers cannot deadlock.
+`rebuild_category_counters` repairs any drift.
+"""
+import logging
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import COUNTER_FIELDS, PATH_SEPARATOR, Category, Property, PropertyStatus
+from .services import bump_listing_version
+
+logger = logging.getLogger(__name__)
+
+def is_counted(is_available, status):
+    return bool(is_available) and status == PropertyStatus.ACTIVE
+
+def _path_ids(path):
+    return [int(part) for part in path.split(PATH_SEPARATOR) if part]
+
+def _lock_categories(category_ids):
+    # Locking in one global order keeps writers touching overlapping ancestor chains from deadlocking.
+    list(Category.objects.select_for_update().filter(pk__in=category_ids).order_by('pk').values_list('pk', flat=True))
+
+def _apply_subtree_deltas(deltas):
+    # One UPDATE per distinct delta value rather than per category.
+    by_delta = defaultdict(list)
+    for category_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(category_id)
+    for delta, category_ids in by_delta.items():
+        Category.objects.filter(pk__in=category_ids).update(
+            subtree_available_count=F('subtree_available_count') + delta,
+        )
+
+def adjust_category_counters(deltas):
+    """Apply {category_id: delta} to the direct counters and to every ancestor's subtree counter."""
+    deltas = {category_id: delta for category_id, delta in deltas.items() if category_id is not None and delta}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        subtree_deltas = Counter()
+        for category_id, path in Category.objects.filter(pk__in=deltas).values_list('id', 'path'):
+            for ancestor_id in _path_ids(path):
+                subtree_deltas[ancestor_id] += deltas[category_id]
+        _lock_categories(deltas.keys() | subtree_deltas.keys())
+        for category_id, delta in sorted(deltas.items()):
+            Category.objects.filter(pk=category_id).update(available_count=F('available_count') + delta)
+        _apply_subtree_deltas(subtree_deltas)
+
+def move_subtree_counters(previous_path, path):
+    """Carry a moved category's subtree count from its old ancestors to its new ones."""
+    if previous_path == path:
+        return
+    category_id = _path_ids(path)[-1]
+    previous_ancestors, ancestors = _path_ids(previous_path)[:-1], _path_ids(path)[:-1]
+    with transaction.atomic():
+        _lock_categories({category_id, *previous_ancestors, *ancestors})
+        count = Category.objects.filter(pk=category_id).values_list('subtree_available_count', flat=True).get()
+        deltas = Counter()
+        for ancestor_id in previous_ancestors:
+            deltas[ancestor_id] -= count
+        for ancestor_id in ancestors:
+            deltas[ancestor_id] += count
+        _apply_subtree_deltas(deltas)
+
+def rebuild_category_counters(batch_size=1000):
+    """Recompute every counter from one grouped property query; returns the number of categories fixed."""
+    with transaction.atomic():
+        direct = Counter(dict(
+            Property.objects
+            .filter(is_available=True, status=PropertyStatus.ACTIVE)
+            .order_by()
+            .values_list('category_id')
+            .annotate(count=Count('id'))
+        ))
+        categories = list(Category.objects.select_for_update().only('id', 'path', *COUNTER_FIELDS))
+        subtree = Counter()
+        for category in categories:
+            for ancestor_id in _path_ids(category.path):
+                subtree[ancestor_id] += direct[category.pk]
+
+        stale = []
+        for category in categories:
+            counts = (direct[category.pk], subtree[category.pk])
+            if (category.available_count, category.subtree_available_count) != counts:
+                category.available_count, category.subtree_available_count = counts
+                stale.append(category)
+        Category.objects.bulk_update(stale, COUNTER_FIELDS, batch_size=batch_size)
+        if stale:
+            # bulk_update bypasses signals; retire the category tree and facets cached with the drifted counts.
+            bump_listing_version()
+    logger.info("Repaired counters of %d categories", len(stale))
+    return len(stale)
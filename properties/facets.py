@@ -0,0 +1,117 @@
+"""
+Facet counts for the property listing.
+
+All facets come from one grouped aggregate over the filtered queryset: rows are
+grouped by (category, status, bedroom bucket, price bucket) and the handful of
+resulting groups are folded into per-facet counts in Python.
+"""
+import hashlib
+from decimal import Decimal
+
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from core.cache import get_or_compute
+from .services import get_listing_version
+
+FACETS_CACHE_TIMEOUT = 60 * 10
+
+# Studios have a bucket of their own; counts at or above the last bucket are grouped together.
+BEDROOM_BUCKETS = (0, 1, 2, 3, 4, 5)
+# Lower edges of the price buckets; the last bucket is open-ended.
+PRICE_BUCKET_EDGES = (
+    Decimal('0'),
+    Decimal('1000000'),
+    Decimal('5000000'),
+    Decimal('10000000'),
+    Decimal('50000000'),
+)
+
+# Query parameters that change the page but not the matching set.
+NON_FILTER_PARAMS = {'cursor', 'limit', 'ordering', 'facets'}
+# Stay filters depend on bookings, which do not bump the listing version, so
+# their facets are computed on every request instead of being cached.
+UNCACHED_FILTER_PARAMS = {'check_in', 'check_out'}
+
+def _bedroom_bucket():
+    top = BEDROOM_BUCKETS[-1]
+    return Case(When(bedrooms__gte=top, then=Value(top)), default='bedrooms', output_field=IntegerField())
+
+def _price_bucket():
+    whens = [
+        When(price__gte=edge, then=Value(index))
+        for index, edge in reversed(list(enumerate(PRICE_BUCKET_EDGES)))
+    ]
+    return Case(*whens, default=Value(0), output_field=IntegerField())
+
+def _bedroom_label(bucket):
+    return f"{bucket}+" if bucket == BEDROOM_BUCKETS[-1] else str(bucket)
+
+def _price_bucket_bounds(index):
+    low = PRICE_BUCKET_EDGES[index]
+    high = PRICE_BUCKET_EDGES[index + 1] if index + 1 < len(PRICE_BUCKET_EDGES) else None
+    return low, high
+
+def compute_facets(queryset):
+    groups = (
+        queryset.order_by()
+        .annotate(bedroom_bucket=_bedroom_bucket(), price_bucket=_price_bucket())
+        .values('category_id', 'status', 'bedroom_bucket', 'price_bucket')
+        .annotate(count=Count('id'))
+    )
+
+    categories, statuses = {}, {}
+    bedrooms = dict.fromkeys(BEDROOM_BUCKETS, 0)
+    prices = dict.fromkeys(range(len(PRICE_BUCKET_EDGES)), 0)
+    for group in groups:
+        count = group['count']
+        categories[group['category_id']] = categories.get(group['category_id'], 0) + count
+        statuses[group['status']] = statuses.get(group['status'], 0) + count
+        bedrooms[group['bedroom_bucket']] += count
+        prices[group['price_bucket']] += count
+
+    def ranked(counts):
+        return [
+            {'value': value, 'count': count}
+            for value, count in sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+        ]
+
+    price_facets = []
+    for index, count in prices.items():
+        low, high = _price_bucket_bounds(index)
+        price_facets.append({
+            'value': f"{low}-{high}" if high is not None else f"{low}+",
+            'min': str(low),
+            'max': str(high) if high is not None else None,
+            'count': count,
+        })
+
+    return {
+        'category': ranked(categories),
+        'status': ranked(statuses),
+        'bedrooms': [{'value': _bedroom_label(bucket), 'count': count} for bucket, count in bedrooms.items()],
+        'price': price_facets,
+    }
+
+def normalize_filters(query_params):
+    """Canonical, order-independent representation of the filtering query parameters."""
+    items = []
+    for key in sorted(query_params.keys()):
+        if key in NON_FILTER_PARAMS:
+            continue
+        values = sorted(value.strip() for value in query_params.getlist(key) if value.strip())
+        if values:
+            items.append(f"{key}={','.join(values)}")
+    return '&'.join(items)
+
+def facets_cache_key(query_params):
+    digest = hashlib.sha1(normalize_filters(query_params).encode()).hexdigest()
+    return f"property_facets:{get_listing_version()}:{digest}"
+
+def get_property_facets(queryset, query_params):
+    if UNCACHED_FILTER_PARAMS.intersection(query_params.keys()):
+        return compute_facets(queryset)
+    return get_or_compute(
+        facets_cache_key(query_params),
+        lambda: compute_facets(queryset),
+        timeout=FACETS_CACHE_TIMEOUT,
+    )
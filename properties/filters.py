@@ -0,0 +1,131 @@
+import django_filters
+from django import forms
+from django.db.models import Exists, F, OuterRef, Q
+
+from bookings.services import overlapping_bookings
+
+from .geo import covering_cells, half_chord_limit, haversine_half_chord, radius_bbox
+from .models import Amenity, Property
+
+# Upper bound on a radius search, to keep the candidate set bounded.
+MAX_RADIUS_KM = 500
+
+def _cells_query(cells):
+    query = Q()
+    for cell in cells:
+        query |= Q(geohash__startswith=cell)
+    return query
+
+def within_bbox(queryset, min_lat, min_lng, max_lat, max_lng):
+    """Properties inside the box; min_lng > max_lng means the box crosses the antimeridian."""
+    queryset = queryset.filter(
+        _cells_query(covering_cells(min_lat, min_lng, max_lat, max_lng)),
+        latitude__gte=min_lat,
+        latitude__lte=max_lat,
+    )
+    if min_lng <= max_lng:
+        return queryset.filter(longitude__gte=min_lng, longitude__lte=max_lng)
+    return queryset.filter(Q(longitude__gte=min_lng) | Q(longitude__lte=max_lng))
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Properties within radius_km. The circle's bounding box prunes candidates with the
+    indexed geohash and coordinate filters, and the exact great-circle test is a
+    haversine comparison in the same query, so the queryset stays lazy.
+    """
+    return (
+        within_bbox(queryset, *radius_bbox(latitude, longitude, radius_km))
+        .alias(half_chord=haversine_half_chord(latitude, longitude))
+        .filter(half_chord__lte=half_chord_limit(radius_km))
+    )
+
+class BoundingBoxField(forms.CharField):
+    """`min_lng,min_lat,max_lng,max_lat`, the west, south, east, north edges of the box."""
+
+    def clean(self, value):
+        value = super().clean(value)
+        if not value:
+            return None
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(part) for part in value.split(","))
+        except ValueError:
+            raise forms.ValidationError("Enter four comma separated numbers: min_lng,min_lat,max_lng,max_lat.")
+        if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= 180 and -180 <= max_lng <= 180):
+            raise forms.ValidationError("Bounding box is out of range.")
+        return min_lat, min_lng, max_lat, max_lng
+
+class BoundingBoxFilter(django_filters.Filter):
+    field_class = BoundingBoxField
+
+class PropertyFilterForm(forms.Form):
+    def clean(self):
+        cleaned_data = super().clean()
+        lat, lng, radius = (cleaned_data.get(name) for name in ("lat", "lng", "radius"))
+        given = [value is not None for value in (lat, lng, radius)]
+        if any(given) and not all(given):
+            raise forms.ValidationError("lat, lng and radius must be given together.")
+        if radius is not None:
+            if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+                raise forms.ValidationError("lat or lng is out of range.")
+            if not 0 < radius <= MAX_RADIUS_KM:
+                raise forms.ValidationError(f"radius must be between 0 and {MAX_RADIUS_KM} km.")
+        check_in, check_out = cleaned_data.get("check_in"), cleaned_data.get("check_out")
+        if (check_in is None) != (check_out is None):
+            raise forms.ValidationError("check_in and check_out must be given together.")
+        if check_in is not None and check_out <= check_in:
+            raise forms.ValidationError("check_out must be after check_in.")
+        return cleaned_data
+
+class PropertyFilter(django_filters.FilterSet):
+    min_price = django_filters.NumberFilter(field_name="price", lookup_expr="gte")
+    max_price = django_filters.NumberFilter(field_name="price", lookup_expr="lte")
+    min_bedrooms = django_filters.NumberFilter(field_name="bedrooms", lookup_expr="gte")
+    max_bedrooms = django_filters.NumberFilter(field_name="bedrooms", lookup_expr="lte")
+    min_bathrooms = django_filters.NumberFilter(field_name="bathrooms", lookup_expr="gte")
+    max_bathrooms = django_filters.NumberFilter(field_name="bathrooms", lookup_expr="lte")
+    available = django_filters.BooleanFilter(field_name="is_available")
+    amenities = django_filters.CharFilter(method="filter_amenities")
+    bbox = BoundingBoxFilter(method="filter_bbox")
+    lat = django_filters.NumberFilter(method="filter_radius")
+    lng = django_filters.NumberFilter(method="filter_radius")
+    radius = django_filters.NumberFilter(method="filter_radius")
+    check_in = django_filters.DateFilter(method="filter_stay")
+    check_out = django_filters.DateFilter(method="filter_stay")
+
+    class Meta:
+        model = Property
+        fields = ["category", "status"]
+        form = PropertyFilterForm
+
+    def filter_amenities(self, queryset, name, value):
+        """Match properties having every listed amenity (comma separated) via their bitmask."""
+        required = Amenity.objects.mask_for(value.split(","))
+        if required is None:
+            # An amenity nobody has cannot be matched.
+            return queryset.none()
+        if not required:
+            return queryset
+        return queryset.alias(
+            amenity_match=F("amenity_mask").bitand(required)
+        ).filter(amenity_match=required)
+
+    def filter_bbox(self, queryset, name, value):
+        return within_bbox(queryset, *value)
+
+    def filter_radius(self, queryset, name, value):
+        # lat, lng and radius each route here; apply the search once, on radius.
+        if name != "radius":
+            return queryset
+        data = self.form.cleaned_data
+        return within_radius(queryset, float(data["lat"]), float(data["lng"]), float(data["radius"]))
+
+    def filter_stay(self, queryset, name, value):
+        """
+        Bookable properties with no non-canceled booking overlapping the stay. The
+        correlated NOT EXISTS is an anti-join the database resolves with booking_stay_idx.
+        """
+        if name != "check_out":
+            return queryset
+        data = self.form.cleaned_data
+        booked = overlapping_bookings(data["check_in"], data["check_out"]).filter(property=OuterRef("pk"))
+        return queryset.filter(~Exists(booked), is_available=True)
@@ -0,0 +1,102 @@
+"""
+Geohash helpers for spatial queries on stock PostgreSQL/SQLite.
+
+Each property stores the geohash of its coordinates in an indexed column. A query
+area is covered with a small set of geohash cells so candidates can be pruned with
+indexed prefix matches; the exact great-circle test then runs in the same query.
+"""
+import math
+
+from django.db.models import F
+from django.db.models.functions import Cos, Power, Radians, Sin
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate between longitude and latitude, starting with longitude.
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+def grid_shape(precision):
+    """Return the number of (rows, columns) in the geohash grid at precision."""
+    total_bits = 5 * precision
+    return 1 << (total_bits // 2), 1 << ((total_bits + 1) // 2)
+
+def _cell_span(low, high, origin, size, count):
+    first = int((low - origin) // size)
+    last = int((high - origin) // size)
+    return max(first, 0), min(last, count - 1)
+
+def covering_cells(min_lat, min_lng, max_lat, max_lng, max_cells=32):
+    """
+    Return the geohash prefixes of the finest grid whose cells covering the box number
+    at most max_cells. Boxes crossing the antimeridian (min_lng > max_lng) are split.
+    """
+    if min_lng > max_lng:
+        return (
+            covering_cells(min_lat, min_lng, max_lat, 180.0, max_cells // 2)
+            + covering_cells(min_lat, -180.0, max_lat, max_lng, max_cells // 2)
+        )
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        rows, columns = grid_shape(precision)
+        height, width = 180.0 / rows, 360.0 / columns
+        row_start, row_end = _cell_span(min_lat, max_lat, -90.0, height, rows)
+        col_start, col_end = _cell_span(min_lng, max_lng, -180.0, width, columns)
+        if (row_end - row_start + 1) * (col_end - col_start + 1) <= max_cells:
+            return sorted({
+                # Encode each cell's centre to get its hash.
+                encode_geohash(-90.0 + (row + 0.5) * height, -180.0 + (col + 0.5) * width, precision)
+                for row in range(row_start, row_end + 1)
+                for col in range(col_start, col_end + 1)
+            })
+    # Even single-character cells are too many; the whole world is the only cover.
+    return ['']
+
+def radius_bbox(latitude, longitude, radius_km):
+    """Smallest latitude/longitude box containing the circle."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - dlat, latitude + dlat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        # The circle reaches a pole, so every longitude is in range.
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+
+    dlng = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(latitude))))
+    if dlng >= 180.0:
+        return min_lat, -180.0, max_lat, 180.0
+    min_lng = (longitude - dlng + 180.0) % 360.0 - 180.0
+    max_lng = (longitude + dlng + 180.0) % 360.0 - 180.0
+    return min_lat, min_lng, max_lat, max_lng
+
+def haversine_half_chord(latitude, longitude):
+    """
+    SQL expression of the haversine term `a` between each row's coordinates and
+    (latitude, longitude); the distance is 2 * R * asin(sqrt(a)).
+    """
+    lat = math.radians(latitude)
+    return (
+        Power(Sin((Radians(F('latitude')) - lat) / 2), 2)
+        + Cos(Radians(F('latitude'))) * math.cos(lat) * Power(Sin((Radians(F('longitude')) - math.radians(longitude)) / 2), 2)
+    )
+
+def half_chord_limit(radius_km):
+    """The largest haversine term `a` of a point within radius_km, so filters need no asin/sqrt."""
+    return math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi) / 2) ** 2
@@ -0,0 +1,124 @@
+"""
+Image derivatives for property photos.
+
+After an upload commits, a background worker renders fixed-width thumbnails of the
+original in JPEG and WebP. Derivatives are stored under the SHA-256 of the source
+bytes, so identical uploads share files and regenerating is idempotent. The generated
+names are recorded in `Property.image_variants` together with the source image name.
+Variants whose source no longer matches the current image are ignored, so a stale map
+is never served while a new upload is still being processed.
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import Property
+
+logger = logging.getLogger(__name__)
+
+IMAGE_WIDTHS = (320, 640, 1024, 1600)
+DERIVATIVE_ROOT = 'properties/derived'
+# Output format -> (file extension, Pillow save options).
+IMAGE_FORMATS = {
+    'webp': ('webp', {'format': 'WEBP', 'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-derivatives')
+
+def derivative_name(digest, width, extension):
+    return f"{DERIVATIVE_ROOT}/{digest[:2]}/{digest}/{width}w.{extension}"
+
+def target_widths(source_width):
+    """Widths to render without upscaling; the source width caps the set when it is smaller than the largest."""
+    widths = [width for width in IMAGE_WIDTHS if width < source_width]
+    if source_width <= IMAGE_WIDTHS[-1]:
+        widths.append(source_width)
+    return widths
+
+def _encode(image, image_format):
+    _, options = IMAGE_FORMATS[image_format]
+    if image_format == 'jpeg' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    buffer = BytesIO()
+    image.save(buffer, **options)
+    return buffer.getvalue()
+
+def render_derivatives(data, storage):
+    """Store every derivative of the image bytes and return {format: {width: name}}."""
+    digest = hashlib.sha256(data).hexdigest()
+    with Image.open(BytesIO(data)) as source:
+        source = ImageOps.exif_transpose(source)
+        formats = {image_format: {} for image_format in IMAGE_FORMATS}
+        for width in target_widths(source.width):
+            height = max(1, round(source.height * width / source.width))
+            resized = source.resize((width, height), Image.Resampling.LANCZOS)
+            for image_format, (extension, _) in IMAGE_FORMATS.items():
+                name = derivative_name(digest, width, extension)
+                if not storage.exists(name):
+                    name = storage.save(name, ContentFile(_encode(resized, image_format)))
+                formats[image_format][str(width)] = name
+    return formats
+
+def generate_image_derivatives(property_id):
+    """Render and record the derivatives of a property's current image."""
+    prop = Property.objects.filter(pk=property_id).only('image').first()
+    if prop is None or not prop.image:
+        return None
+
+    source_name = prop.image.name
+    try:
+        with prop.image.open('rb') as image_file:
+            data = image_file.read()
+        formats = render_derivatives(data, prop.image.storage)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.exception("Could not render derivatives of %s for property %s", source_name, property_id)
+        return None
+
+    variants = {'source': source_name, 'formats': formats}
+    with transaction.atomic():
+        current = Property.objects.select_for_update().filter(pk=property_id).first()
+        # Another upload may have replaced the image while this one was processed.
+        if current is None or current.image.name != source_name:
+            return None
+        current.image_variants = variants
+        current.save(update_fields=['image_variants', 'updated_at'])
+    logger.info("Stored %d derivatives for property %s", sum(map(len, formats.values())), property_id)
+    return variants
+
+def _run_in_background(property_id):
+    close_old_connections()
+    try:
+        generate_image_derivatives(property_id)
+    finally:
+        close_old_connections()
+
+def schedule_image_derivatives(property_id):
+    """Generate derivatives once the current transaction commits, in a worker thread by default."""
+    def submit():
+        if getattr(settings, 'PROPERTY_IMAGE_DERIVATIVES_ASYNC', True):
+            executor.submit(_run_in_background, property_id)
+        else:
+            generate_image_derivatives(property_id)
+    transaction.on_commit(submit)
+
+def variant_urls(variants, image_name, to_url):
+    """Map each format to {width: url}, smallest first, or {} when variants are stale."""
+    if not image_name or not variants or variants.get('source') != image_name:
+        return {}
+    return {
+        image_format: {width: to_url(name) for width, name in sorted(sized.items(), key=lambda item: int(item[0]))}
+        for image_format, sized in variants['formats'].items()
+    }
+
+def srcsets(urls):
+    """Turn variant_urls() output into one `srcset` attribute value per format."""
+    return {image_format: ', '.join(f"{url} {width}w" for width, url in sized.items()) for image_format, sized in urls.items()}
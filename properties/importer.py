@@ -0,0 +1,338 @@
+"""
+Bulk import of partner catalogs.
+
+Rows are streamed from CSV or JSON Lines and handled in chunks: each chunk is
+validated (optionally in worker processes, which need no database access), gets
+its categories from a slug -> id map loaded once, its slugs deduplicated against
+the database and the rest of the file with one query, and is inserted with a
+single `bulk_create`. `bulk_create` skips `Property.save()` and the model signals,
+so the derived columns and category counters are maintained here and the caches
+and aggregates the signals would have refreshed are rebuilt once at the end of the run.
+"""
+import csv
+import json
+import logging
+import multiprocessing
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.text import slugify
+
+from .clusters import rebuild_clusters, refresh_cells
+from .counters import adjust_category_counters, is_counted
+from .geo import encode_geohash
+from .locations import invalidate_location_index
+from .models import Amenity, Category, Property, PropertyStatus
+from .services import bump_listing_version
+from .similarity import invalidate_similarity_index
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+# Columns read from each row; `category` holds a category slug.
+IMPORT_FIELDS = (
+    'title', 'slug', 'description', 'location', 'latitude', 'longitude', 'price',
+    'bedrooms', 'bathrooms', 'amenities', 'status', 'is_available',
+)
+# Separator of the amenity names in a CSV cell.
+AMENITY_SEPARATOR = '|'
+# Numbered suffixes probed per duplicate slug before falling back to a wider search.
+SLUG_SUFFIX_PROBE = 20
+# Beyond this many touched geohashes one grouped rebuild beats refreshing cell by cell.
+CLUSTER_REFRESH_LIMIT = 200
+BOOLEAN_VALUES = {'true': True, 'yes': True, 'y': True, '1': True, 'false': False, 'no': False, 'n': False, '0': False}
+COORDINATE_RANGES = {'latitude': (-90, 90), 'longitude': (-180, 180)}
+
+def detect_format(path):
+    for import_format in IMPORT_FORMATS:
+        if path.lower().endswith(f'.{import_format}'):
+            return import_format
+    if path.lower().endswith('.ndjson'):
+        return 'jsonl'
+    return None
+
+def read_rows(stream, import_format):
+    """Yield (line number, raw dict) pairs without loading the whole file."""
+    if import_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, exc
+            continue
+        yield line_number, row if isinstance(row, dict) else ValueError("Expected a JSON object.")
+
+def _amenity_names(value):
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            value = json.loads(value)
+        else:
+            return [name.strip() for name in value.split(AMENITY_SEPARATOR) if name.strip()]
+    if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+        raise ValidationError("Enter a list of amenity names.")
+    return value
+
+def validate_row(raw, category_ids):
+    """
+    Clean one raw row with the model fields' own validation. Returns the cleaned
+    values with `category_id` resolved, or raises ValidationError keyed by column.
+    """
+    if not isinstance(raw, dict):
+        raise ValidationError({'row': [str(raw)]})
+
+    cleaned, errors = {}, {}
+    for name in IMPORT_FIELDS:
+        model_field = Property._meta.get_field(name)
+        value = raw.get(name)
+        if isinstance(value, str) and model_field.name != 'description':
+            value = value.strip()
+        try:
+            if value in (None, ''):
+                if name == 'slug':
+                    # Derived from the title while slugs are allocated.
+                    cleaned[name] = ''
+                elif model_field.has_default():
+                    cleaned[name] = model_field.get_default()
+                elif model_field.blank:
+                    cleaned[name] = None if model_field.null else ''
+                else:
+                    raise ValidationError(model_field.error_messages['blank'], code='blank')
+                continue
+            if name == 'amenities':
+                value = _amenity_names(value)
+            elif name == 'is_available' and isinstance(value, str):
+                value = BOOLEAN_VALUES.get(value.lower(), value)
+            cleaned[name] = model_field.clean(value, None)
+            if name in COORDINATE_RANGES:
+                low, high = COORDINATE_RANGES[name]
+                if not low <= cleaned[name] <= high:
+                    raise ValidationError(f"Must be between {low} and {high}.")
+        except (ValidationError, ValueError) as exc:
+            errors[name] = exc.messages if isinstance(exc, ValidationError) else [str(exc)]
+
+    category = raw.get('category')
+    category = category.strip() if isinstance(category, str) else category
+    if not category:
+        errors['category'] = ["This field is required."]
+    elif category not in category_ids:
+        errors['category'] = [f"Unknown category slug '{category}'."]
+    else:
+        cleaned['category_id'] = category_ids[category]
+
+    if (cleaned.get('latitude') is None) != (cleaned.get('longitude') is None):
+        errors.setdefault('latitude', []).append("Latitude and longitude must be given together.")
+    if not cleaned.get('slug') and 'title' in cleaned and not slugify(cleaned['title']):
+        errors.setdefault('slug', []).append("A slug is required when the title has no slug characters.")
+
+    if errors:
+        raise ValidationError(errors)
+    return cleaned
+
+def validate_chunk(rows, category_ids):
+    """Validate (line number, raw) pairs into ([(line number, cleaned)], [(line number, errors)])."""
+    valid, invalid = [], []
+    for line_number, raw in rows:
+        try:
+            valid.append((line_number, validate_row(raw, category_ids)))
+        except ValidationError as exc:
+            invalid.append((line_number, exc.message_dict if hasattr(exc, 'error_dict') else {'row': exc.messages}))
+    return valid, invalid
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _bounded_map(executor, fn, chunks, window, *args):
+    """Like executor.map, but keeps at most `window` chunks in flight so input stays streamed."""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(fn, chunk, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+class SlugAllocator:
+    """Hands out unique slugs for a chunk with at most two lookups against the database."""
+
+    def __init__(self):
+        self.taken = set()
+        self.max_length = Property._meta.get_field('slug').max_length
+
+    def _candidates(self, base):
+        yield base
+        for number in range(2, SLUG_SUFFIX_PROBE + 2):
+            suffix = f'-{number}'
+            yield f'{base[:self.max_length - len(suffix)]}{suffix}'
+
+    def _load_taken(self, slugs):
+        slugs = slugs - self.taken
+        if slugs:
+            self.taken.update(Property.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+
+    def assign(self, rows):
+        bases = [(row['slug'] or slugify(row['title']))[:self.max_length] for row in rows]
+        self._load_taken(set(bases))
+        # Only bases that collide need their numbered variants looked up.
+        seen, colliding = set(), set()
+        for base in bases:
+            if base in self.taken or base in seen:
+                colliding.add(base)
+            seen.add(base)
+        self._load_taken({candidate for base in colliding for candidate in self._candidates(base)})
+        for row, base in zip(rows, bases):
+            slug = next((candidate for candidate in self._candidates(base) if candidate not in self.taken), None)
+            if slug is None:
+                slug = self._widen(base)
+            self.taken.add(slug)
+            row['slug'] = slug
+
+    def _widen(self, base):
+        # Every probed suffix is taken; continue after the highest number in use.
+        prefix = base[:self.max_length - 8]
+        existing = Property.objects.filter(slug__startswith=f'{prefix}-').values_list('slug', flat=True)
+        numbers = [
+            int(slug.rsplit('-', 1)[1]) for slug in {*existing, *self.taken}
+            if slug.startswith(f'{prefix}-') and slug.rsplit('-', 1)[1].isdigit()
+        ]
+        return f'{prefix}-{max(numbers, default=1) + 1}'
+
+class AmenityVocabulary:
+    """Amenity slug -> bit map loaded once; unknown names are registered on first sight."""
+
+    def __init__(self):
+        self.bits = dict(Amenity.objects.values_list('slug', 'bit'))
+        # Slugs refused because the vocabulary is full; not retried for later rows.
+        self.unregistered = set()
+
+    def mask_for(self, names):
+        """Return (mask, names left out of the mask because the vocabulary is full)."""
+        mask, skipped = 0, []
+        for name in names:
+            slug = slugify(name) if isinstance(name, str) else ''
+            if not slug:
+                continue
+            if slug not in self.bits and slug not in self.unregistered:
+                amenity = Amenity.objects.register(slug, name)
+                if amenity is None:
+                    self.unregistered.add(slug)
+                else:
+                    self.bits[slug] = amenity.bit
+            if slug in self.unregistered:
+                skipped.append(name)
+                continue
+            mask |= 1 << self.bits[slug]
+        return mask, skipped
+
+class ImportResult:
+    """Counters and touched keys of one import run."""
+
+    def __init__(self):
+        self.read = 0
+        self.created = 0
+        self.errors = []
+        # (line number, {column: messages}) of rows imported with some data left out.
+        self.warnings = []
+        self.geohashes = set()
+        self.elapsed = 0.0
+
+    @property
+    def invalid(self):
+        return len(self.errors)
+
+    @property
+    def rows_per_second(self):
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+def _build_property(line_number, row, amenities, result):
+    latitude, longitude = row['latitude'], row['longitude']
+    amenity_mask, skipped = amenities.mask_for(row['amenities'] or [])
+    if skipped:
+        result.warnings.append((line_number, {
+            'amenities': [f"The amenity vocabulary is full; {', '.join(skipped)} left out of the amenity mask."],
+        }))
+    return Property(
+        **row,
+        amenity_mask=amenity_mask,
+        geohash=encode_geohash(latitude, longitude) if latitude is not None and longitude is not None else '',
+    )
+
+def refresh_derived_data(result):
+    """Refresh what the skipped save signals would have: clusters, caches and the similarity index."""
+    if len(result.geohashes) > CLUSTER_REFRESH_LIMIT:
+        rebuild_clusters()
+    else:
+        refresh_cells(result.geohashes)
+    invalidate_location_index()
+    bump_listing_version()
+    invalidate_similarity_index()
+
+def import_properties(stream, import_format, batch_size=500, workers=1, dry_run=False, on_chunk=None):
+    """
+    Import every valid row of `stream`; invalid rows are reported, not raised. Each
+    chunk commits on its own, so an interrupted run keeps the chunks already written.
+    """
+    started = time.monotonic()
+    result = ImportResult()
+    category_ids = dict(Category.objects.values_list('slug', 'id'))
+    slugs = SlugAllocator()
+    amenities = AmenityVocabulary()
+
+    def counted(rows):
+        for row in rows:
+            result.read += 1
+            yield row
+
+    chunks = chunked(counted(read_rows(stream, import_format)), batch_size)
+    executor = None
+    if workers > 1:
+        # Forked workers inherit the configured Django app registry that validation
+        # relies on; spawned ones would import the models before Django is set up.
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+    try:
+        if executor is None:
+            validated = (validate_chunk(chunk, category_ids) for chunk in chunks)
+        else:
+            validated = _bounded_map(executor, validate_chunk, chunks, workers * 2, category_ids)
+
+        for valid, invalid in validated:
+            result.errors.extend(invalid)
+            if valid and not dry_run:
+                with transaction.atomic():
+                    slugs.assign([row for _, row in valid])
+                    objs = [_build_property(line_number, row, amenities, result) for line_number, row in valid]
+                    Property.objects.bulk_create(objs, batch_size=batch_size)
+                    adjust_category_counters(Counter(
+                        obj.category_id for obj in objs if is_counted(obj.is_available, obj.status)
+                    ))
+                result.created += len(objs)
+                result.geohashes.update(obj.geohash for obj in objs if obj.status == PropertyStatus.ACTIVE)
+            if on_chunk is not None:
+                on_chunk(result)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        # Chunks committed before an interruption stay, so their derived data is refreshed too.
+        if result.created:
+            refresh_derived_data(result)
+
+    result.elapsed = time.monotonic() - started
+    logger.info("Imported %d of %d property rows in %.1fs", result.created, result.read, result.elapsed)
+    return result
@@ -0,0 +1,105 @@
+"""
+In-memory prefix index for location autocomplete.
+
+Every worker keeps a trie of active property locations whose nodes store their own
+top-N locations by listing count, so a lookup only walks the prefix. Locations are
+indexed at every word start, letting "mar" suggest "Dubai Marina". Property signals
+bump a shared version key in the cache and each worker rebuilds lazily on its next
+lookup after the version changes.
+"""
+import logging
+import re
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Property, PropertyStatus
+
+logger = logging.getLogger(__name__)
+
+LOCATION_INDEX_VERSION_KEY = 'property_locations:version'
+MAX_SUGGESTIONS = 20
+WORD_START_RE = re.compile(r'(?:^|(?<=[\s,/-]))\w', re.UNICODE)
+
+class _TrieNode:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+class LocationTrie:
+    def __init__(self, location_counts, top_n=MAX_SUGGESTIONS):
+        self.top_n = top_n
+        self.root = _TrieNode()
+        # Sorting once up front means each node's top list is just its first N arrivals.
+        ranked = sorted(location_counts.items(), key=lambda item: (-item[1], item[0].lower()))
+        for location, count in ranked:
+            self._insert(location, count)
+
+    def _insert(self, location, count):
+        normalized = location.lower()
+        visited = set()
+        for match in WORD_START_RE.finditer(normalized):
+            node = self.root
+            for char in normalized[match.start():]:
+                node = node.children.setdefault(char, _TrieNode())
+                # A location reachable from several word starts must appear once per node.
+                if id(node) not in visited and len(node.top) < self.top_n:
+                    node.top.append((location, count))
+                visited.add(id(node))
+
+    def suggest(self, prefix, limit=10):
+        node = self.root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        if node is self.root:
+            return []
+        return [{'location': location, 'count': count} for location, count in node.top[:limit]]
+
+def build_location_trie():
+    counts = dict(
+        Property.objects.filter(status=PropertyStatus.ACTIVE)
+        .values('location')
+        .annotate(count=Count('id'))
+        .values_list('location', 'count')
+    )
+    return LocationTrie(counts)
+
+class _LocationIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._trie = None
+        self._version = None
+
+    def get(self):
+        version = cache.get(LOCATION_INDEX_VERSION_KEY)
+        if version is None:
+            version = uuid.uuid4().hex
+            cache.add(LOCATION_INDEX_VERSION_KEY, version, timeout=None)
+            version = cache.get(LOCATION_INDEX_VERSION_KEY, version)
+
+        if self._trie is None or version != self._version:
+            with self._lock:
+                if self._trie is None or version != self._version:
+                    logger.info("Rebuilding location index (version %s)", version)
+                    self._trie = build_location_trie()
+                    self._version = version
+        return self._trie
+
+_index = _LocationIndex()
+
+def suggest_locations(prefix, limit=10):
+    prefix = prefix.strip()
+    if not prefix:
+        return []
+    return _index.get().suggest(prefix, min(limit, MAX_SUGGESTIONS))
+
+def invalidate_location_index():
+    """Make every worker rebuild its trie once the current transaction commits."""
+    transaction.on_commit(lambda: cache.set(LOCATION_INDEX_VERSION_KEY, uuid.uuid4().hex, timeout=None))
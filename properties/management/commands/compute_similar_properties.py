@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.services import rebuild_similar_properties
+from properties.similarity import DEFAULT_TOP_K, MAX_TOP_K
+
+class Command(BaseCommand):
+    help = "Precompute the top-K most similar properties of every property into SimilarProperty."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=1, help="Processes scoring batches in parallel.")
+
+    def handle(self, *args, **options):
+        for option in ("top_k", "batch_size", "workers"):
+            if options[option] < 1:
+                raise CommandError(f"--{option.replace('_', '-')} must be a positive integer.")
+        started = time.monotonic()
+        created = rebuild_similar_properties(
+            k=min(options["top_k"], MAX_TOP_K),
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Stored {created} similar-property rows in {elapsed:.1f}s."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from properties.images import generate_image_derivatives
+from properties.models import Property
+
+class Command(BaseCommand):
+    help = "Render thumbnails and WebP variants for property images that lack current ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate variants that are already current.")
+
+    def handle(self, *args, **options):
+        generated = 0
+        rows = Property.objects.exclude(image="").exclude(image__isnull=True).values_list("id", "image", "image_variants")
+        for property_id, image, variants in rows.iterator():
+            if not options["force"] and (variants or {}).get("source") == image:
+                continue
+            if generate_image_derivatives(property_id) is not None:
+                generated += 1
+        self.stdout.write(self.style.SUCCESS(f"Generated derivatives for {generated} properties."))
@@ -0,0 +1,63 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.importer import IMPORT_FORMATS, detect_format, import_properties
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import properties from a CSV or JSON Lines file ('-' reads stdin). "
+        "Rows reference categories by slug; amenities are a list, or '|'-separated in CSV."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows validated and inserted per chunk.")
+        parser.add_argument("--workers", type=int, default=1, help="Processes validating chunks in parallel.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row without writing.")
+        parser.add_argument("--max-errors", type=int, default=20, help="Invalid rows listed in the report.")
+
+    def handle(self, *args, **options):
+        for option in ("batch_size", "workers"):
+            if options[option] < 1:
+                raise CommandError(f"--{option.replace('_', '-')} must be a positive integer.")
+        path = options["path"]
+        import_format = options["format"] or detect_format(path)
+        if import_format is None:
+            raise CommandError("Could not tell the file format from its name; pass --format.")
+
+        try:
+            stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        with stream:
+            result = import_properties(
+                stream,
+                import_format,
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                dry_run=options["dry_run"],
+                on_chunk=self.report_progress if options["verbosity"] > 1 else None,
+            )
+
+        self.report_rows(result.errors, options["max_errors"], "invalid rows")
+        self.report_rows(result.warnings, options["max_errors"], "rows with warnings")
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        count = result.read - result.invalid if options["dry_run"] else result.created
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {count} of {result.read} rows ({result.invalid} invalid) in {result.elapsed:.1f}s, "
+            f"{result.rows_per_second:.0f} rows/s."
+        ))
+
+    def report_rows(self, rows, limit, label):
+        for line_number, messages_by_column in rows[:limit]:
+            details = "; ".join(f"{name}: {' '.join(messages)}" for name, messages in messages_by_column.items())
+            self.stderr.write(f"Line {line_number}: {details}")
+        if len(rows) > limit:
+            self.stderr.write(f"... and {len(rows) - limit} more {label}.")
+
+    def report_progress(self, result):
+        self.stdout.write(f"{result.read} rows read, {result.created} created, {result.invalid} invalid.")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from properties.counters import rebuild_category_counters
+
+class Command(BaseCommand):
+    help = "Recompute the direct and subtree available-property counters of every category."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        repaired = rebuild_category_counters(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Repaired counters of {repaired} categories."))
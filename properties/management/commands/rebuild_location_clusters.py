@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from properties.clusters import rebuild_clusters
+
+class Command(BaseCommand):
+    help = "Rebuild the pre-aggregated map clusters from property coordinates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created = rebuild_clusters(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {created} location clusters."))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:20
+
+from django.db import migrations, models
+
+
+def populate_category_paths(apps, schema_editor):
+    Category = apps.get_model('properties', 'Category')
+    parents = dict(Category.objects.values_list('id', 'parent_id'))
+
+    def build_path(category_id, seen=()):
+        parent_id = parents[category_id]
+        if parent_id is None or parent_id in seen:
+            return f"/{category_id}/"
+        return f"{build_path(parent_id, seen + (category_id,))}{category_id}/"
+
+    for category_id in parents:
+        path = build_path(category_id)
+        Category.objects.filter(pk=category_id).update(path=path, depth=path.count('/') - 2)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0002_property_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_category_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0003_category_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['created_at', 'id'], name='property_created_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['price', 'id'], name='property_price_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from properties.search import get_search_backend
+
+    get_search_backend(schema_editor.connection).install(schema_editor.connection)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from properties.search import get_search_backend
+
+    get_search_backend(schema_editor.connection).uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0004_property_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
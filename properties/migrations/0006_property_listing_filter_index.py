@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0005_property_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['status', 'is_available', 'category', 'price'], name='property_listing_filter_idx'),
+        ),
+    ]
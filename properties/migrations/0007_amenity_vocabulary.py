@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:29
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def backfill_amenity_masks(apps, schema_editor):
+    Amenity = apps.get_model('properties', 'Amenity')
+    Property = apps.get_model('properties', 'Property')
+
+    bits = {}
+    for prop in Property.objects.only('id', 'amenities').iterator():
+        mask = 0
+        for name in prop.amenities or []:
+            slug = slugify(name) if isinstance(name, str) else ''
+            if not slug:
+                continue
+            if slug not in bits:
+                if len(bits) >= 63:
+                    continue
+                bits[slug] = len(bits)
+                Amenity.objects.create(slug=slug, name=name.strip(), bit=bits[slug])
+            mask |= 1 << bits[slug]
+        if mask:
+            Property.objects.filter(pk=prop.pk).update(amenity_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0006_property_listing_filter_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Amenity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(unique=True)),
+                ('bit', models.PositiveSmallIntegerField(unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Amenities',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='amenity_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_amenity_masks, migrations.RunPython.noop),
+    ]
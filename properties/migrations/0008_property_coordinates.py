@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0007_amenity_vocabulary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0008_property_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('precision', models.PositiveSmallIntegerField()),
+                ('cell', models.CharField(max_length=12)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('latitude_sum', models.FloatField(default=0)),
+                ('longitude_sum', models.FloatField(default=0)),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=12)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('precision', 'cell'), name='unique_cluster_cell')],
+            },
+        ),
+    ]
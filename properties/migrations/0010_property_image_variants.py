@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0009_location_cluster'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
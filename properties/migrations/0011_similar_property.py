@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0010_property_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarProperty',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_entries', to='properties.property')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='properties.property')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('property', 'rank'), name='unique_similar_rank')],
+            },
+        ),
+    ]
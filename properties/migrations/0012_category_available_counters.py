@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:53
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def populate_category_counters(apps, schema_editor):
+    Category = apps.get_model('properties', 'Category')
+    Property = apps.get_model('properties', 'Property')
+    direct = Counter(
+        Property.objects.filter(is_available=True, status='ACTIVE').values_list('category_id', flat=True)
+    )
+    subtree = Counter()
+    for category_id, path in Category.objects.values_list('id', 'path'):
+        for ancestor_id in (int(part) for part in path.split('/') if part):
+            subtree[ancestor_id] += direct[category_id]
+    for category_id in Category.objects.values_list('id', flat=True):
+        if direct[category_id] or subtree[category_id]:
+            Category.objects.filter(pk=category_id).update(
+                available_count=direct[category_id], subtree_available_count=subtree[category_id],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0011_similar_property'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='available_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='subtree_available_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_category_counters, migrations.RunPython.noop),
+    ]
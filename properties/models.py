@@ -1,10 +1,31 @@
-from django.db import models
+import logging
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
 from django.utils.text import slugify
 
+from .geo import encode_geohash
+
+logger = logging.getLogger(__name__)
+
+PATH_SEPARATOR = '/'
+# Category columns maintained by properties.counters.
+COUNTER_FIELDS = ('available_count', 'subtree_available_count')
+
 class Category(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True)
     parent = models.ForeignKey('self', null=True, blank=True, related_name='children', on_delete=models.CASCADE)
+    # Materialized path of ancestor ids including this node, e.g. "/1/4/9/".
+    # A whole subtree is a single indexed prefix match on this column.
+    path = models.CharField(max_length=255, db_index=True, blank=True, editable=False)
+    depth = models.PositiveIntegerField(default=0, editable=False)
+    # Available (is_available and ACTIVE) properties filed directly under this category
+    # and under its whole subtree. Maintained by properties.counters; never written by save().
+    available_count = models.PositiveIntegerField(default=0, editable=False)
+    subtree_available_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name_plural = "Categories"
@@ -15,6 +36,133 @@ class Category(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+
+        with transaction.atomic():
+            parent_path = self._resolve_parent_path() or PATH_SEPARATOR
+            if self.pk is None:
+                # The path embeds the primary key, so it can only be written after the insert.
+                super().save(*args, **kwargs)
+                self.path = f"{parent_path}{self.pk}{PATH_SEPARATOR}"
+                self.depth = self.path.count(PATH_SEPARATOR) - 2
+                Category.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+                return
+
+            # Read the stored path rather than trusting a possibly stale instance.
+            stored = Category.objects.filter(pk=self.pk).values_list('path', 'depth').first()
+            old_path, old_depth = stored or ('', 0)
+            self.path = f"{parent_path}{self.pk}{PATH_SEPARATOR}"
+            self.depth = self.path.count(PATH_SEPARATOR) - 2
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'path', 'depth'}
+            elif stored is not None and not kwargs.get('force_insert'):
+                # The counters are only changed with F() updates; a stale instance must not overwrite them.
+                kwargs['update_fields'] = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name not in COUNTER_FIELDS
+                ]
+            super().save(*args, **kwargs)
+
+            if old_path and old_path != self.path:
+                # Rewrite the prefix of every descendant in a single UPDATE.
+                Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(self.path), Substr('path', len(old_path) + 1)),
+                    depth=models.F('depth') + (self.depth - old_depth),
+                )
+
+    def _resolve_parent_path(self):
+        """Return the parent's stored path, rejecting moves that would create a cycle."""
+        if self.parent_id is None:
+            return None
+
+        parent_path = Category.objects.filter(pk=self.parent_id).values_list('path', flat=True).first()
+        if parent_path is None:
+            raise ValidationError("Parent category does not exist.")
+
+        if self.pk is not None and f"{PATH_SEPARATOR}{self.pk}{PATH_SEPARATOR}" in parent_path:
+            raise ValidationError("A category cannot be moved under itself or one of its descendants.")
+        return parent_path
+
+    def ancestor_ids(self):
+        """Ids from the root down to and including this category."""
+        return [int(part) for part in self.path.split(PATH_SEPARATOR) if part]
+
+    def get_descendants(self, include_self=True):
+        qs = Category.objects.filter(path__startswith=self.path)
+        if not include_self:
+            qs = qs.exclude(pk=self.pk)
+        return qs
+
+# Property.amenity_mask is a signed 64-bit integer, so bit 63 is left unused.
+MAX_AMENITY_BITS = 63
+
+class AmenityManager(models.Manager):
+    def mask_for(self, names, create=False):
+        """
+        Return the bitmask for the given amenity names, or None if any of them is unknown
+        and create is False. With create=True unknown names join the vocabulary; once
+        all MAX_AMENITY_BITS bits are taken, new names are logged and left out of the mask.
+        """
+        names_by_slug = {}
+        for name in names:
+            if isinstance(name, str) and slugify(name):
+                names_by_slug.setdefault(slugify(name), name)
+        if not names_by_slug:
+            return 0
+
+        bits = dict(self.filter(slug__in=names_by_slug).values_list('slug', 'bit'))
+        missing = names_by_slug.keys() - bits.keys()
+        if missing and not create:
+            return None
+        for slug in sorted(missing):
+            amenity = self.register(slug, names_by_slug[slug])
+            if amenity is not None:
+                bits[slug] = amenity.bit
+
+        mask = 0
+        for bit in bits.values():
+            mask |= 1 << bit
+        return mask
+
+    def register(self, slug, name):
+        """Return the amenity for `slug`, adding it to the vocabulary if new, or None when no bit is free."""
+        # Two writers may race for the same slug or the same free bit; the unique
+        # constraints decide and the loser retries.
+        for _ in range(3):
+            existing = self.filter(slug=slug).first()
+            if existing is not None:
+                return existing
+            try:
+                with transaction.atomic():
+                    return self.create(slug=slug, name=name.strip())
+            except IntegrityError:
+                continue
+            except ValidationError:
+                logger.warning("The amenity vocabulary is full; '%s' was not registered.", slug)
+                return None
+        return self.get(slug=slug)
+
+class Amenity(models.Model):
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(unique=True)
+    bit = models.PositiveSmallIntegerField(unique=True)
+
+    objects = AmenityManager()
+
+    class Meta:
+        verbose_name_plural = "Amenities"
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.name)
+        if self.bit is None:
+            taken = set(Amenity.objects.values_list('bit', flat=True))
+            self.bit = next((bit for bit in range(MAX_AMENITY_BITS) if bit not in taken), None)
+            if self.bit is None:
+                raise ValidationError("The amenity vocabulary is full.")
         super().save(*args, **kwargs)
 
 class PropertyStatus(models.TextChoices):
@@ -28,20 +176,103 @@ class Property(models.Model):
     slug = models.SlugField(unique=True)
     description = models.TextField(blank=True)
     location = models.CharField(max_length=255)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Geohash of (latitude, longitude), kept in sync on save; spatial queries prune
+    # candidates with indexed prefix matches on it.
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     price = models.DecimalField(max_digits=12, decimal_places=2)
     bedrooms = models.PositiveIntegerField(default=1)
     bathrooms = models.PositiveIntegerField(default=1)
     amenities = models.JSONField(blank=True, default=list)
+    # One bit per Amenity.bit, kept in sync with `amenities` on save.
+    amenity_mask = models.BigIntegerField(default=0, editable=False)
     status = models.CharField(max_length=20, choices=PropertyStatus.choices, default=PropertyStatus.ACTIVE)
     is_available = models.BooleanField(default=True)
     image = models.ImageField(upload_to='properties/', blank=True, null=True)
+    # Thumbnail/WebP names written by properties.images for the current `image`.
+    image_variants = models.JSONField(blank=True, default=dict, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination seeks on (sort key, id).
+            models.Index(fields=['created_at', 'id'], name='property_created_keyset_idx'),
+            models.Index(fields=['price', 'id'], name='property_price_keyset_idx'),
+            # Equality filters first, then the price range, for listing filters.
+            models.Index(fields=['status', 'is_available', 'category', 'price'], name='property_listing_filter_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'amenities' in update_fields:
+            self.amenity_mask = Amenity.objects.mask_for(self.amenities or [], create=True)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'amenity_mask'}
+        if update_fields is None or {'latitude', 'longitude'} & set(update_fields):
+            self.geohash = self._compute_geohash()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'geohash'}
+        # The pre_save snapshot locks the row; the transaction holds that lock until
+        # the post_save counter updates are written.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def _compute_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            return ''
+        return encode_geohash(self.latitude, self.longitude)
+
+class LocationCluster(models.Model):
+    """
+    Pre-aggregated map cluster: active properties sharing a geohash prefix of length
+    `precision`. Maintained by properties.clusters as properties change.
+    """
+    precision = models.PositiveSmallIntegerField()
+    cell = models.CharField(max_length=12)
+    count = models.PositiveIntegerField(default=0)
+    # Coordinate sums rather than means, so the centroid is cheap to derive.
+    latitude_sum = models.FloatField(default=0)
+    longitude_sum = models.FloatField(default=0)
+    min_price = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['precision', 'cell'], name='unique_cluster_cell'),
+        ]
+
+    def __str__(self):
+        return f"{self.cell} ({self.count})"
+
+    @property
+    def latitude(self):
+        return self.latitude_sum / self.count
+
+    @property
+    def longitude(self):
+        return self.longitude_sum / self.count
+
+class SimilarProperty(models.Model):
+    """
+    Precomputed nearest neighbours of a property, written in bulk by the
+    `compute_similar_properties` command. Rank 0 is the most similar.
+    """
+    property = models.ForeignKey(Property, related_name='similar_entries', on_delete=models.CASCADE)
+    similar = models.ForeignKey(Property, related_name='+', on_delete=models.CASCADE)
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            # Also the index behind the per-property lookup.
+            models.UniqueConstraint(fields=['property', 'rank'], name='unique_similar_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.property_id} -> {self.similar_id} (#{self.rank})"
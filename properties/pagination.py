@@ -0,0 +1,298 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+def encode_cursor_token(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+def decode_cursor_token(token):
+    """Decode an opaque cursor; raises ValueError for anything that is not one."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError(str(exc)) from exc
+    if not isinstance(payload, dict):
+        raise ValueError('Cursor payload must be an object')
+    return payload
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a sort field with the primary key as tie-breaker.
+
+    Each page is fetched with `WHERE (field, id) > (last_field, last_id)` against a
+    composite index instead of an OFFSET, so deep pages cost the same as the first one.
+    Cursors are opaque base64 tokens carrying the boundary row and the direction.
+    """
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    page_size_query_param = 'limit'
+    page_size = 20
+    max_page_size = 100
+    # Public ordering name -> model field or annotation used as the sort key.
+    ordering_fields = {}
+    default_ordering = None
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, view)
+        field, descending = self._sort_key(self.ordering)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['reverse'])
+
+        # Walking backwards flips the sort so the boundary row stays at the index edge.
+        scan_descending = descending != reverse
+        prefix = '-' if scan_descending else ''
+        queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}pk')
+
+        if cursor is not None:
+            value, pk = cursor['position']
+            lookup = 'lt' if scan_descending else 'gt'
+            try:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'pk__{lookup}': pk})
+                )
+            except (DjangoValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = cursor is not None if not reverse else has_more
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        self.sort_field = field
+        return rows
+
+    def get_required_columns(self, request, view=None):
+        """Columns every paginated row must carry for its cursor to be encoded."""
+        field, _ = self._sort_key(self.get_ordering(request, view))
+        return ['id', field]
+
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            size = int(raw)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: 'Must be an integer.'})
+        if size < 1:
+            raise ValidationError({self.page_size_query_param: 'Must be a positive integer.'})
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request, view=None):
+        self.ordering_map = self.get_ordering_fields(request, view)
+        allowed = [name for field in self.ordering_map for name in (field, f'-{field}')]
+        ordering = request.query_params.get(self.ordering_query_param) or self.get_default_ordering(request, view)
+        if ordering not in allowed:
+            raise ValidationError({self.ordering_query_param: f"Must be one of: {', '.join(allowed)}."})
+        return ordering
+
+    def get_ordering_fields(self, request, view=None):
+        return dict(self.ordering_fields)
+
+    def get_default_ordering(self, request, view=None):
+        return self.default_ordering
+
+    def _sort_key(self, ordering):
+        descending = ordering.startswith('-')
+        return self.ordering_map[ordering.lstrip('-')], descending
+
+    def get_next_link(self):
+        if not self.has_next or self.last_row is None:
+            return None
+        return self.encode_cursor(self.last_row, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_row is None:
+            return None
+        return self.encode_cursor(self.first_row, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def encode_cursor(self, row, reverse):
+        payload = {
+            'o': self.ordering,
+            'p': [self._encode_value(self._row_value(row, self.sort_field)), self._row_value(row, 'pk')],
+            'r': int(reverse),
+        }
+        token = encode_cursor_token(payload)
+        url = remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = decode_cursor_token(token)
+            value, pk = payload['p']
+            reverse = bool(payload['r'])
+            ordering = payload['o']
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor is only meaningful for the ordering it was issued under.
+        if ordering != self.ordering:
+            raise NotFound(self.invalid_cursor_message)
+        return {'position': (value, pk), 'reverse': reverse}
+
+    @staticmethod
+    def _row_value(row, name):
+        # Rows are model instances, or dicts when the view paginates `.values()`.
+        if isinstance(row, dict):
+            return row['id' if name == 'pk' else name]
+        return getattr(row, name)
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+class PropertyCursorPagination(KeysetPagination):
+    ordering_fields = {
+        'created_at': 'created_at',
+        'price': 'price',
+    }
+    default_ordering = '-created_at'
+    search_query_param = 'q'
+
+    def _is_search(self, request):
+        return bool(request.query_params.get(self.search_query_param, '').strip())
+
+    def get_ordering_fields(self, request, view=None):
+        fields = super().get_ordering_fields(request, view)
+        if self._is_search(request):
+            # Search results are annotated with their rank by properties.search.
+            fields['relevance'] = 'search_rank'
+        return fields
+
+    def get_default_ordering(self, request, view=None):
+        if self._is_search(request):
+            return '-relevance'
+        return super().get_default_ordering(request, view)
+
+class RankedCursorPagination(BasePagination):
+    """
+    Cursor pagination over an in-memory ranking of (id, score) pairs, best first with
+    ties broken by id. Cursors carry the boundary (score, id) rather than an offset, so
+    pages stay stable when the ranking shifts between requests. Only the page's ids
+    reach the database.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    page_size = 10
+    max_page_size = 50
+    invalid_cursor_message = 'Invalid cursor'
+
+    get_page_size = KeysetPagination.get_page_size
+
+    def paginate_ranking(self, ranking, request):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        if cursor is None:
+            before, after = [], ranking
+        else:
+            (score, pk), reverse = cursor
+            boundary = self._after(ranking, score, pk, inclusive=reverse)
+            before, after = ranking[:boundary], ranking[boundary:]
+            if reverse:
+                page = before[-self.page_size:]
+                self.has_previous = len(before) > self.page_size
+                self.has_next = True
+                return self._remember(page)
+
+        page = after[:self.page_size]
+        self.has_previous = cursor is not None
+        self.has_next = len(after) > self.page_size
+        return self._remember(page)
+
+    @staticmethod
+    def _after(ranking, score, pk, inclusive):
+        """Index of the first entry ranked after (score, pk), or at it when inclusive."""
+        for index, (entry_pk, entry_score) in enumerate(ranking):
+            if entry_score < score or (entry_score == score and (entry_pk >= pk if inclusive else entry_pk > pk)):
+                return index
+        return len(ranking)
+
+    def _remember(self, page):
+        self.first_entry = page[0] if page else None
+        self.last_entry = page[-1] if page else None
+        return page
+
+    def get_next_link(self):
+        if not self.has_next or self.last_entry is None:
+            return None
+        return self.encode_cursor(self.last_entry, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_entry is None:
+            return None
+        return self.encode_cursor(self.first_entry, reverse=True)
+
+    def get_paginated_data(self, data):
+        return OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    get_paginated_response_schema = KeysetPagination.get_paginated_response_schema
+
+    def encode_cursor(self, entry, reverse):
+        pk, score = entry
+        token = encode_cursor_token({'p': [score, pk], 'r': int(reverse)})
+        url = remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = decode_cursor_token(token)
+            score, pk = payload['p']
+            return (float(score), int(pk)), bool(payload['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
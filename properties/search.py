@@ -0,0 +1,193 @@
+"""
+Full-text search over property title, location and description.
+
+Each database keeps its own search document in sync with `properties_property`
+through triggers, so every write path (save, bulk_create, queryset.update) stays
+indexed without application code:
+
+* PostgreSQL: a weighted `search_vector` tsvector column with a GIN index.
+* SQLite: an external-content FTS5 table ranked with bm25.
+
+Other backends fall back to unranked substring matching.
+"""
+import logging
+import re
+
+from django.db import connection as default_connection, connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+PROPERTY_TABLE = 'properties_property'
+FTS_TABLE = 'properties_property_fts'
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+def _no_results(queryset):
+    # Keep the annotation so callers can order by rank regardless of the outcome.
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+
+class BaseSearchBackend:
+    vendor = None
+
+    def install(self, connection):
+        """Create the search document, index and triggers (idempotent)."""
+
+    def uninstall(self, connection):
+        """Drop everything created by install()."""
+
+    def search(self, queryset, query):
+        """Filter queryset to matches of query and annotate a `search_rank` (higher is better)."""
+        raise NotImplementedError
+
+class PostgresSearchBackend(BaseSearchBackend):
+    vendor = 'postgresql'
+    config = 'english'
+
+    def install(self, connection):
+        document = (
+            "setweight(to_tsvector('{config}', coalesce(NEW.title, '')), 'A') || "
+            "setweight(to_tsvector('{config}', coalesce(NEW.location, '')), 'B') || "
+            "setweight(to_tsvector('{config}', coalesce(NEW.description, '')), 'C')"
+        ).format(config=self.config)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {PROPERTY_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector")
+            cursor.execute(f"""
+                CREATE OR REPLACE FUNCTION {PROPERTY_TABLE}_search_vector_update() RETURNS trigger AS $$
+                BEGIN
+                    NEW.search_vector := {document};
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+            """)
+            cursor.execute(f"DROP TRIGGER IF EXISTS {PROPERTY_TABLE}_search_vector_trigger ON {PROPERTY_TABLE}")
+            cursor.execute(f"""
+                CREATE TRIGGER {PROPERTY_TABLE}_search_vector_trigger
+                BEFORE INSERT OR UPDATE OF title, location, description ON {PROPERTY_TABLE}
+                FOR EACH ROW EXECUTE FUNCTION {PROPERTY_TABLE}_search_vector_update()
+            """)
+            cursor.execute(
+                f"UPDATE {PROPERTY_TABLE} SET search_vector = {document.replace('NEW.', '')} WHERE search_vector IS NULL"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PROPERTY_TABLE}_search_vector_gin "
+                f"ON {PROPERTY_TABLE} USING gin (search_vector)"
+            )
+
+    def uninstall(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {PROPERTY_TABLE}_search_vector_trigger ON {PROPERTY_TABLE}")
+            cursor.execute(f"DROP FUNCTION IF EXISTS {PROPERTY_TABLE}_search_vector_update()")
+            cursor.execute(f"ALTER TABLE {PROPERTY_TABLE} DROP COLUMN IF EXISTS search_vector")
+
+    def search(self, queryset, query):
+        tsquery = f"websearch_to_tsquery('{self.config}', %s)"
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT id FROM {PROPERTY_TABLE} WHERE search_vector @@ {tsquery}", [query])
+        ).annotate(
+            # ts_rank returns real; as double precision the rank survives the keyset cursor's
+            # float round trip exactly, so tied ranks compare equal on the next page.
+            search_rank=RawSQL(
+                f"ts_rank({PROPERTY_TABLE}.search_vector, {tsquery})::float8", [query], output_field=FloatField(),
+            )
+        )
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    vendor = 'sqlite'
+    # bm25 column weights for title, location and description.
+    weights = (10.0, 5.0, 1.0)
+
+    def install(self, connection):
+        columns = 'title, location, description'
+        new_values = 'new.id, new.title, new.location, new.description'
+        old_values = "'delete', old.id, old.title, old.location, old.description"
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = '{PROPERTY_TABLE}' AND name LIKE '{FTS_TABLE}_%'")
+            triggers_present = cursor.fetchone()[0] == 3
+
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                    {columns}, content='{PROPERTY_TABLE}', content_rowid='id', tokenize='porter unicode61'
+                )
+            """)
+            # Rebuilding the table for a schema change drops its triggers, so they are
+            # recreated (and the index rebuilt) after every migrate.
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {PROPERTY_TABLE} BEGIN
+                    INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES ({new_values});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {PROPERTY_TABLE} BEGIN
+                    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ({old_values});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON {PROPERTY_TABLE} BEGIN
+                    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ({old_values});
+                    INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES ({new_values});
+                END
+            """)
+            if not triggers_present:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    def uninstall(self, connection):
+        with connection.cursor() as cursor:
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    @staticmethod
+    def to_match_expression(query):
+        # Quote every token so user input can never be parsed as FTS5 syntax.
+        return ' '.join(f'"{token}"' for token in TOKEN_RE.findall(query))
+
+    def search(self, queryset, query):
+        expression = self.to_match_expression(query)
+        if not expression:
+            return _no_results(queryset)
+        weights = ', '.join(str(weight) for weight in self.weights)
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression])
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {PROPERTY_TABLE}.id",
+                [expression],
+                output_field=FloatField(),
+            )
+        )
+
+class SubstringSearchBackend(BaseSearchBackend):
+    """Unranked fallback for databases without a full-text engine."""
+
+    def search(self, queryset, query):
+        tokens = TOKEN_RE.findall(query)
+        if not tokens:
+            return _no_results(queryset)
+        for token in tokens:
+            queryset = queryset.filter(
+                Q(title__icontains=token) | Q(location__icontains=token) | Q(description__icontains=token)
+            )
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+BACKENDS = {backend.vendor: backend for backend in (PostgresSearchBackend(), SQLiteSearchBackend())}
+
+def get_search_backend(connection=None):
+    connection = connection or default_connection
+    return BACKENDS.get(connection.vendor) or SubstringSearchBackend()
+
+def search_properties(queryset, query):
+    """Restrict queryset to properties matching query, annotated with `search_rank`."""
+    return get_search_backend(connections[queryset.db]).search(queryset, query)
+
+def install_search_index(sender=None, using='default', **kwargs):
+    """
+    post_migrate hook. Recreates the search triggers, which SQLite loses whenever a
+    migration rebuilds the property table.
+    """
+    connection = connections[using]
+    if PROPERTY_TABLE not in connection.introspection.table_names():
+        return
+    get_search_backend(connection).install(connection)
@@ -1,20 +1,36 @@
 from rest_framework import serializers
-from .models import Category, Property
+
+from core.serializers import SparseFieldsetSerializerMixin, ValuesSerializer
+from .images import srcsets, variant_urls
+from .models import Amenity, Category, Property
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
-        fields = ('id', 'name', 'slug', 'parent')
+        fields = ('id', 'name', 'slug', 'parent', 'available_count', 'subtree_available_count')
+
+class AmenitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Amenity
+        fields = ('id', 'name', 'slug')
 
-class PropertySerializer(serializers.ModelSerializer):
+class PropertySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
+    method_field_sources = {
+        'image_url': ('image',),
+        'image_variants': ('image', 'image_variants'),
+        'image_srcset': ('image', 'image_variants'),
+    }
 
     class Meta:
         model = Property
         fields = (
-            'id', 'title', 'slug', 'description', 'location',
+            'id', 'title', 'slug', 'description', 'location', 'latitude', 'longitude',
             'price', 'bedrooms', 'bathrooms', 'amenities',
-            'status', 'is_available', 'category', 'image', 'image_url', 'created_at', 'updated_at'
+            'status', 'is_available', 'category', 'image', 'image_url', 'image_variants', 'image_srcset',
+            'created_at', 'updated_at'
         )
 
     def get_image_url(self, obj):
@@ -22,8 +38,34 @@ class PropertySerializer(serializers.ModelSerializer):
         if not obj.image:
             return None
 
+        return self._absolute_url(obj.image.url)
+
+    def get_image_variants(self, obj):
+        """Derivative URLs by format and width, smallest first."""
+        return variant_urls(obj.image_variants, obj.image.name, lambda name: self._absolute_url(obj.image.storage.url(name)))
+
+    def get_image_srcset(self, obj):
+        return srcsets(self.get_image_variants(obj))
+
+    def _absolute_url(self, url):
         request = self.context.get("request")
-        image_url = obj.image.url
         if request is not None:
-            return request.build_absolute_uri(image_url)
-        return image_url
+            return request.build_absolute_uri(url)
+        return url
+
+class PropertyValuesSerializer(ValuesSerializer):
+    """Fast path for PropertySerializer on list endpoints; the JSON output is identical."""
+    serializer_class = PropertySerializer
+
+    def __init__(self, context=None):
+        super().__init__(context)
+        self.image_url = self._file_url_converter(Property._meta.get_field('image').storage)
+
+    def get_image_url(self, row):
+        return self.image_url(row['image'])
+
+    def get_image_variants(self, row):
+        return variant_urls(row['image_variants'], row['image'], self.image_url)
+
+    def get_image_srcset(self, row):
+        return srcsets(self.get_image_variants(row))
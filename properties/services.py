@@ -1,51 +1,164 @@
 
 from django.core.cache import cache
-from .models import Category, Property
+from django.db import transaction
+from core.cache import get_or_compute
+from .models import Category, Property, PropertyStatus, SimilarProperty
+from .similarity import (
+    DEFAULT_TOP_K, MAX_TOP_K, build_similarity_index, compute_neighbours, representative_properties,
+    similar_properties,
+)
+import hashlib
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
-def _dfs_category_ids(category_id, visited=None):
-    if visited is None:
-        visited = set()
-    
-    visited.add(category_id)
-    
-    # Get direct children
-    children = Category.objects.filter(parent_id=category_id).values_list('id', flat=True)
-    
-    for child_id in children:
-        if child_id not in visited:
-            _dfs_category_ids(child_id, visited)
-            
-    return visited
-
-def get_category_subtree_property_ids(root_category_id):
-    cache_key = f"category_subtree:{root_category_id}"
-    cached_ids = cache.get(cache_key)
-    
-    if cached_ids:
-        logger.info("Cache hit for key %s", cache_key)
-        return cached_ids
-        
-    logger.info("Cache miss for key %s. Computing DFS for category %s", cache_key, root_category_id)
-    subtree_ids = _dfs_category_ids(root_category_id)
-    
-    # Get all active properties in these categories
-    property_ids = list(
-        Property.objects.filter(
-            category_id__in=subtree_ids,
-            is_available=True
-        ).values_list('id', flat=True)
+# Bumped on every property or category change. Listing-level caches embed it in their
+# keys, so a single write retires all of them without enumerating keys.
+LISTING_VERSION_KEY = 'property_listing:version'
+
+# Rendered detail responses are keyed by the property's updated_at, so an entry can
+# never be served for a newer row; the timeout only bounds orphaned versions.
+PROPERTY_DETAIL_CACHE_TIMEOUT = 60 * 60
+PROPERTY_DETAIL_HITS_KEY = 'property_detail:hits'
+PROPERTY_DETAIL_MISSES_KEY = 'property_detail:misses'
+
+RECOMMENDATIONS_CACHE_TIMEOUT = 60 * 10
+
+# The tree key embeds the listing version, so the timeout only bounds retired versions.
+CATEGORY_TREE_CACHE_TIMEOUT = 60 * 60 * 24
+
+def category_tree_cache_key():
+    return f"category_tree:{get_listing_version()}"
+
+def build_category_tree(categories):
+    """
+    Nest (id, name, slug, parent_id, available_count) rows in O(n), where the count
+    covers the category's whole subtree. Siblings keep the input order.
+    """
+    nodes, roots = {}, []
+    for category_id, name, slug, parent_id, available_count in categories:
+        nodes[category_id] = {
+            'id': category_id, 'name': name, 'slug': slug, 'parent': parent_id,
+            'available_count': available_count, 'children': [],
+        }
+    for node in nodes.values():
+        parent = nodes.get(node['parent'])
+        (parent['children'] if parent is not None else roots).append(node)
+    return roots
+
+def _compute_category_tree():
+    # Subtree totals are the counters maintained by properties.counters.
+    categories = Category.objects.order_by('name', 'id').values_list(
+        'id', 'name', 'slug', 'parent_id', 'subtree_available_count',
+    )
+    return build_category_tree(categories)
+
+def get_category_tree():
+    """Every category nested under its parent with available-property counts, from one query."""
+    return get_or_compute(category_tree_cache_key(), _compute_category_tree, timeout=CATEGORY_TREE_CACHE_TIMEOUT)
+
+def get_listing_version():
+    version = cache.get(LISTING_VERSION_KEY)
+    if version is None:
+        cache.add(LISTING_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(LISTING_VERSION_KEY)
+    return version
+
+def bump_listing_version():
+    transaction.on_commit(lambda: cache.set(LISTING_VERSION_KEY, uuid.uuid4().hex, timeout=None))
+
+def property_detail_version_key(slug):
+    return f"property_detail:{slug}"
+
+def property_detail_cache_key(slug, version, variant):
+    """Key of one rendered detail response; variant covers everything else the bytes depend on."""
+    variant = hashlib.sha1(variant.encode()).hexdigest()
+    return f"property_detail:{slug}:{version}:{variant}"
+
+def get_property_detail_version(slug):
+    """
+    Return (id, updated_at) of the property with this slug, or None if it does not exist.
+    The pair is cached under the slug and dropped by signals whenever the row changes.
+    """
+    key = property_detail_version_key(slug)
+    version = cache.get(key)
+    if version is None:
+        version = Property.objects.filter(slug=slug).values_list('id', 'updated_at').first()
+        if version is not None:
+            cache.set(key, version, timeout=PROPERTY_DETAIL_CACHE_TIMEOUT)
+    return version
+
+def invalidate_property_detail(slugs):
+    keys = [property_detail_version_key(slug) for slug in sorted({slug for slug in slugs if slug})]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+def record_property_detail_lookup(hit):
+    key = PROPERTY_DETAIL_HITS_KEY if hit else PROPERTY_DETAIL_MISSES_KEY
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); losing one sample is fine.
+        pass
+
+def get_property_detail_cache_stats():
+    counters = cache.get_many([PROPERTY_DETAIL_HITS_KEY, PROPERTY_DETAIL_MISSES_KEY])
+    hits = counters.get(PROPERTY_DETAIL_HITS_KEY, 0)
+    misses = counters.get(PROPERTY_DETAIL_MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / lookups if lookups else None,
+    }
+
+def get_recommendation_ranking(category_id=None, property_id=None):
+    """
+    (id, score) pairs of available properties ranked by feature similarity: to
+    property_id when given (restricted to the category_id subtree if both are set),
+    otherwise to the centroid of the category_id subtree. Best first, ties by id.
+    """
+    if property_id is not None:
+        return similar_properties(property_id, MAX_TOP_K, category_id)
+    if category_id:
+        return representative_properties(category_id, MAX_TOP_K)
+    return []
+
+def recommendations_cache_key(request_uri):
+    """Rendered recommendation pages are retired by the listing version like other listing caches."""
+    digest = hashlib.sha1(request_uri.encode()).hexdigest()
+    return f"recommendations:{get_listing_version()}:{digest}"
+
+def get_similar_properties(property_id):
+    """Precomputed neighbours of a property, best first, read with one indexed query."""
+    return (
+        SimilarProperty.objects
+        .filter(property_id=property_id, similar__is_available=True, similar__status=PropertyStatus.ACTIVE)
+        .select_related('similar')
+        .order_by('rank')
     )
-    
-    cache.set(cache_key, property_ids, timeout=3600)  # Cache for 1 hour
-    logger.info("DFS finished for category %s. Found %d properties.", root_category_id, len(property_ids))
-    return property_ids
-
-def get_recommended_properties(category_id):
-    if not category_id:
-        return Property.objects.none()
-        
-    property_ids = get_category_subtree_property_ids(category_id)
-    return Property.objects.filter(id__in=property_ids)
+
+def rebuild_similar_properties(k=DEFAULT_TOP_K, batch_size=500, workers=1):
+    """
+    Recompute the SimilarProperty table from a fresh similarity index. The table is
+    replaced inside one transaction, so readers see either the old or the new neighbours.
+    """
+    index = build_similarity_index()
+    created = 0
+    with transaction.atomic():
+        SimilarProperty.objects.all().delete()
+        for seed_ids, neighbour_ids, scores in compute_neighbours(index, k, batch_size, workers):
+            entries = [
+                SimilarProperty(property_id=int(seed_id), similar_id=int(similar_id), rank=rank, score=float(score))
+                for seed_id, row_ids, row_scores in zip(seed_ids, neighbour_ids, scores)
+                for rank, (similar_id, score) in enumerate(zip(row_ids, row_scores))
+                if score != float('-inf')
+            ]
+            SimilarProperty.objects.bulk_create(entries, batch_size=batch_size)
+            created += len(entries)
+            logger.info("Stored neighbours for %d properties", len(seed_ids))
+    # bulk_create bypasses signals; retire cached detail responses that embed neighbours.
+    bump_listing_version()
+    return created
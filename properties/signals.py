@@ -0,0 +1,168 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Category, Property
+from .clusters import schedule_cell_refresh
+from .counters import adjust_category_counters, is_counted, move_subtree_counters
+from .images import schedule_image_derivatives
+from .locations import invalidate_location_index
+from .similarity import invalidate_similarity_index, record_similarity_change
+from .services import bump_listing_version, invalidate_property_detail
+
+# Property fields that feed the location suggestion index.
+LOCATION_FIELDS = ('location', 'status')
+# Property fields aggregated into map clusters.
+CLUSTER_FIELDS = ('geohash', 'latitude', 'longitude', 'price', 'status')
+# Property fields that address a cached detail response.
+DETAIL_FIELDS = ('slug',)
+# Property fields whose change requires new image derivatives.
+IMAGE_FIELDS = ('image',)
+# Property fields deciding which category counter, if any, counts the property.
+AVAILABILITY_FIELDS = ('category_id', 'is_available', 'status')
+TRACKED_FIELDS = tuple(dict.fromkeys(
+    LOCATION_FIELDS + CLUSTER_FIELDS + DETAIL_FIELDS + IMAGE_FIELDS + AVAILABILITY_FIELDS
+))
+
+def _touches_fields(update_fields, fields):
+    if update_fields is None:
+        return True
+    names = {name.removesuffix('_id') for name in fields}
+    return any(field.removesuffix('_id') in names for field in update_fields)
+
+def _changed(instance, fields):
+    """Return (previous, current) values of fields when a tracked save changed them."""
+    previous = getattr(instance, '_previous_state', None)
+    if previous is None:
+        return None
+    before = tuple(previous[field] for field in fields)
+    after = tuple(getattr(instance, field) for field in fields)
+    return (before, after) if before != after else None
+
+@receiver(pre_save, sender=Property)
+def remember_property_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Snapshot the stored tracked fields so post_save handlers can tell what actually
+    changed. The row stays locked until Property.save's transaction ends, so counter
+    deltas are taken against the state this save replaces.
+    """
+    instance._previous_state = None
+    if raw or instance.pk is None or not _touches_fields(update_fields, TRACKED_FIELDS):
+        return
+    instance._previous_state = (
+        Property.objects.select_for_update().filter(pk=instance.pk).values(*TRACKED_FIELDS).first()
+    )
+
+@receiver(pre_delete, sender=Property)
+def remember_deleted_property_state(sender, instance, **kwargs):
+    """Lock the row being deleted; the instance may be stale, the stored availability decides the counters."""
+    instance._previous_state = (
+        Property.objects.select_for_update().filter(pk=instance.pk).values(*AVAILABILITY_FIELDS).first()
+    )
+
+@receiver(post_save, sender=Property)
+def refresh_location_index(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created or _changed(instance, LOCATION_FIELDS) is not None:
+        invalidate_location_index()
+
+@receiver(post_delete, sender=Property)
+def refresh_location_index_on_delete(sender, instance, **kwargs):
+    invalidate_location_index()
+
+@receiver(post_save, sender=Property)
+def refresh_property_clusters(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        schedule_cell_refresh([instance.geohash])
+        return
+    change = _changed(instance, CLUSTER_FIELDS)
+    if change is not None:
+        (previous_geohash, *_), _ = change
+        schedule_cell_refresh([previous_geohash, instance.geohash])
+
+@receiver(post_delete, sender=Property)
+def refresh_deleted_property_clusters(sender, instance, **kwargs):
+    schedule_cell_refresh([instance.geohash])
+
+@receiver(post_save, sender=Property)
+def update_category_counters(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    deltas = Counter()
+    if created:
+        if is_counted(instance.is_available, instance.status):
+            deltas[instance.category_id] += 1
+    else:
+        change = _changed(instance, AVAILABILITY_FIELDS)
+        if change is None:
+            return
+        (previous_category_id, was_available, previous_status), _ = change
+        if is_counted(was_available, previous_status):
+            deltas[previous_category_id] -= 1
+        if is_counted(instance.is_available, instance.status):
+            deltas[instance.category_id] += 1
+    adjust_category_counters(deltas)
+
+@receiver(post_delete, sender=Property)
+def update_deleted_property_counters(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_state', None)
+    if previous is not None and is_counted(previous['is_available'], previous['status']):
+        adjust_category_counters({previous['category_id']: -1})
+
+@receiver(post_save, sender=Property)
+def invalidate_cached_property_detail(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_state', None) or {}
+    invalidate_property_detail([instance.slug, previous.get('slug')])
+
+@receiver(post_save, sender=Property)
+def render_image_derivatives(sender, instance, created, raw=False, **kwargs):
+    if raw or not instance.image:
+        return
+    if created or _changed(instance, IMAGE_FIELDS) is not None:
+        schedule_image_derivatives(instance.pk)
+
+@receiver(post_delete, sender=Property)
+def invalidate_deleted_property_detail(sender, instance, **kwargs):
+    invalidate_property_detail([instance.slug])
+
+@receiver(pre_save, sender=Category)
+def remember_category_path(sender, instance, raw=False, **kwargs):
+    instance._previous_path = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_path = Category.objects.filter(pk=instance.pk).values_list('path', flat=True).first()
+
+@receiver(post_save, sender=Category)
+def move_category_counters(sender, instance, created, raw=False, **kwargs):
+    """A move takes the category's subtree count from its old ancestor chain to the new one."""
+    previous_path = getattr(instance, '_previous_path', None)
+    if raw or created or previous_path == instance.path:
+        return
+    move_subtree_counters(previous_path, instance.path)
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def retire_listing_caches(sender, raw=False, **kwargs):
+    if not raw:
+        bump_listing_version()
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def journal_similarity_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_similarity_change(instance.pk)
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def rebuild_similarity_index(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_similarity_index()
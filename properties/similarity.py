@@ -0,0 +1,315 @@
+"""
+Feature-vector similarity between properties.
+
+Every worker holds a NumPy matrix with one row per property. Columns are standardized
+log price, bedrooms and bathrooms, one column per amenity bit, and one per category
+on the property's materialized path, so properties in sibling categories still share
+their ancestors. Rows are L2-normalized, which turns cosine similarity against all
+properties into a single matrix-vector product.
+
+Property signals append the changed id to a short journal in the cache. On its next
+lookup a worker re-reads only the journalled rows and patches them in place. It falls
+back to a full rebuild when the journal has gaps, e.g. after eviction, or when a row
+references a category it has no column for. Scaling statistics are frozen at the last
+full rebuild, so incremental updates never shift the other rows.
+"""
+import logging
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import MAX_AMENITY_BITS, PATH_SEPARATOR, Category, Property, PropertyStatus
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_SEQUENCE_KEY = 'property_similarity:seq'
+# Replaced whenever the counter is (re)created, so a reset counter that climbs back to
+# a worker's old sequence is not mistaken for "no changes".
+SIMILARITY_GENERATION_KEY = 'property_similarity:generation'
+SIMILARITY_JOURNAL_TIMEOUT = 60 * 60
+# A worker further behind than this rebuilds instead of replaying the journal.
+MAX_JOURNAL_REPLAY = 500
+DEFAULT_TOP_K = 10
+# Deepest ranking served; recommendation pages are cut from a ranking this long.
+MAX_TOP_K = 500
+
+NUMERIC_WEIGHTS = {'price': 2.0, 'bedrooms': 1.0, 'bathrooms': 0.5}
+AMENITY_WEIGHT = 0.5
+CATEGORY_WEIGHT = 1.5
+FEATURE_COLUMNS = ('id', 'price', 'bedrooms', 'bathrooms', 'amenity_mask', 'category_id', 'is_available', 'status')
+AMENITY_SHIFTS = np.arange(MAX_AMENITY_BITS, dtype=np.int64)
+
+def _journal_key(sequence):
+    return f"property_similarity:change:{sequence}"
+
+def _path_ids(path):
+    return [int(part) for part in path.split(PATH_SEPARATOR) if part]
+
+class SimilarityIndex:
+    def __init__(self, rows, category_paths):
+        self.category_columns = {category_id: column for column, category_id in enumerate(sorted(category_paths))}
+        self.category_ancestors = {
+            category_id: [self.category_columns[ancestor] for ancestor in _path_ids(path) if ancestor in self.category_columns]
+            for category_id, path in category_paths.items()
+        }
+
+        numeric = self._numeric(rows)
+        self.mean = numeric.mean(axis=0) if len(rows) else np.zeros(len(NUMERIC_WEIGHTS))
+        std = numeric.std(axis=0) if len(rows) else np.ones(len(NUMERIC_WEIGHTS))
+        self.std = np.where(std > 0, std, 1.0)
+
+        self.ids = np.array([row['id'] for row in rows], dtype=np.int64)
+        self.positions = {property_id: position for position, property_id in enumerate(self.ids.tolist())}
+        self.matrix = self._vectors(rows, numeric)
+        self.available = self._availability(rows)
+
+    @property
+    def width(self):
+        return len(NUMERIC_WEIGHTS) + MAX_AMENITY_BITS + len(self.category_columns)
+
+    @staticmethod
+    def _numeric(rows):
+        return np.array(
+            [[np.log1p(float(row['price'])), row['bedrooms'], row['bathrooms']] for row in rows],
+            dtype=np.float64,
+        ).reshape(len(rows), len(NUMERIC_WEIGHTS))
+
+    @staticmethod
+    def _availability(rows):
+        return np.array(
+            [row['is_available'] and row['status'] == PropertyStatus.ACTIVE for row in rows], dtype=bool,
+        )
+
+    def knows_categories(self, rows):
+        return all(row['category_id'] in self.category_ancestors for row in rows)
+
+    def _vectors(self, rows, numeric):
+        vectors = np.zeros((len(rows), self.width), dtype=np.float32)
+        if not rows:
+            return vectors
+        weights = np.array(list(NUMERIC_WEIGHTS.values()))
+        vectors[:, :len(NUMERIC_WEIGHTS)] = (numeric - self.mean) / self.std * weights
+
+        masks = np.array([row['amenity_mask'] for row in rows], dtype=np.int64)
+        amenity_start = len(NUMERIC_WEIGHTS)
+        vectors[:, amenity_start:amenity_start + MAX_AMENITY_BITS] = ((masks[:, None] >> AMENITY_SHIFTS) & 1) * AMENITY_WEIGHT
+
+        category_start = amenity_start + MAX_AMENITY_BITS
+        for position, row in enumerate(rows):
+            columns = self.category_ancestors[row['category_id']]
+            # Spread the weight over the path so deep categories do not dominate.
+            vectors[position, [category_start + column for column in columns]] = CATEGORY_WEIGHT / np.sqrt(len(columns))
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+    def upsert(self, rows):
+        """Replace or append the given rows; the caller checks knows_categories() first."""
+        if not rows:
+            return
+        vectors = self._vectors(rows, self._numeric(rows))
+        available = self._availability(rows)
+        appended = []
+        for index, row in enumerate(rows):
+            position = self.positions.get(row['id'])
+            if position is None:
+                appended.append(index)
+                continue
+            self.matrix[position] = vectors[index]
+            self.available[position] = available[index]
+        if appended:
+            start = len(self.ids)
+            self.ids = np.concatenate([self.ids, [rows[index]['id'] for index in appended]]).astype(np.int64)
+            self.matrix = np.vstack([self.matrix, vectors[appended]])
+            self.available = np.concatenate([self.available, available[appended]])
+            for offset, index in enumerate(appended):
+                self.positions[rows[index]['id']] = start + offset
+
+    def remove(self, property_ids):
+        """Deleted rows stay in place as unavailable zero vectors until the next rebuild."""
+        for property_id in property_ids:
+            position = self.positions.get(property_id)
+            if position is not None:
+                self.matrix[position] = 0
+                self.available[position] = False
+
+    def _subtree_mask(self, category_id):
+        column = self.category_columns.get(category_id)
+        if column is None:
+            return np.zeros(len(self.ids), dtype=bool)
+        start = len(NUMERIC_WEIGHTS) + MAX_AMENITY_BITS
+        return self.matrix[:, start + column] > 0
+
+    def _top(self, query, candidates, k):
+        if not candidates.any() or not np.any(query):
+            return []
+        scores = self.matrix @ query
+        scores[~candidates] = -np.inf
+        k = min(k, int(candidates.sum()))
+        top = np.argpartition(-scores, k - 1)[:k]
+        # Ties fall back to the id so results are stable across workers.
+        order = np.lexsort((self.ids[top], -scores[top]))
+        return [(int(self.ids[top[i]]), float(scores[top[i]])) for i in order]
+
+    def top_k_batch(self, positions, k):
+        """
+        Top-k neighbour positions and scores for many seed rows at once, as two
+        (len(positions), k) arrays. Rows with fewer candidates are padded with -inf scores.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        k = min(k, len(self.ids))
+        if not len(positions) or k == 0:
+            return np.empty((len(positions), 0), dtype=np.int64), np.empty((len(positions), 0))
+        scores = self.matrix[positions] @ self.matrix.T
+        scores[:, ~self.available] = -np.inf
+        scores[np.arange(len(positions)), positions] = -np.inf
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.lexsort((self.ids[top], -top_scores), axis=-1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def similar_to(self, property_id, k=DEFAULT_TOP_K, category_id=None):
+        """Top-k available properties most similar to property_id, optionally within a category subtree."""
+        position = self.positions.get(property_id)
+        if position is None:
+            return []
+        candidates = self.available.copy()
+        candidates[position] = False
+        if category_id is not None:
+            candidates &= self._subtree_mask(category_id)
+        return self._top(self.matrix[position], candidates, k)
+
+    def representative_of(self, category_id, k=DEFAULT_TOP_K):
+        """Top-k available properties of a category subtree closest to the subtree's centroid."""
+        candidates = self.available & self._subtree_mask(category_id)
+        if not candidates.any():
+            return []
+        centroid = self.matrix[candidates].mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        return self._top(centroid / norm if norm else centroid, candidates, k)
+
+_worker_index = None
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+def _neighbours_in_worker(positions, k):
+    return positions, *_worker_index.top_k_batch(positions, k)
+
+def compute_neighbours(index, k=DEFAULT_TOP_K, batch_size=500, workers=1):
+    """
+    Yield (seed ids, neighbour ids, scores) for every property, batch_size seeds at a
+    time. With several workers the index is shipped to each process once and batches
+    are scored in parallel; results are yielded in seed order either way.
+    """
+    batches = [np.arange(start, min(start + batch_size, len(index.ids))) for start in range(0, len(index.ids), batch_size)]
+    if workers > 1 and len(batches) > 1:
+        # Forked workers inherit the configured Django app registry; spawned ones would
+        # import this module, and with it the models, before Django is set up.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker,
+            initargs=(index,),
+        ) as pool:
+            results = pool.map(_neighbours_in_worker, batches, [k] * len(batches))
+            for positions, top, scores in results:
+                yield index.ids[positions], index.ids[top], scores
+        return
+    for positions in batches:
+        top, scores = index.top_k_batch(positions, k)
+        yield index.ids[positions], index.ids[top], scores
+
+def build_similarity_index():
+    rows = list(Property.objects.order_by('id').values(*FEATURE_COLUMNS))
+    category_paths = dict(Category.objects.values_list('id', 'path'))
+    return SimilarityIndex(rows, category_paths)
+
+class _SimilarityIndexHolder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._generation = None
+        self._sequence = None
+
+    def get(self):
+        generation, sequence = _current_position()
+        if self._index is not None and (generation, sequence) == (self._generation, self._sequence):
+            return self._index
+        with self._lock:
+            if self._index is None or (generation, sequence) != (self._generation, self._sequence):
+                replayable = self._index is not None and generation == self._generation
+                if not replayable or not self._replay(self._sequence, sequence):
+                    logger.info("Rebuilding similarity index (generation %s, sequence %s)", generation, sequence)
+                    self._index = build_similarity_index()
+                self._generation, self._sequence = generation, sequence
+        return self._index
+
+    def _replay(self, applied, sequence):
+        """Apply journalled changes in (applied, sequence]; False when a rebuild is needed."""
+        if applied is None or not 0 < sequence - applied <= MAX_JOURNAL_REPLAY:
+            return False
+        keys = [_journal_key(number) for number in range(applied + 1, sequence + 1)]
+        journal = cache.get_many(keys)
+        if len(journal) != len(keys):
+            return False
+
+        changed = set(journal.values())
+        rows = list(Property.objects.filter(pk__in=changed).order_by('id').values(*FEATURE_COLUMNS))
+        if not self._index.knows_categories(rows):
+            return False
+        self._index.upsert(rows)
+        self._index.remove(changed - {row['id'] for row in rows})
+        logger.info("Applied %d similarity index changes", len(changed))
+        return True
+
+_holder = _SimilarityIndexHolder()
+
+def get_similarity_index():
+    return _holder.get()
+
+def similar_properties(property_id, k=DEFAULT_TOP_K, category_id=None):
+    return get_similarity_index().similar_to(property_id, min(k, MAX_TOP_K), category_id)
+
+def representative_properties(category_id, k=DEFAULT_TOP_K):
+    return get_similarity_index().representative_of(category_id, min(k, MAX_TOP_K))
+
+def _ensure_counter():
+    if cache.add(SIMILARITY_SEQUENCE_KEY, 0, timeout=None):
+        cache.set(SIMILARITY_GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+    else:
+        cache.add(SIMILARITY_GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+def _current_position():
+    keys = [SIMILARITY_GENERATION_KEY, SIMILARITY_SEQUENCE_KEY]
+    position = cache.get_many(keys)
+    if len(position) != len(keys):
+        _ensure_counter()
+        position = cache.get_many(keys)
+    return position.get(SIMILARITY_GENERATION_KEY), position.get(SIMILARITY_SEQUENCE_KEY, 0)
+
+def _next_sequence():
+    _ensure_counter()
+    try:
+        return cache.incr(SIMILARITY_SEQUENCE_KEY)
+    except ValueError:
+        # Evicted between add() and incr(); the next change starts a new generation.
+        return None
+
+def invalidate_similarity_index():
+    """Force a full rebuild, e.g. after category moves; a sequence without a journal entry does that."""
+    transaction.on_commit(_next_sequence)
+
+def record_similarity_change(property_id):
+    """Journal a changed property for every worker once the current transaction commits."""
+    def publish():
+        sequence = _next_sequence()
+        if sequence is not None:
+            cache.set(_journal_key(sequence), property_id, timeout=SIMILARITY_JOURNAL_TIMEOUT)
+    transaction.on_commit(publish)
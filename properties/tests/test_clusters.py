@@ -0,0 +1,89 @@
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from properties.clusters import get_clusters
+from properties.models import Category, LocationCluster, Property, PropertyStatus
+
+class LocationClusterTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Villas', slug='villas')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.marina = Property.objects.create(
+                title='Marina', slug='marina', category=self.category, price=Decimal('300'), latitude=25.08, longitude=55.14,
+            )
+            self.jbr = Property.objects.create(
+                title='JBR', slug='jbr', category=self.category, price=Decimal('200'), latitude=25.078, longitude=55.133,
+            )
+            self.paris = Property.objects.create(
+                title='Paris', slug='paris', category=self.category, price=Decimal('500'), latitude=48.8566, longitude=2.3522,
+            )
+
+    def clusters(self, zoom, bbox=None):
+        return {cluster.cell: cluster for cluster in get_clusters(zoom, bbox)[1]}
+
+    def test_clusters_are_maintained_incrementally(self):
+        """
+        Test that saves and deletes keep per-cell counts, centroids and minimum prices current.
+        """
+        dubai = self.clusters(0)[self.marina.geohash[:1]]
+        self.assertEqual(dubai.count, 2)
+        self.assertEqual(dubai.min_price, Decimal('200'))
+        self.assertAlmostEqual(dubai.latitude, (25.08 + 25.078) / 2)
+
+        self.jbr.status = PropertyStatus.INACTIVE
+        with self.captureOnCommitCallbacks(execute=True):
+            self.jbr.save()
+        dubai = self.clusters(0)[self.marina.geohash[:1]]
+        self.assertEqual((dubai.count, dubai.min_price), (1, Decimal('300')))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.paris.delete()
+        self.assertFalse(LocationCluster.objects.filter(cell__startswith=self.paris.geohash[:1]).exists())
+
+    def test_moving_a_property_updates_both_cells(self):
+        self.paris.latitude, self.paris.longitude = 25.2, 55.27
+        with self.captureOnCommitCallbacks(execute=True):
+            self.paris.save()
+
+        cells = self.clusters(0)
+        self.assertEqual(list(cells), [self.marina.geohash[:1]])
+        self.assertEqual(cells[self.marina.geohash[:1]].count, 3)
+
+    def test_refresh_waits_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.jbr.delete()
+        self.assertEqual(self.clusters(0)[self.marina.geohash[:1]].count, 2)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.clusters(0)[self.marina.geohash[:1]].count, 1)
+
+    def test_rebuild_matches_incremental_state(self):
+        expected = set(LocationCluster.objects.values_list('precision', 'cell', 'count', 'min_price'))
+        LocationCluster.objects.all().delete()
+
+        call_command('rebuild_location_clusters', stdout=StringIO())
+
+        self.assertEqual(set(LocationCluster.objects.values_list('precision', 'cell', 'count', 'min_price')), expected)
+
+    def test_cluster_endpoint(self):
+        """
+        API-level test: clusters are returned for the zoom's precision and limited to the viewport.
+        """
+        client = APIClient()
+        url = reverse('property-clusters')
+
+        response = client.get(url, {'zoom': 14, 'bbox': '55.0,25.0,55.5,25.3'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['precision'], 6)
+        self.assertEqual(sum(cluster['count'] for cluster in response.data['clusters']), 2)
+
+        response = client.get(url, {'zoom': 1})
+        self.assertEqual(len(response.data['clusters']), 2)
+
+        self.assertEqual(client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(client.get(url, {'zoom': 3, 'bbox': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
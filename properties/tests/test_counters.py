@@ -0,0 +1,93 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from properties.models import Category, Property, PropertyStatus
+from properties.services import get_listing_version
+
+class CategoryCounterTests(TestCase):
+    def setUp(self):
+        # A
+        # ├── B
+        # │   └── D
+        # └── C
+        self.cat_a = Category.objects.create(name='A', slug='a')
+        self.cat_b = Category.objects.create(name='B', slug='b', parent=self.cat_a)
+        self.cat_c = Category.objects.create(name='C', slug='c', parent=self.cat_a)
+        self.cat_d = Category.objects.create(name='D', slug='d', parent=self.cat_b)
+
+        self.prop_b = Property.objects.create(title='Prop B', slug='prop-b', category=self.cat_b, price=100)
+        self.prop_d = Property.objects.create(title='Prop D', slug='prop-d', category=self.cat_d, price=100)
+        Property.objects.create(title='Hidden', slug='hidden', category=self.cat_d, price=100, is_available=False)
+
+    def assertCounters(self, expected):
+        """expected maps each category to its (direct, subtree) counters."""
+        actual = {
+            category: tuple(Category.objects.filter(pk=category.pk).values_list(
+                'available_count', 'subtree_available_count',
+            ).get())
+            for category in expected
+        }
+        self.assertEqual(actual, expected)
+
+    def test_creates_and_deletes_are_counted(self):
+        self.assertCounters({self.cat_a: (0, 2), self.cat_b: (1, 2), self.cat_c: (0, 0), self.cat_d: (1, 1)})
+
+        self.prop_d.delete()
+        self.assertCounters({self.cat_a: (0, 1), self.cat_b: (1, 1), self.cat_d: (0, 0)})
+
+    def test_availability_status_and_category_changes_move_counts(self):
+        self.prop_d.status = PropertyStatus.INACTIVE
+        self.prop_d.save(update_fields=['status'])
+        self.assertCounters({self.cat_a: (0, 1), self.cat_b: (1, 1), self.cat_d: (0, 0)})
+
+        self.prop_d.status = PropertyStatus.ACTIVE
+        self.prop_d.category = self.cat_c
+        self.prop_d.save()
+        self.assertCounters({self.cat_a: (0, 2), self.cat_b: (1, 1), self.cat_c: (1, 1), self.cat_d: (0, 0)})
+
+        self.prop_b.is_available = False
+        self.prop_b.save()
+        self.assertCounters({self.cat_a: (0, 1), self.cat_b: (0, 0)})
+
+    def test_rolled_back_save_leaves_counters_untouched(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.prop_d.is_available = False
+            self.prop_d.save()
+            raise RuntimeError
+
+        self.assertCounters({self.cat_a: (0, 2), self.cat_b: (1, 2), self.cat_d: (1, 1)})
+
+    def test_moving_a_category_moves_its_subtree_count(self):
+        self.cat_b.parent = self.cat_c
+        self.cat_b.save()
+        self.assertCounters({self.cat_a: (0, 2), self.cat_b: (1, 2), self.cat_c: (0, 2), self.cat_d: (1, 1)})
+
+    def test_stale_category_instance_does_not_overwrite_counters(self):
+        stale = Category.objects.get(pk=self.cat_d.pk)
+        Property.objects.create(title='Prop D2', slug='prop-d2', category=self.cat_d, price=100)
+
+        stale.name = 'Renamed'
+        stale.save()
+        self.assertCounters({self.cat_d: (2, 2)})
+
+    def test_stale_property_instance_is_counted_from_the_stored_row(self):
+        stale = Property.objects.get(pk=self.prop_d.pk)
+        self.prop_d.is_available = False
+        self.prop_d.save()
+
+        stale.delete()
+        self.assertCounters({self.cat_a: (0, 1), self.cat_b: (1, 1), self.cat_d: (0, 0)})
+
+    def test_rebuild_repairs_drift(self):
+        Category.objects.update(available_count=7, subtree_available_count=0)
+
+        version = get_listing_version()
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rebuild_category_counters', stdout=out)
+
+        self.assertNotEqual(get_listing_version(), version)
+
+        self.assertIn('Repaired counters of 4 categories', out.getvalue())
+        self.assertCounters({self.cat_a: (0, 2), self.cat_b: (1, 2), self.cat_c: (0, 0), self.cat_d: (1, 1)})
@@ -0,0 +1,110 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.utils import timezone
+from bookings.models import Booking
+from properties.facets import compute_facets, normalize_filters
+from properties.models import Category, Property, PropertyStatus
+
+class PropertyFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('property-list')
+        self.villas = Category.objects.create(name='Villas', slug='villas')
+        self.flats = Category.objects.create(name='Flats', slug='flats')
+
+        rows = [
+            (self.villas, 2_500_000, 5, PropertyStatus.ACTIVE, 'Dubai'),
+            (self.villas, 12_000_000, 7, PropertyStatus.ACTIVE, 'Dubai'),
+            (self.villas, 800_000, 3, PropertyStatus.INACTIVE, 'Paris'),
+            (self.flats, 900_000, 1, PropertyStatus.ACTIVE, 'Paris'),
+            (self.flats, 60_000_000, 2, PropertyStatus.ACTIVE, 'Dubai'),
+        ]
+        for i, (category, price, bedrooms, state, location) in enumerate(rows):
+            Property.objects.create(
+                title=f'Home {i}', slug=f'home-{i}', category=category, price=price,
+                bedrooms=bedrooms, status=state, location=location,
+            )
+
+    def counts(self, facet):
+        return {bucket['value']: bucket['count'] for bucket in facet}
+
+    def test_facets_are_computed_in_one_query(self):
+        """
+        Test that every facet comes from a single grouped aggregate.
+        """
+        with self.assertNumQueries(1):
+            facets = compute_facets(Property.objects.all())
+
+        self.assertEqual(self.counts(facets['category']), {self.villas.id: 3, self.flats.id: 2})
+        self.assertEqual(self.counts(facets['status']), {'ACTIVE': 4, 'INACTIVE': 1})
+        self.assertEqual(self.counts(facets['bedrooms']), {'0': 0, '1': 1, '2': 1, '3': 1, '4': 0, '5+': 2})
+        self.assertEqual(self.counts(facets['price']), {
+            '0-1000000': 2,
+            '1000000-5000000': 1,
+            '5000000-10000000': 0,
+            '10000000-50000000': 1,
+            '50000000+': 1,
+        })
+
+    def test_studios_are_counted_in_their_own_bucket(self):
+        Property.objects.create(title='Studio', slug='studio', category=self.flats, price=500_000, bedrooms=0, location='Paris')
+
+        bedrooms = compute_facets(Property.objects.all())['bedrooms']
+        self.assertEqual(bedrooms[0], {'value': '0', 'count': 1})
+        self.assertEqual(sum(bucket['count'] for bucket in bedrooms), Property.objects.count())
+
+    def test_listing_facets_follow_filters(self):
+        """
+        API-level test: ?facets=true adds counts for the whole filtered set next to the page.
+        """
+        response = self.client.get(self.url, {'facets': 'true', 'location': 'dubai', 'limit': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(self.counts(response.data['facets']['category']), {self.villas.id: 2, self.flats.id: 1})
+
+        response = self.client.get(self.url, {'facets': 'true', 'q': 'home', 'status': 'ACTIVE'})
+        self.assertEqual(self.counts(response.data['facets']['status']), {'ACTIVE': 4})
+
+        self.assertNotIn('facets', self.client.get(self.url).data)
+
+    def test_facets_are_cached_until_catalog_changes(self):
+        params = {'facets': '1', 'location': 'paris'}
+        self.client.get(self.url, params)
+
+        with self.assertNumQueries(2):
+            # Only the conditional-GET validators and the page itself are queried.
+            response = self.client.get(self.url, {'location': 'paris', 'facets': '1', 'limit': 5})
+        self.assertEqual(self.counts(response.data['facets']['status']), {'ACTIVE': 1, 'INACTIVE': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Property.objects.filter(location='Paris', status=PropertyStatus.INACTIVE).get().delete()
+        response = self.client.get(self.url, params)
+        self.assertEqual(self.counts(response.data['facets']['status']), {'ACTIVE': 1})
+
+    def test_stay_filtered_facets_are_not_cached(self):
+        check_in = timezone.localdate() + timedelta(days=1)
+        params = {'facets': '1', 'location': 'dubai', 'check_in': check_in, 'check_out': check_in + timedelta(days=2)}
+        response = self.client.get(self.url, params)
+        self.assertEqual(self.counts(response.data['facets']['category']), {self.villas.id: 2, self.flats.id: 1})
+
+        # A booking does not bump the listing version, so a cached result would go stale.
+        Booking.objects.create(
+            user=get_user_model().objects.create_user(username='guest', password='password'),
+            property=Property.objects.get(slug='home-4'), check_in=check_in, check_out=check_in + timedelta(days=1), total_amount=60_000_000,
+        )
+        response = self.client.get(self.url, params)
+        self.assertEqual(self.counts(response.data['facets']['category']), {self.villas.id: 2})
+
+    def test_filter_normalization_ignores_paging_and_order(self):
+        a = QueryDict('location=dubai&status=ACTIVE&cursor=abc&limit=5')
+        b = QueryDict('status=ACTIVE&facets=1&location=dubai&ordering=price')
+        self.assertEqual(normalize_filters(a), normalize_filters(b))
+        self.assertNotEqual(normalize_filters(a), normalize_filters(QueryDict('location=paris')))
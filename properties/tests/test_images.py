@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+from io import BytesIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.renderers import JSONRenderer
+from properties.images import IMAGE_WIDTHS
+from properties.models import Category, Property
+from properties.serializers import PropertySerializer, PropertyValuesSerializer
+
+def upload(name='villa.png', size=(1200, 800), color=(200, 120, 40)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, PROPERTY_IMAGE_DERIVATIVES_ASYNC=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.category = Category.objects.create(name='Villas', slug='villas')
+
+    def create(self, slug, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Property.objects.create(title=slug, slug=slug, category=self.category, price=100, image=image)
+
+    def test_upload_generates_variants(self):
+        """
+        Test that an upload renders JPEG and WebP thumbnails without upscaling.
+        """
+        prop = self.create('villa', upload())
+        prop.refresh_from_db()
+
+        self.assertEqual(prop.image_variants['source'], prop.image.name)
+        widths = [str(width) for width in IMAGE_WIDTHS if width < 1200] + ['1200']
+        for image_format in ('jpeg', 'webp'):
+            self.assertEqual(list(prop.image_variants['formats'][image_format]), widths)
+        with prop.image.storage.open(prop.image_variants['formats']['webp']['640']) as derivative:
+            with Image.open(derivative) as image:
+                self.assertEqual((image.format, image.size), ('WEBP', (640, 427)))
+
+    def test_derivatives_are_content_addressed(self):
+        first = self.create('first', upload('a.png'))
+        second = self.create('second', upload('b.png'))
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertNotEqual(first.image.name, second.image.name)
+        self.assertEqual(first.image_variants['formats'], second.image_variants['formats'])
+
+    def test_serializer_exposes_srcset(self):
+        prop = self.create('villa', upload(size=(500, 300)))
+        prop.refresh_from_db()
+
+        data = PropertySerializer(prop).data
+        self.assertEqual(list(data['image_variants']['webp']), ['320', '500'])
+        self.assertEqual(
+            data['image_srcset']['webp'],
+            f"{data['image_variants']['webp']['320']} 320w, {data['image_variants']['webp']['500']} 500w",
+        )
+
+        fast = PropertyValuesSerializer()
+        queryset = Property.objects.filter(pk=prop.pk)
+        self.assertEqual(
+            JSONRenderer().render(fast.to_representation(fast.project(queryset))),
+            JSONRenderer().render(PropertySerializer(queryset, many=True).data),
+        )
+
+    def test_replaced_image_hides_stale_variants(self):
+        prop = self.create('villa', upload())
+        prop.refresh_from_db()
+        prop.image = upload('other.png', color=(0, 0, 0))
+        prop.save()
+
+        # Until the new derivatives exist, the old ones are not served.
+        self.assertEqual(PropertySerializer(prop).data['image_variants'], {})
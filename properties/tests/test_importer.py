@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from properties.geo import encode_geohash
+from properties.importer import import_properties
+from properties.models import MAX_AMENITY_BITS, Amenity, Category, LocationCluster, Property
+from properties.services import get_listing_version
+
+CSV_ROWS = """title,slug,category,location,latitude,longitude,price,bedrooms,bathrooms,amenities,status,is_available
+Marina View,,villas,Dubai Marina,25.08,55.14,300.00,3,2,Pool|Gym,ACTIVE,true
+Marina View,,villas,Dubai Marina,25.078,55.133,250.00,2,1,,ACTIVE,yes
+Taken,existing,villas,Dubai,,,100,1,1,,ACTIVE,true
+No Price,,villas,Dubai,,,,1,1,,ACTIVE,true
+Wrong Category,,castles,Dubai,,,100,1,1,,ACTIVE,true
+Half Located,,apartments,Paris,48.85,,100,1,1,,ACTIVE,true
+"""
+
+class ImportPropertiesTests(TestCase):
+    def setUp(self):
+        self.villas = Category.objects.create(name='Villas', slug='villas')
+        self.apartments = Category.objects.create(name='Apartments', slug='apartments', parent=self.villas)
+        Property.objects.create(title='Existing', slug='existing', category=self.villas, price=Decimal('100'), location='Dubai')
+        Amenity.objects.create(name='Pool')
+        cache.clear()
+
+    def write_file(self, suffix, content):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w', encoding='utf-8') as stream:
+            stream.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, path, **options):
+        stdout, stderr = StringIO(), StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_properties', path, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv_import(self):
+        """
+        Test that valid rows are inserted with the columns save() would derive and invalid rows are reported.
+        """
+        stdout, stderr = self.run_import(self.write_file('.csv', CSV_ROWS), batch_size=2)
+
+        self.assertIn('Imported 3 of 6 rows (3 invalid)', stdout)
+        self.assertIn('Line 5: price:', stderr)
+        self.assertIn("Unknown category slug 'castles'", stderr)
+        self.assertIn('Line 7: latitude:', stderr)
+
+        first, second = Property.objects.filter(title='Marina View').order_by('id')
+        self.assertEqual((first.slug, second.slug), ('marina-view', 'marina-view-2'))
+        self.assertEqual(Property.objects.get(title='Taken').slug, 'existing-2')
+        self.assertEqual(first.geohash, encode_geohash(25.08, 55.14))
+        self.assertEqual(first.amenity_mask, Amenity.objects.mask_for(['Pool', 'Gym']))
+        self.assertTrue(Amenity.objects.filter(slug='gym').exists())
+        self.assertEqual(second.amenities, [])
+        self.assertTrue(second.is_available)
+
+    def test_import_refreshes_derived_data(self):
+        """
+        Test that clusters, counters and the listing version see rows inserted without save().
+        """
+        version = get_listing_version()
+
+        self.run_import(self.write_file('.csv', CSV_ROWS))
+
+        self.villas.refresh_from_db()
+        self.assertEqual((self.villas.available_count, self.villas.subtree_available_count), (4, 4))
+        self.assertNotEqual(get_listing_version(), version)
+        cell = LocationCluster.objects.get(precision=1, cell=encode_geohash(25.08, 55.14)[:1])
+        self.assertEqual((cell.count, cell.min_price), (2, Decimal('250.00')))
+
+    def test_interrupted_import_refreshes_committed_chunks(self):
+        version = get_listing_version()
+
+        def interrupt(result):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt), self.captureOnCommitCallbacks(execute=True):
+            import_properties(StringIO(CSV_ROWS), 'csv', batch_size=2, on_chunk=interrupt)
+
+        self.assertEqual(Property.objects.filter(title='Marina View').count(), 2)
+        self.assertNotEqual(get_listing_version(), version)
+        cell = LocationCluster.objects.get(precision=1, cell=encode_geohash(25.08, 55.14)[:1])
+        self.assertEqual(cell.count, 2)
+
+    def test_jsonl_import_with_workers(self):
+        rows = [
+            {'title': f'Loft {number}', 'category': 'apartments', 'location': 'Paris', 'price': '150.5',
+             'amenities': ['Pool'], 'bedrooms': 2}
+            for number in range(5)
+        ]
+        content = '\n'.join(json.dumps(row) for row in rows) + '\n\nnot json\n'
+
+        stdout, stderr = self.run_import(self.write_file('.jsonl', content), batch_size=2, workers=2)
+
+        self.assertIn('Imported 5 of 6 rows (1 invalid)', stdout)
+        self.assertIn('Line 7: row:', stderr)
+        lofts = Property.objects.filter(category=self.apartments)
+        self.assertEqual(sorted(lofts.values_list('slug', flat=True)), [f'loft-{number}' for number in range(5)])
+        self.assertEqual(set(lofts.values_list('price', 'bedrooms')), {(Decimal('150.50'), 2)})
+
+    def test_full_amenity_vocabulary_is_reported_per_row(self):
+        Amenity.objects.bulk_create(
+            Amenity(name=f'Amenity {bit}', slug=f'amenity-{bit}', bit=bit) for bit in range(1, MAX_AMENITY_BITS)
+        )
+
+        stdout, stderr = self.run_import(self.write_file('.csv', CSV_ROWS))
+
+        self.assertIn('Imported 3 of 6 rows (3 invalid)', stdout)
+        self.assertIn('Line 2: amenities: The amenity vocabulary is full; Gym left out', stderr)
+        first = Property.objects.filter(title='Marina View').order_by('id').first()
+        self.assertEqual(first.amenity_mask, Amenity.objects.mask_for(['Pool']))
+        self.assertFalse(Amenity.objects.filter(slug='gym').exists())
+
+    def test_dry_run_writes_nothing(self):
+        stdout, _ = self.run_import(self.write_file('.csv', CSV_ROWS), dry_run=True)
+
+        self.assertIn('Validated 3 of 6 rows', stdout)
+        self.assertEqual(Property.objects.count(), 1)
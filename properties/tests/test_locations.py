@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from properties.locations import LocationTrie, suggest_locations
+from properties.models import Category, Property, PropertyStatus
+
+class LocationTrieTests(TestCase):
+    def test_prefix_and_word_start_matches(self):
+        trie = LocationTrie({'Dubai Marina': 3, 'Dubai Hills': 5, 'Paris': 2, 'Marbella': 1})
+
+        self.assertEqual(
+            trie.suggest('dub'),
+            [{'location': 'Dubai Hills', 'count': 5}, {'location': 'Dubai Marina', 'count': 3}],
+        )
+        self.assertEqual([s['location'] for s in trie.suggest('MAR')], ['Dubai Marina', 'Marbella'])
+        self.assertEqual(trie.suggest('x'), [])
+        self.assertEqual(trie.suggest('dub', limit=1), [{'location': 'Dubai Hills', 'count': 5}])
+
+    def test_repeated_words_are_listed_once(self):
+        trie = LocationTrie({'Paris, Paris': 2})
+        self.assertEqual(trie.suggest('par'), [{'location': 'Paris, Paris', 'count': 2}])
+
+class LocationSuggestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Villas', slug='villas')
+        for i, location in enumerate(['Dubai Marina', 'Dubai Marina', 'Dubai Hills', 'Paris']):
+            Property.objects.create(title=f'Home {i}', slug=f'home-{i}', category=self.category, price=100, location=location)
+        Property.objects.create(
+            title='Draft', slug='draft', category=self.category, price=100, location='Dubai Creek', status=PropertyStatus.DRAFT,
+        )
+
+    def test_endpoint_returns_counts_for_active_listings(self):
+        """
+        API-level test: suggestions are distinct locations of active properties ranked by count.
+        """
+        response = APIClient().get(reverse('property-location-suggest'), {'prefix': 'du'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [
+            {'location': 'Dubai Marina', 'count': 2},
+            {'location': 'Dubai Hills', 'count': 1},
+        ])
+
+    def test_lookup_hits_no_database_once_built(self):
+        suggest_locations('du')
+        with self.assertNumQueries(0):
+            suggest_locations('par')
+
+    def test_index_refreshes_after_property_changes(self):
+        suggest_locations('du')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Property.objects.filter(slug='draft').get().save()
+        with self.assertNumQueries(0):
+            suggest_locations('du')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Property.objects.create(title='New', slug='new', category=self.category, price=100, location='Dublin')
+        self.assertEqual(suggest_locations('dubl'), [{'location': 'Dublin', 'count': 1}])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            paris = Property.objects.get(location='Paris')
+            paris.status = PropertyStatus.INACTIVE
+            paris.save()
+        self.assertEqual(suggest_locations('par'), [])
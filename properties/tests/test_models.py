@@ -0,0 +1,106 @@
+from django.test import TestCase
+from django.core.exceptions import ValidationError
+from properties.models import MAX_AMENITY_BITS, Amenity, Category, Property
+
+class CategoryHierarchyTests(TestCase):
+    def setUp(self):
+        # A
+        # ├── B
+        # │   └── D
+        # └── C
+        self.cat_a = Category.objects.create(name='A', slug='a')
+        self.cat_b = Category.objects.create(name='B', slug='b', parent=self.cat_a)
+        self.cat_c = Category.objects.create(name='C', slug='c', parent=self.cat_a)
+        self.cat_d = Category.objects.create(name='D', slug='d', parent=self.cat_b)
+
+    def test_paths_are_materialized_on_create(self):
+        """
+        Test that each category stores the ids of its ancestors and itself.
+        """
+        self.assertEqual(self.cat_a.path, f"/{self.cat_a.id}/")
+        self.assertEqual(self.cat_d.path, f"/{self.cat_a.id}/{self.cat_b.id}/{self.cat_d.id}/")
+        self.assertEqual(self.cat_d.depth, 2)
+        self.assertEqual(self.cat_d.ancestor_ids(), [self.cat_a.id, self.cat_b.id, self.cat_d.id])
+
+    def test_subtree_resolves_in_single_query(self):
+        """
+        Test that the whole subtree is fetched with one query.
+        """
+        with self.assertNumQueries(1):
+            ids = set(self.cat_a.get_descendants().values_list('id', flat=True))
+        self.assertEqual(ids, {self.cat_a.id, self.cat_b.id, self.cat_c.id, self.cat_d.id})
+
+    def test_reparent_moves_descendants(self):
+        """
+        Test that moving a node rewrites the paths of its whole subtree.
+        """
+        self.cat_b.parent = self.cat_c
+        self.cat_b.save()
+
+        self.cat_d.refresh_from_db()
+        self.assertEqual(self.cat_d.path, f"/{self.cat_a.id}/{self.cat_c.id}/{self.cat_b.id}/{self.cat_d.id}/")
+        self.assertEqual(self.cat_d.depth, 3)
+
+        self.cat_b.parent = None
+        self.cat_b.save()
+
+        self.cat_d.refresh_from_db()
+        self.assertEqual(self.cat_d.path, f"/{self.cat_b.id}/{self.cat_d.id}/")
+        self.assertEqual(self.cat_d.depth, 1)
+        self.assertEqual(set(self.cat_a.get_descendants().values_list('id', flat=True)), {self.cat_a.id, self.cat_c.id})
+
+    def test_cycles_are_rejected(self):
+        """
+        Test that a category cannot be moved under itself or one of its descendants.
+        """
+        self.cat_b.parent = self.cat_d
+        with self.assertRaises(ValidationError):
+            self.cat_b.save()
+
+        self.cat_a.parent = self.cat_a
+        with self.assertRaises(ValidationError):
+            self.cat_a.save()
+
+        self.cat_d.refresh_from_db()
+        self.assertEqual(self.cat_d.path, f"/{self.cat_a.id}/{self.cat_b.id}/{self.cat_d.id}/")
+
+class AmenityMaskTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Villas', slug='villas')
+
+    def test_save_maintains_vocabulary_and_mask(self):
+        """
+        Test that saving a property registers its amenities and stores one bit per amenity.
+        """
+        prop = Property.objects.create(
+            title='Villa', slug='villa', category=self.category, price=100, amenities=['Pool', 'WiFi', 'pool'],
+        )
+
+        self.assertEqual(Amenity.objects.count(), 2)
+        bits = dict(Amenity.objects.values_list('slug', 'bit'))
+        self.assertEqual(prop.amenity_mask, (1 << bits['pool']) | (1 << bits['wifi']))
+
+        prop.amenities = ['Gym']
+        prop.save(update_fields=['amenities'])
+        prop.refresh_from_db()
+        self.assertEqual(prop.amenity_mask, 1 << Amenity.objects.get(slug='gym').bit)
+
+    def test_mask_for_unknown_amenity(self):
+        Amenity.objects.create(name='Pool')
+        self.assertIsNone(Amenity.objects.mask_for(['pool', 'helipad']))
+        self.assertEqual(Amenity.objects.mask_for(['Pool', ' ']), 1 << Amenity.objects.get(slug='pool').bit)
+        self.assertEqual(Amenity.objects.mask_for([]), 0)
+
+    def test_full_vocabulary_leaves_new_amenities_unmasked(self):
+        Amenity.objects.bulk_create(
+            Amenity(name=f'Amenity {bit}', slug=f'amenity-{bit}', bit=bit) for bit in range(MAX_AMENITY_BITS)
+        )
+
+        with self.assertLogs('properties.models', 'WARNING'):
+            prop = Property.objects.create(
+                title='Villa', slug='villa', category=self.category, price=100, amenities=['Amenity 3', 'Helipad'],
+            )
+
+        self.assertEqual(prop.amenity_mask, 1 << 3)
+        self.assertFalse(Amenity.objects.filter(slug='helipad').exists())
+        self.assertIsNone(Amenity.objects.mask_for(['Helipad']))
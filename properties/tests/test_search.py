@@ -0,0 +1,78 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from properties.models import Category, Property
+from properties.search import search_properties
+
+class PropertySearchTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Villas', slug='villas')
+        self.title_match = Property.objects.create(
+            title='Oceanfront Villa', slug='oceanfront-villa', category=self.category, price=100,
+            location='Malibu', description='Private beach access.',
+        )
+        self.description_match = Property.objects.create(
+            title='City Loft', slug='city-loft', category=self.category, price=100,
+            location='New York', description='Feels like a villa in the sky.',
+        )
+        self.no_match = Property.objects.create(
+            title='Alpine Chalet', slug='alpine-chalet', category=self.category, price=100,
+            location='Zermatt', description='Ski in, ski out.',
+        )
+
+    def search_ids(self, query):
+        return list(
+            search_properties(Property.objects.all(), query)
+            .order_by('-search_rank', 'id')
+            .values_list('id', flat=True)
+        )
+
+    def test_results_are_ranked_by_relevance(self):
+        """
+        Test that a title match ranks above a description match and non-matches are excluded.
+        """
+        self.assertEqual(self.search_ids('villa'), [self.title_match.id, self.description_match.id])
+
+    def test_stemming_and_multiple_terms(self):
+        self.assertEqual(self.search_ids('villas beach'), [self.title_match.id])
+        self.assertEqual(self.search_ids('skiing'), [self.no_match.id])
+
+    def test_document_follows_writes(self):
+        """
+        Test that the search document tracks updates, bulk updates and deletes.
+        """
+        self.no_match.title = 'Alpine Villa'
+        self.no_match.save()
+        self.assertIn(self.no_match.id, self.search_ids('villa'))
+
+        Property.objects.filter(pk=self.no_match.pk).update(title='Alpine Chalet')
+        self.assertNotIn(self.no_match.id, self.search_ids('villa'))
+
+        self.title_match.delete()
+        self.assertEqual(self.search_ids('villa'), [self.description_match.id])
+
+    def test_query_syntax_is_treated_as_text(self):
+        self.assertEqual(self.search_ids('villa"(*'), [self.title_match.id, self.description_match.id])
+        self.assertEqual(self.search_ids('*:"'), [])
+
+    def test_listing_q_parameter(self):
+        """
+        API-level test: ?q= returns matches ordered by relevance and paginates through them.
+        """
+        client = APIClient()
+        url = reverse('property-list')
+
+        response = client.get(url, {'q': 'villa', 'limit': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.title_match.id])
+
+        response = client.get(response.data['next'])
+        self.assertEqual([row['id'] for row in response.data['results']], [self.description_match.id])
+        self.assertIsNone(response.data['next'])
+
+        response = client.get(url, {'q': 'villa', 'ordering': 'price'})
+        self.assertEqual(len(response.data['results']), 2)
+
+        response = client.get(url, {'ordering': 'relevance'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,41 @@
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from properties.models import Category, Property, PropertyStatus
+from properties.serializers import PropertySerializer, PropertyValuesSerializer
+
+class PropertyValuesSerializerTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name='Villas', slug='villas')
+        Property.objects.create(
+            title='Villa', slug='villa', category=category, price=Decimal('1250000.5'), latitude=25.08, longitude=55.14,
+            amenities=['Pool', 'Gym'], image='properties/sea view é.jpg', description='Ünïcode',
+        )
+        Property.objects.create(
+            title='Loft', slug='loft', category=category, price=Decimal('99'), status=PropertyStatus.INACTIVE,
+            is_available=False,
+        )
+        self.request = Request(APIRequestFactory().get('/api/properties/', HTTP_HOST='testserver'))
+
+    def test_output_matches_model_serializer(self):
+        """
+        Test that rows rendered from .values() are byte-identical to PropertySerializer's JSON.
+        """
+        queryset = Property.objects.select_related('category').order_by('id')
+        context = {'request': self.request}
+        expected = JSONRenderer().render(PropertySerializer(queryset, many=True, context=context).data)
+
+        fast = PropertyValuesSerializer(context=context)
+        with self.assertNumQueries(1):
+            rendered = JSONRenderer().render(fast.to_representation(fast.project(queryset)))
+
+        self.assertEqual(rendered, expected)
+        self.assertIn(b'http://testserver/properties/sea%20view%20%C3%A9.jpg', rendered)
+
+    def test_output_matches_without_request(self):
+        queryset = Property.objects.order_by('id')
+        expected = JSONRenderer().render(PropertySerializer(queryset, many=True).data)
+        fast = PropertyValuesSerializer()
+        self.assertEqual(JSONRenderer().render(fast.to_representation(fast.project(queryset))), expected)
@@ -1,71 +1,48 @@
 from django.test import TestCase
 from django.core.cache import cache
-from properties.models import Category, Property
-from properties.services import get_category_subtree_property_ids, get_recommended_properties
+from django.urls import reverse
+from rest_framework.test import APIClient
+from properties.models import Category, Property, PropertyStatus
 
-class PropertyServiceTests(TestCase):
+class CategoryTreeTests(TestCase):
     def setUp(self):
-        # Create category tree
-        # A
-        # ├── B
-        # │   └── D
-        # └── C
-        self.cat_a = Category.objects.create(name='A', slug='a')
-        self.cat_b = Category.objects.create(name='B', slug='b', parent=self.cat_a)
-        self.cat_c = Category.objects.create(name='C', slug='c', parent=self.cat_a)
-        self.cat_d = Category.objects.create(name='D', slug='d', parent=self.cat_b)
-
-        # Create properties
-        self.prop_a = Property.objects.create(title='Prop A', slug='prop-a', category=self.cat_a, price=100, is_available=True)
-        self.prop_b = Property.objects.create(title='Prop B', slug='prop-b', category=self.cat_b, price=100, is_available=True)
-        self.prop_c = Property.objects.create(title='Prop C', slug='prop-c', category=self.cat_c, price=100, is_available=True)
-        self.prop_d = Property.objects.create(title='Prop D', slug='prop-d', category=self.cat_d, price=100, is_available=True)
-        
-        # Unavailable property
-        self.prop_d_unavailable = Property.objects.create(title='Prop D Unavail', slug='prop-d-unavail', category=self.cat_d, price=100, is_available=False)
-
+        self.client = APIClient()
+        self.url = reverse('category-tree')
+        self.villas = Category.objects.create(name='Villas', slug='villas')
+        self.beach = Category.objects.create(name='Beach', slug='beach', parent=self.villas)
+        self.cliff = Category.objects.create(name='Cliff', slug='cliff', parent=self.beach)
+        self.flats = Category.objects.create(name='Flats', slug='flats')
+        Property.objects.create(title='Villa', slug='villa', category=self.villas, price=100)
+        Property.objects.create(title='Beach', slug='beach', category=self.beach, price=100)
+        Property.objects.create(title='Cliff', slug='cliff', category=self.cliff, price=100)
+        Property.objects.create(title='Hidden', slug='hidden', category=self.cliff, price=100, is_available=False)
+        Property.objects.create(title='Draft', slug='draft', category=self.beach, price=100, status=PropertyStatus.DRAFT)
         cache.clear()
 
-    def test_get_category_subtree_property_ids_root(self):
-        """
-        Test that querying the root category returns properties from the entire subtree.
-        """
-        ids = get_category_subtree_property_ids(self.cat_a.id)
-        self.assertEqual(len(ids), 4)
-        self.assertIn(self.prop_a.id, ids)
-        self.assertIn(self.prop_b.id, ids)
-        self.assertIn(self.prop_c.id, ids)
-        self.assertIn(self.prop_d.id, ids)
-        self.assertNotIn(self.prop_d_unavailable.id, ids)
+    def test_tree_nests_categories_with_subtree_counts(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        flats, villas = response.data
+        self.assertEqual((flats['slug'], flats['available_count'], flats['children']), ('flats', 0, []))
+        self.assertEqual((villas['slug'], villas['available_count']), ('villas', 3))
+        [beach] = villas['children']
+        self.assertEqual((beach['slug'], beach['parent'], beach['available_count']), ('beach', self.villas.id, 2))
+        [cliff] = beach['children']
+        self.assertEqual((cliff['slug'], cliff['available_count'], cliff['children']), ('cliff', 1, []))
 
-    def test_get_category_subtree_property_ids_leaf(self):
-        """
-        Test that querying a leaf category returns only its properties.
-        """
-        ids = get_category_subtree_property_ids(self.cat_d.id)
-        self.assertEqual(len(ids), 1)
-        self.assertIn(self.prop_d.id, ids)
+    def test_tree_is_cached_until_a_change(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
 
-    def test_get_category_subtree_property_ids_intermediate(self):
-        """
-        Test that querying an intermediate category returns its properties and its children's.
-        """
-        ids = get_category_subtree_property_ids(self.cat_b.id)
-        self.assertEqual(len(ids), 2)
-        self.assertIn(self.prop_b.id, ids)
-        self.assertIn(self.prop_d.id, ids)
+        with self.captureOnCommitCallbacks(execute=True):
+            Property.objects.create(title='New', slug='new', category=self.flats, price=100)
+        flats, _ = self.client.get(self.url).data
+        self.assertEqual(flats['available_count'], 1)
 
-    def test_caching(self):
-        """
-        Test that results are cached.
-        """
-        # First call - cache miss
-        ids1 = get_category_subtree_property_ids(self.cat_a.id)
-        
-        # Manually verify cache is set
-        cache_key = f"category_subtree:{self.cat_a.id}"
-        self.assertIsNotNone(cache.get(cache_key))
-        
-        # Second call - cache hit (should return same result)
-        ids2 = get_category_subtree_property_ids(self.cat_a.id)
-        self.assertEqual(ids1, ids2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cliff.parent = self.flats
+            self.cliff.save()
+        flats, villas = self.client.get(self.url).data
+        self.assertEqual((flats['available_count'], villas['available_count']), (2, 2))
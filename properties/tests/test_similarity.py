@@ -0,0 +1,168 @@
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from properties.models import Category, Property, PropertyStatus, SimilarProperty
+from properties.similarity import get_similarity_index, representative_properties, similar_properties
+
+class SimilarityCatalogMixin:
+    def setUp(self):
+        cache.clear()
+        # Residential
+        # ├── Villas
+        # └── Apartments
+        self.residential = Category.objects.create(name='Residential', slug='residential')
+        self.villas = Category.objects.create(name='Villas', slug='villas', parent=self.residential)
+        self.apartments = Category.objects.create(name='Apartments', slug='apartments', parent=self.residential)
+
+        def create(slug, category, price, bedrooms, amenities=(), **kwargs):
+            return Property.objects.create(
+                title=slug, slug=slug, category=category, price=price, bedrooms=bedrooms, bathrooms=bedrooms,
+                amenities=list(amenities), **kwargs
+            )
+
+        self.seed = create('seed', self.villas, 5_000_000, 5, ['Pool', 'Gym'])
+        self.twin = create('twin', self.villas, 5_200_000, 5, ['Pool', 'Gym'])
+        self.cousin = create('cousin', self.apartments, 4_800_000, 4, ['Pool'])
+        self.studio = create('studio', self.apartments, 300_000, 1)
+        self.sold = create('sold', self.villas, 5_000_000, 5, ['Pool', 'Gym'], is_available=False)
+        self.draft = create('draft', self.villas, 5_000_000, 5, ['Pool', 'Gym'], status=PropertyStatus.DRAFT)
+
+class SimilarityTests(SimilarityCatalogMixin, TestCase):
+    def ids(self, ranked):
+        return [property_id for property_id, _ in ranked]
+
+    def test_ranks_available_properties_by_similarity(self):
+        """
+        Test that the closest available properties come first and the seed is excluded.
+        """
+        ranked = similar_properties(self.seed.id, k=10)
+        self.assertEqual(self.ids(ranked), [self.twin.id, self.cousin.id, self.studio.id])
+        self.assertGreater(ranked[0][1], ranked[1][1])
+        self.assertEqual(self.ids(similar_properties(self.seed.id, k=1)), [self.twin.id])
+        self.assertEqual(self.ids(similar_properties(self.seed.id, category_id=self.apartments.id)), [self.cousin.id, self.studio.id])
+
+    def test_category_seed(self):
+        self.assertEqual(set(self.ids(representative_properties(self.villas.id))), {self.seed.id, self.twin.id})
+        self.assertEqual(len(representative_properties(self.residential.id, k=2)), 2)
+        self.assertEqual(representative_properties(self.residential.id + 100), [])
+
+    def test_index_is_patched_incrementally(self):
+        index = get_similarity_index()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.studio.price, self.studio.bedrooms, self.studio.bathrooms = 5_000_000, 5, 5
+            self.studio.amenities = ['Pool', 'Gym']
+            self.studio.category = self.villas
+            self.studio.save()
+            self.twin.delete()
+            newcomer = Property.objects.create(title='new', slug='new', category=self.villas, price=100, bedrooms=1)
+
+        self.assertEqual(self.ids(similar_properties(self.seed.id, k=1)), [self.studio.id])
+        self.assertNotIn(self.twin.id, self.ids(similar_properties(self.seed.id)))
+        self.assertIn(newcomer.id, self.ids(similar_properties(self.seed.id)))
+        self.assertIs(get_similarity_index(), index)
+
+    def test_category_changes_rebuild(self):
+        index = get_similarity_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            lofts = Category.objects.create(name='Lofts', slug='lofts')
+            self.studio.category = lofts
+            self.studio.save()
+        self.assertIsNot(get_similarity_index(), index)
+        self.assertEqual(self.ids(representative_properties(lofts.id)), [self.studio.id])
+
+    def test_recommended_endpoint(self):
+        """
+        API-level test: recommendations are ranked, paginated by limit and require a seed.
+        """
+        client = APIClient()
+        url = reverse('property-recommended')
+
+        response = client.get(url, {'property_id': self.seed.id, 'limit': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['slug'] for row in response.data['results']], ['twin', 'cousin'])
+        self.assertIsNone(response.data['previous'])
+
+        response = client.get(url, {'category_id': self.villas.id})
+        self.assertEqual({row['slug'] for row in response.data['results']}, {'seed', 'twin'})
+        self.assertIsNone(response.data['next'])
+
+        self.assertEqual(client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(client.get(url, {'property_id': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(client.get(url, {'property_id': self.seed.id, 'limit': 0}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(client.get(url, {'property_id': self.seed.id, 'cursor': 'x'}).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_recommendation_pages(self):
+        """
+        API-level test: cursors walk the ranking in both directions and pages are served from cache.
+        """
+        client = APIClient()
+        url = reverse('property-recommended')
+
+        first = client.get(url, {'property_id': self.seed.id, 'limit': 1, 'fields': 'slug'})
+        self.assertEqual(first.data['results'], [{'slug': 'twin'}])
+        second = client.get(first.data['next'])
+        third = client.get(second.data['next'])
+        self.assertEqual([second.data['results'], third.data['results']], [[{'slug': 'cousin'}], [{'slug': 'studio'}]])
+        self.assertIsNone(third.data['next'])
+        self.assertEqual(client.get(third.data['previous']).data['results'], [{'slug': 'cousin'}])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get(first.data['next']).data, second.data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cousin.is_available = False
+            self.cousin.save()
+        self.assertEqual(client.get(first.data['next']).data['results'], [{'slug': 'studio'}])
+
+class SimilarPropertyTableTests(SimilarityCatalogMixin, TestCase):
+    def neighbours(self, prop):
+        return list(SimilarProperty.objects.filter(property=prop).order_by('rank').values_list('similar__slug', flat=True))
+
+    def test_command_precomputes_neighbours(self):
+        """
+        Test that the command stores ranked neighbours matching the live similarity index.
+        """
+        call_command('compute_similar_properties', top_k=2, batch_size=2, stdout=StringIO())
+
+        self.assertEqual(self.neighbours(self.seed), ['twin', 'cousin'])
+        self.assertEqual(
+            self.neighbours(self.studio),
+            [Property.objects.get(pk=pk).slug for pk, _ in similar_properties(self.studio.id, k=2)],
+        )
+        # Unavailable listings have neighbours but are never anyone's neighbour.
+        self.assertEqual(len(self.neighbours(self.sold)), 2)
+        self.assertFalse(SimilarProperty.objects.filter(similar__in=[self.sold, self.draft]).exists())
+
+    def test_parallel_workers_match_serial_run(self):
+        call_command('compute_similar_properties', top_k=3, batch_size=1, stdout=StringIO())
+        serial = list(SimilarProperty.objects.order_by('property', 'rank').values_list('property', 'similar', 'rank'))
+
+        call_command('compute_similar_properties', top_k=3, batch_size=1, workers=2, stdout=StringIO())
+        parallel = list(SimilarProperty.objects.order_by('property', 'rank').values_list('property', 'similar', 'rank'))
+        self.assertEqual(parallel, serial)
+
+    def test_detail_includes_similar(self):
+        """
+        API-level test: ?include=similar embeds the precomputed neighbours of the property.
+        """
+        call_command('compute_similar_properties', top_k=2, stdout=StringIO())
+        client = APIClient()
+        url = reverse('property-detail', kwargs={'slug': 'seed'})
+
+        response = client.get(url, {'include': 'similar', 'fields': 'slug'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['slug'] for item in response.json()['similar']], ['twin', 'cousin'])
+        self.assertNotIn('similar', client.get(url).json())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.twin.is_available = False
+            self.twin.save()
+        response = client.get(url, {'include': 'similar', 'fields': 'slug'})
+        self.assertEqual([item['slug'] for item in response.json()['similar']], ['cousin'])
+
+        self.assertEqual(client.get(url, {'include': 'reviews'}).status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,450 @@
+import csv
+import json
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from bookings.models import Booking, BookingStatus
+from properties.filters import within_radius
+from properties.geo import encode_geohash
+from properties.models import Category, Property, PropertyStatus
+
+class PropertyListPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('property-list')
+        self.villas = Category.objects.create(name='Villas', slug='villas')
+        self.flats = Category.objects.create(name='Flats', slug='flats')
+
+        # Duplicate prices exercise the id tie-breaker.
+        self.properties = [
+            Property.objects.create(
+                title=f'Home {i}', slug=f'home-{i}', price=Decimal(100 * (i // 2)),
+                category=self.villas if i % 3 else self.flats,
+                location='Dubai Marina' if i % 2 else 'Paris',
+            )
+            for i in range(7)
+        ]
+
+    def collect(self, params):
+        ids, url, pages = [], self.url, 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['id'] for row in response.data['results'])
+            pages += 1
+            if not response.data['next']:
+                return ids, pages, response
+            response = self.client.get(response.data['next'])
+
+    def test_pages_cover_catalog_in_stable_order(self):
+        """
+        API-level test: following next links visits every property exactly once in sort order.
+        """
+        ids, pages, _ = self.collect({'ordering': 'price', 'limit': 2})
+
+        expected = [p.id for p in sorted(self.properties, key=lambda p: (p.price, p.id))]
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 4)
+
+    def test_default_ordering_is_newest_first(self):
+        ids, _, _ = self.collect({'limit': 3})
+        expected = [p.id for p in sorted(self.properties, key=lambda p: (p.created_at, p.id), reverse=True)]
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get(self.url, {'ordering': '-price', 'limit': 3})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+
+        self.assertEqual(
+            [row['id'] for row in back.data['results']],
+            [row['id'] for row in first.data['results']],
+        )
+        self.assertIsNone(first.data['previous'])
+
+    def test_pagination_respects_filters(self):
+        """
+        API-level test: cursors carry the location and category filters across pages.
+        """
+        ids, _, _ = self.collect({'location': 'dubai', 'category': self.villas.id, 'limit': 1})
+
+        expected = {p.id for p in self.properties if p.location == 'Dubai Marina' and p.category == self.villas}
+        self.assertEqual(set(ids), expected)
+        self.assertEqual(len(ids), len(expected))
+
+    def test_invalid_cursor_and_ordering(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'garbage'}).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(self.url, {'ordering': 'title'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+        # A cursor issued for one ordering is rejected under another.
+        first = self.client.get(self.url, {'ordering': 'price', 'limit': 1})
+        cursor = parse_qs(urlparse(first.data['next']).query)['cursor'][0]
+        self.assertEqual(self.client.get(self.url, {'ordering': 'price', 'cursor': cursor}).status_code, status.HTTP_200_OK)
+        response = self.client.get(self.url, {'ordering': 'created_at', 'cursor': cursor})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class PropertyListFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('property-list')
+        self.category = Category.objects.create(name='Villas', slug='villas')
+        self.small = Property.objects.create(
+            title='Small', slug='small', category=self.category, price=Decimal('500000'), bedrooms=1, bathrooms=1,
+        )
+        self.medium = Property.objects.create(
+            title='Medium', slug='medium', category=self.category, price=Decimal('2000000'), bedrooms=3, bathrooms=2,
+        )
+        self.large = Property.objects.create(
+            title='Large', slug='large', category=self.category, price=Decimal('9000000'), bedrooms=6, bathrooms=5,
+            is_available=False, status=PropertyStatus.INACTIVE,
+        )
+
+    def ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {row['id'] for row in response.data['results']}
+
+    def test_range_filters(self):
+        """
+        API-level test: min/max bounds on price, bedrooms and bathrooms are inclusive.
+        """
+        self.assertEqual(self.ids({'min_price': 500000, 'max_price': 2000000}), {self.small.id, self.medium.id})
+        self.assertEqual(self.ids({'min_bedrooms': 3}), {self.medium.id, self.large.id})
+        self.assertEqual(self.ids({'max_bathrooms': 2, 'min_bedrooms': 2}), {self.medium.id})
+
+    def test_availability_and_exact_filters(self):
+        self.assertEqual(self.ids({'available': 'true'}), {self.small.id, self.medium.id})
+        self.assertEqual(self.ids({'available': 'false', 'status': 'INACTIVE'}), {self.large.id})
+        self.assertEqual(self.ids({'category': self.category.id, 'min_price': 1000000}), {self.medium.id, self.large.id})
+
+    def test_invalid_range_value(self):
+        response = self.client.get(self.url, {'min_price': 'cheap'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_amenities_filter_requires_all(self):
+        """
+        API-level test: ?amenities= matches properties that have every listed amenity.
+        """
+        self.small.amenities = ['Pool', 'WiFi']
+        self.small.save()
+        self.medium.amenities = ['Pool']
+        self.medium.save()
+
+        self.assertEqual(self.ids({'amenities': 'pool'}), {self.small.id, self.medium.id})
+        self.assertEqual(self.ids({'amenities': 'pool,wifi'}), {self.small.id})
+        self.assertEqual(self.ids({'amenities': 'pool,helipad'}), set())
+        self.assertEqual(
+            [row['slug'] for row in self.client.get(reverse('amenity-list')).data],
+            ['pool', 'wifi'],
+        )
+    def test_stay_filter_excludes_overlapping_bookings(self):
+        """
+        API-level test: ?check_in=&check_out= keeps bookable properties free for the whole stay.
+        """
+        guest = get_user_model().objects.create_user(username='guest', password='password')
+        Booking.objects.create(user=guest, property=self.small, total_amount=0,
+                               check_in=date(2030, 1, 10), check_out=date(2030, 1, 15))
+        Booking.objects.create(user=guest, property=self.medium, total_amount=0, status=BookingStatus.CANCELED,
+                               check_in=date(2030, 1, 10), check_out=date(2030, 1, 15))
+
+        overlapping = {'check_in': '2030-01-14', 'check_out': '2030-01-20'}
+        self.assertEqual(self.ids(overlapping), {self.medium.id})
+        self.assertEqual(self.ids({'check_in': '2030-01-15', 'check_out': '2030-01-20'}), {self.small.id, self.medium.id})
+
+        for params in ({'check_in': '2030-01-14'}, {'check_in': '2030-01-20', 'check_out': '2030-01-14'}):
+            self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST)
+
+        etag = self.client.get(self.url, overlapping)['ETag']
+        Booking.objects.filter(property=self.small).update(status=BookingStatus.CANCELED)
+        response = self.client.get(self.url, overlapping, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({row['id'] for row in response.data['results']}, {self.small.id, self.medium.id})
+
+class PropertyGeoFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('property-list')
+        self.category = Category.objects.create(name='Villas', slug='villas')
+        points = {
+            'marina': (25.0800, 55.1400),      # Dubai Marina
+            'downtown': (25.1972, 55.2744),    # Downtown Dubai, ~18 km from the marina
+            'abu-dhabi': (24.4539, 54.3773),   # ~120 km away
+            'fiji': (-17.7134, 178.0650),      # East of the antimeridian
+            'samoa': (-13.7590, -172.1046),    # West of the antimeridian
+        }
+        self.properties = {
+            slug: Property.objects.create(
+                title=slug, slug=slug, category=self.category, price=100, latitude=lat, longitude=lng,
+            )
+            for slug, (lat, lng) in points.items()
+        }
+        Property.objects.create(title='Unplaced', slug='unplaced', category=self.category, price=100)
+
+    def slugs(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return {row['slug'] for row in response.data['results']}
+
+    def test_geohash_is_maintained(self):
+        marina = self.properties['marina']
+        self.assertEqual(marina.geohash, encode_geohash(25.08, 55.14))
+        self.assertEqual(len(marina.geohash), 9)
+        marina.latitude, marina.longitude = None, None
+        marina.save(update_fields=['latitude', 'longitude'])
+        marina.refresh_from_db()
+        self.assertEqual(marina.geohash, '')
+
+    def test_bbox_filter(self):
+        """
+        API-level test: ?bbox=min_lng,min_lat,max_lng,max_lat returns properties inside the viewport.
+        """
+        self.assertEqual(self.slugs({'bbox': '55.0,25.0,55.5,25.3'}), {'marina', 'downtown'})
+        self.assertEqual(self.slugs({'bbox': '54.0,24.0,56.0,26.0'}), {'marina', 'downtown', 'abu-dhabi'})
+        self.assertEqual(self.slugs({'bbox': '170,-20,-170,-10'}), {'fiji', 'samoa'})
+
+    def test_radius_filter(self):
+        """
+        API-level test: ?lat=&lng=&radius= keeps properties within the great-circle distance.
+        """
+        self.assertEqual(self.slugs({'lat': 25.08, 'lng': 55.14, 'radius': 5}), {'marina'})
+        self.assertEqual(self.slugs({'lat': 25.08, 'lng': 55.14, 'radius': 25}), {'marina', 'downtown'})
+        self.assertEqual(self.slugs({'lat': 25.08, 'lng': 55.14, 'radius': 150, 'min_price': 101}), set())
+
+    def test_radius_search_stays_lazy(self):
+        """
+        Test that the distance test runs in SQL with the prefilter instead of collecting candidate ids first.
+        """
+        with self.assertNumQueries(0):
+            nearby = within_radius(Property.objects.all(), 25.08, 55.14, 150)
+        with self.assertNumQueries(1):
+            self.assertEqual(set(nearby.values_list('slug', flat=True)), {'marina', 'downtown', 'abu-dhabi'})
+        self.assertEqual(set(within_radius(Property.objects.all(), -15.5, 179.9, 400).values_list('slug', flat=True)), {'fiji'})
+
+    def test_invalid_geo_params(self):
+        for params in ({'bbox': '1,2,3'}, {'bbox': '0,95,1,96'}, {'lat': 25, 'lng': 55}, {'lat': 25, 'lng': 55, 'radius': 0}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Villas', slug='villas')
+        self.villa = Property.objects.create(title='Villa', slug='villa', category=self.category, price=100)
+        Property.objects.create(title='Loft', slug='loft', category=self.category, price=200)
+
+    def revalidate(self, url, etag, params=None):
+        return self.client.get(url, params or {}, HTTP_IF_NONE_MATCH=etag)
+
+    def test_list_not_modified(self):
+        """
+        API-level test: the listing answers 304 until a property in the filtered set changes.
+        """
+        url = reverse('property-list')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        # Another page or filter has its own tag.
+        self.assertEqual(self.revalidate(url, etag, {'min_price': 150}).status_code, status.HTTP_200_OK)
+
+        self.villa.price = 150
+        self.villa.save()
+        self.assertEqual(self.revalidate(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_list_tag_changes_on_delete(self):
+        url = reverse('property-list')
+        etag = self.client.get(url)['ETag']
+        self.villa.delete()
+        self.assertEqual(self.revalidate(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_detail_not_modified(self):
+        """
+        API-level test: the detail view answers 304 from the cached updated_at alone.
+        """
+        url = reverse('property-detail', kwargs={'slug': 'villa'})
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.villa.bedrooms = 4
+            self.villa.save()
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        missing = reverse('property-detail', kwargs={'slug': 'missing'})
+        self.assertEqual(self.client.get(missing).status_code, status.HTTP_404_NOT_FOUND)
+
+class PropertyDetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Villas', slug='villas')
+        self.villa = Property.objects.create(title='Villa', slug='villa', category=self.category, price=100)
+        self.url = reverse('property-detail', kwargs={'slug': 'villa'})
+
+    def test_rendered_detail_is_cached(self):
+        """
+        API-level test: repeat requests are served from the rendered cache without queries.
+        """
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertEqual(second.json()['title'], 'Villa')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.villa.title = 'Beach Villa'
+            self.villa.save()
+        response = self.client.get(self.url)
+        self.assertEqual((response['X-Cache'], response.json()['title']), ('MISS', 'Beach Villa'))
+
+    def test_slug_change_and_delete_invalidate(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.villa.slug = 'sea-villa'
+            self.villa.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+        url = reverse('property-detail', kwargs={'slug': 'sea-villa'})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.villa.delete()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stats_endpoint(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        stats_url = reverse('property-detail-cache-stats')
+        self.assertEqual(self.client.get(stats_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        admin = get_user_model().objects.create_user(username='admin', password='password', is_staff=True)
+        self.client.force_authenticate(admin)
+        response = self.client.get(stats_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['hits'], response.data['misses']), (2, 1))
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = Category.objects.create(name='Villas', slug='villas')
+        for index in range(3):
+            Property.objects.create(
+                title=f'Villa {index}', slug=f'villa-{index}', category=category, price=100 + index,
+                description='Long description', amenities=['Pool'],
+            )
+
+    def fetch(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        return response, ' '.join(query['sql'] for query in queries.captured_queries)
+
+    def test_list_fields(self):
+        """
+        API-level test: ?fields= trims both the payload and the selected columns.
+        """
+        response, sql = self.fetch(reverse('property-list'), {'fields': 'id,title,image_url', 'ordering': 'price', 'limit': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([list(row) for row in response.data['results']], [['id', 'title', 'image_url']] * 2)
+        self.assertNotIn('"description"', sql)
+
+        next_page = self.client.get(response.data['next'])
+        self.assertEqual([row['title'] for row in next_page.data['results']], ['Villa 2'])
+
+    def test_detail_omit(self):
+        response, sql = self.fetch(reverse('property-detail', kwargs={'slug': 'villa-0'}), {'omit': 'description,amenities'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('description', response.json())
+        self.assertIn('title', response.json())
+        self.assertNotIn('"description"', sql)
+
+        # The full representation is cached separately from the trimmed one.
+        self.assertIn('description', self.client.get(reverse('property-detail', kwargs={'slug': 'villa-0'})).json())
+
+    def test_invalid_fields(self):
+        url = reverse('property-list')
+        for params in ({'fields': 'title,secret'}, {'omit': 'nope'}, {'fields': 'title', 'omit': 'title'}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+class PropertyExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('property-export')
+        villas = Category.objects.create(name='Villas', slug='villas')
+        flats = Category.objects.create(name='Flats', slug='flats')
+        Property.objects.create(title='Sea Villa', slug='sea-villa', category=villas, price=Decimal('500'),
+                                location='Dubai Marina', amenities=['Pool', 'Gym'])
+        Property.objects.create(title='City Flat', slug='city-flat', category=flats, price=Decimal('200'),
+                                location='Paris')
+        Property.objects.create(title='Old Villa', slug='old-villa', category=villas, price=Decimal('300'),
+                                location='Dubai', status=PropertyStatus.INACTIVE)
+        admin = get_user_model().objects.create_user(username='admin', password='password', is_staff=True)
+        self.client.force_authenticate(admin)
+
+    def export(self, params=None, **extra):
+        response = self.client.get(self.url, params or {}, **extra)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(get_user_model().objects.create_user(username='guest', password='password'))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_ndjson_export_applies_listing_filters(self):
+        response, content = self.export({'propertyType': 'villas', 'status': 'ACTIVE', 'fields': 'slug,price,amenities'})
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(rows, [{'slug': 'sea-villa', 'price': '500.00', 'amenities': ['Pool', 'Gym']}])
+
+    def test_csv_export(self):
+        response, content = self.export({'format': 'csv', 'fields': 'slug,amenities', 'location': 'dubai'})
+
+        self.assertIn('attachment; filename="properties.csv"', response['Content-Disposition'])
+        rows = list(csv.reader(content.splitlines()))
+        self.assertEqual(rows, [['slug', 'amenities'], ['sea-villa', '["Pool", "Gym"]'], ['old-villa', '[]']])
+
+    def test_csv_export_neutralizes_formulas(self):
+        Property.objects.filter(slug='city-flat').update(title='=HYPERLINK("http://evil.example")')
+        Property.objects.filter(slug='sea-villa').update(title='@SUM(A1)')
+        Property.objects.filter(slug='old-villa').update(title='\t=1+1', location='\r=1+1')
+
+        _, content = self.export({'format': 'csv', 'fields': 'title,slug,location'})
+
+        rows = list(csv.reader(StringIO(content, newline='')))
+        self.assertIn(['\'=HYPERLINK("http://evil.example")', 'city-flat', 'Paris'], rows)
+        self.assertIn(["'@SUM(A1)", 'sea-villa', 'Dubai Marina'], rows)
+        self.assertIn(["'\t=1+1", 'old-villa', "'\r=1+1"], rows)
+
+    def test_invalid_filter_is_rejected(self):
+        response = self.client.get(self.url, {'fields': 'nope'}, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
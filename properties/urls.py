@@ -1,9 +1,18 @@
 from django.urls import path
-from .views import CategoryListView, PropertyListView, PropertyDetailView, RecommendedPropertiesView
+from .views import (
+    AmenityListView, CategoryListView, CategoryTreeView, LocationClusterView, LocationSuggestView, PropertyListView,
+    PropertyDetailView, PropertyDetailCacheStatsView, PropertyExportView, RecommendedPropertiesView,
+)
 
 urlpatterns = [
     path('categories/', CategoryListView.as_view(), name='category-list'),
+    path('categories/tree/', CategoryTreeView.as_view(), name='category-tree'),
+    path('amenities/', AmenityListView.as_view(), name='amenity-list'),
     path('properties/', PropertyListView.as_view(), name='property-list'),
+    path('properties/clusters/', LocationClusterView.as_view(), name='property-clusters'),
+    path('properties/locations/suggest/', LocationSuggestView.as_view(), name='property-location-suggest'),
+    path('properties/export/', PropertyExportView.as_view(), name='property-export'),
+    path('properties/detail-cache/stats/', PropertyDetailCacheStatsView.as_view(), name='property-detail-cache-stats'),
     path('properties/recommended/', RecommendedPropertiesView.as_view(), name='property-recommended'),
     path('properties/<slug:slug>/', PropertyDetailView.as_view(), name='property-detail'),
 ]
@@ -1,11 +1,34 @@
+from itertools import islice
+
 from rest_framework import generics, permissions
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count, Max
+from django.http import HttpResponse, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import Category, Property
-from .serializers import CategorySerializer, PropertySerializer
-from .services import get_recommended_properties
+from bookings.models import Booking
+from core.cache import get_or_compute
+from core.conditional import ConditionalGetMixin
+from core.renderers import CSVRenderer, NDJSONRenderer
+from core.views import SparseFieldsetMixin, ValuesListMixin
+
+from .models import Amenity, Category, Property
+from .clusters import get_clusters
+from .facets import get_property_facets
+from .filters import BoundingBoxField, PropertyFilter
+from .locations import suggest_locations
+from .pagination import PropertyCursorPagination, RankedCursorPagination
+from .search import search_properties
+from .serializers import AmenitySerializer, CategorySerializer, PropertySerializer, PropertyValuesSerializer
+from .services import (
+    PROPERTY_DETAIL_CACHE_TIMEOUT, RECOMMENDATIONS_CACHE_TIMEOUT, get_category_tree, get_listing_version,
+    get_property_detail_cache_stats, get_property_detail_version, get_recommendation_ranking, get_similar_properties,
+    property_detail_cache_key, recommendations_cache_key, record_property_detail_lookup,
+)
 
 class CategoryListView(generics.ListAPIView):
     queryset = Category.objects.all()
@@ -13,19 +36,34 @@ class CategoryListView(generics.ListAPIView):
     authentication_classes = []
     permission_classes = [permissions.AllowAny]
 
-class PropertyListView(generics.ListAPIView):
-    queryset = Property.objects.all().select_related("category")
-    serializer_class = PropertySerializer
+class CategoryTreeView(APIView):
     authentication_classes = []
     permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_category_tree())
+
+class AmenityListView(generics.ListAPIView):
+    queryset = Amenity.objects.all()
+    serializer_class = AmenitySerializer
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+class PropertyListingMixin:
+    """The listing's queryset and filters: PropertyFilter plus `q`, `location` and `propertyType`."""
+    queryset = Property.objects.all().select_related("category")
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["category", "status"]
+    filterset_class = PropertyFilter
 
     def get_queryset(self):
         qs = super().get_queryset()
+        query = self.request.query_params.get("q", "").strip()
         location = self.request.query_params.get("location")
         property_type = self.request.query_params.get("propertyType")
 
+        if query:
+            qs = search_properties(qs, query)
+
         if location:
             qs = qs.filter(location__icontains=location)
         
@@ -34,26 +72,229 @@ class PropertyListView(generics.ListAPIView):
 
         return qs
 
-class PropertyDetailView(generics.RetrieveAPIView):
+class PropertyListView(PropertyListingMixin, ConditionalGetMixin, SparseFieldsetMixin, ValuesListMixin, generics.ListAPIView):
+    serializer_class = PropertySerializer
+    values_serializer_class = PropertyValuesSerializer
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    pagination_class = PropertyCursorPagination
+
+    def get_validators(self, request):
+        # Newest change plus row count over the filtered set: an edit bumps the max and a
+        # deletion lowers the count. The full path keeps each page's tag distinct.
+        state = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last_modified=Max("updated_at"), count=Count("id"),
+        )
+        etag_source = (request.get_full_path(), state["count"], state["last_modified"])
+        if "check_in" in request.query_params:
+            # Date availability also moves with bookings, which never touch the property rows.
+            bookings = Booking.objects.aggregate(last_modified=Max("updated_at"), count=Count("id"))
+            return (*etag_source, bookings["count"], bookings["last_modified"]), None
+        return etag_source, state["last_modified"]
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get("facets", "").lower() in ("1", "true"):
+            # Facets describe the whole filtered set, not just the current page.
+            queryset = self.filter_queryset(self.get_queryset())
+            response.data["facets"] = get_property_facets(queryset, request.query_params)
+        return response
+
+class PropertyExportView(PropertyListingMixin, SparseFieldsetMixin, generics.GenericAPIView):
+    """
+    Staff-only dump of the filtered catalog as NDJSON (default) or CSV, picked with
+    `?format=` or the Accept header. Rows are read in chunks from a server-side cursor
+    and written as they are rendered, so memory stays flat whatever the catalog size.
+    """
+    serializer_class = PropertySerializer
+    values_serializer_class = PropertyValuesSerializer
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = None
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.values_serializer_class(context=self.get_serializer_context())
+        queryset = serializer.project(self.filter_queryset(self.get_queryset()).order_by("id"))
+        fields = [name for name, *_ in serializer.converters]
+        renderer = request.accepted_renderer
+
+        response = StreamingHttpResponse(
+            renderer.stream(self.iter_rows(serializer, queryset), fields),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = f'attachment; filename="properties.{renderer.format}"'
+        return response
+
+    def iter_rows(self, serializer, queryset):
+        rows = queryset.iterator(chunk_size=self.chunk_size)
+        while chunk := list(islice(rows, self.chunk_size)):
+            yield from serializer.to_representation(chunk)
+
+class LocationSuggestView(APIView):
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    default_limit = 8
+
+    def get(self, request, *args, **kwargs):
+        prefix = request.query_params.get("prefix", "")
+        limit = request.query_params.get("limit", self.default_limit)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValidationError("limit must be an integer.")
+        if limit < 1:
+            raise ValidationError("limit must be a positive integer.")
+
+        return Response(suggest_locations(prefix, limit))
+
+class LocationClusterView(APIView):
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    max_zoom = 22
+
+    def get(self, request, *args, **kwargs):
+        try:
+            zoom = int(request.query_params.get("zoom", ""))
+        except ValueError:
+            raise ValidationError("zoom query parameter is required and must be an integer.")
+        if not 0 <= zoom <= self.max_zoom:
+            raise ValidationError(f"zoom must be between 0 and {self.max_zoom}.")
+
+        try:
+            bbox = BoundingBoxField(required=False).clean(request.query_params.get("bbox"))
+        except DjangoValidationError as exc:
+            raise ValidationError({"bbox": exc.messages})
+
+        precision, clusters = get_clusters(zoom, bbox)
+        return Response({
+            "zoom": zoom,
+            "precision": precision,
+            "clusters": [
+                {
+                    "cell": cluster.cell,
+                    "count": cluster.count,
+                    "latitude": cluster.latitude,
+                    "longitude": cluster.longitude,
+                    "min_price": str(cluster.min_price),
+                }
+                for cluster in clusters
+            ],
+        })
+
+class PropertyDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveAPIView):
     queryset = Property.objects.all().select_related("category")
     serializer_class = PropertySerializer
     authentication_classes = []
     permission_classes = [permissions.AllowAny]
     lookup_field = "slug"
 
-class RecommendedPropertiesView(generics.ListAPIView):
+    include_query_param = "include"
+    includable = ("similar",)
+
+    def get_includes(self):
+        if not hasattr(self, "_includes"):
+            raw = self.request.query_params.get(self.include_query_param, "")
+            includes = {name.strip() for name in raw.split(",") if name.strip()}
+            unknown = sorted(includes.difference(self.includable))
+            if unknown:
+                raise ValidationError({self.include_query_param: f"Unknown include(s): {', '.join(unknown)}."})
+            self._includes = tuple(sorted(includes))
+        return self._includes
+
+    def get_validators(self, request):
+        self.property_version = get_property_detail_version(self.kwargs["slug"])
+        if self.property_version is None:
+            return None, None
+        pk, updated_at = self.property_version
+        if "similar" in self.get_includes():
+            # Neighbours change without touching this row, so only the listing version
+            # (bumped by any property change and by neighbour rebuilds) validates them.
+            return (pk, updated_at, get_listing_version()), None
+        return (pk, updated_at), updated_at
+
+    def get_detail_data(self, instance):
+        data = self.get_serializer(instance).data
+        if "similar" in self.get_includes():
+            data["similar"] = [
+                {**self.get_serializer(entry.similar).data, "score": entry.score}
+                for entry in get_similar_properties(instance.pk)
+            ]
+        return data
+
+    def retrieve(self, request, *args, **kwargs):
+        # Only JSON is cached; the browsable API still goes through the normal path.
+        renderer = request.accepted_renderer
+        if self.property_version is None or renderer.format != "json":
+            return Response(self.get_detail_data(self.get_object()))
+
+        _, updated_at = self.property_version
+        variant = f"{request.accepted_media_type}|{request.build_absolute_uri('/')}|{self.get_sparse_fields()}"
+        if "similar" in self.get_includes():
+            variant = f"{variant}|similar:{get_listing_version()}"
+        # Image URLs are absolute, so the rendered bytes also depend on the host.
+        key = property_detail_cache_key(self.kwargs["slug"], updated_at.isoformat(), variant)
+        content = cache.get(key)
+        hit = content is not None
+        record_property_detail_lookup(hit)
+        if not hit:
+            data = self.get_detail_data(self.get_object())
+            content = renderer.render(data, request.accepted_media_type, self.get_renderer_context())
+            cache.set(key, content, timeout=PROPERTY_DETAIL_CACHE_TIMEOUT)
+
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = HttpResponse(content, content_type=content_type)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+class PropertyDetailCacheStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_property_detail_cache_stats())
+
+class RecommendedPropertiesView(SparseFieldsetMixin, generics.GenericAPIView):
+    queryset = Property.objects.all()
     serializer_class = PropertySerializer
+    values_serializer_class = PropertyValuesSerializer
+    pagination_class = RankedCursorPagination
     authentication_classes = []
     permission_classes = [permissions.AllowAny]
 
-    def get_queryset(self):
-        category_id = self.request.query_params.get("category_id")
-        if category_id is None:
-            raise ValidationError("category_id query parameter is required.")
+    def get(self, request, *args, **kwargs):
+        category_id = self._optional_int("category_id")
+        property_id = self._optional_int("property_id")
+        if category_id is None and property_id is None:
+            raise ValidationError("category_id or property_id query parameter is required.")
+        # Validate the remaining parameters before anything is computed or cached.
+        self.get_sparse_fields()
+        self.paginator.get_page_size(request)
+        self.paginator.decode_cursor(request)
+
+        data = get_or_compute(
+            recommendations_cache_key(request.build_absolute_uri()),
+            lambda: self.get_page_data(category_id, property_id),
+            timeout=RECOMMENDATIONS_CACHE_TIMEOUT,
+        )
+        return Response(data)
 
+    def get_page_data(self, category_id, property_id):
+        page = self.paginator.paginate_ranking(get_recommendation_ranking(category_id, property_id), self.request)
+        page_ids = [property_id for property_id, _ in page]
+
+        # Only the page's rows are read, however large the ranking is.
+        serializer = self.values_serializer_class(context=self.get_serializer_context())
+        rows = {row["id"]: row for row in serializer.project(self.get_queryset().filter(id__in=page_ids), ["id"])}
+        results = serializer.to_representation(rows[pk] for pk in page_ids if pk in rows)
+        return self.paginator.get_paginated_data(results)
+
+    def _optional_int(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
         try:
-            category_id_int = int(category_id)
+            return int(value)
         except ValueError:
-            raise ValidationError("category_id must be an integer.")
-
-        return get_recommended_properties(category_id_int)
+            raise ValidationError(f"{name} must be an integer.")